@@ -0,0 +1,215 @@
+# Musehypothermi Python Autotune Analysis Module
+# File: autotune_analysis.py
+#
+# Sample collection and PID recommendations for the autotune step test. The
+# plant is identified by a least-squares FOPDT fit over the whole response
+# (framework.fopdt); the single 5 % / 63 % threshold crossings are kept as a
+# fallback when the fit is not trustworthy. The peak rate comes from the
+# alpha-beta state filter rather than sample-to-sample differences. Free of
+# Qt so recorded sessions can be replayed offline.
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from framework.fopdt import FOPDTFit, fit_fopdt
+from framework.state_filter import PLATE_ACCELERATION_NOISE, filter_series
+
+# A fit explaining less of the response than this falls back to thresholds.
+MIN_FIT_R_SQUARED = 0.9
+
+
+def ziegler_nichols_pid(process_gain: float, dead_time: float, time_constant: float) -> Tuple[float, float, float]:
+    """Ziegler-Nichols step-response PID; zeros when the model is unusable."""
+
+    if process_gain == 0 or dead_time <= 0:
+        return 0.0, 0.0, 0.0
+    kp = 1.2 * time_constant / (process_gain * dead_time)
+    return kp, kp / (2.0 * dead_time), kp * dead_time * 0.5
+
+
+class AutotuneDataAnalyzer:
+    """Collect samples and compute Ziegler-Nichols inspired PID values.
+
+    ``compute_results`` may be called after every sample; the FOPDT fit is
+    cached per sample count.
+    """
+
+    MIN_SAMPLES = 40
+    STABLE_WINDOW = 25
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.start_timestamp: Optional[float] = None
+        self.timestamps: List[float] = []
+        self.temperatures: List[float] = []
+        self.outputs: List[float] = []
+        self._fit_cache: Optional[tuple] = None
+
+    def add_sample(self, timestamp: float, temperature: float, output: float) -> None:
+        if self.start_timestamp is None:
+            self.start_timestamp = timestamp
+
+        elapsed = max(0.0, timestamp - self.start_timestamp)
+        self.timestamps.append(elapsed)
+        self.temperatures.append(temperature)
+        self.outputs.append(output)
+
+    def has_enough_samples(self) -> bool:
+        return len(self.timestamps) >= self.MIN_SAMPLES
+
+    def is_stable(self, tolerance: float = 0.05) -> bool:
+        if len(self.temperatures) < self.STABLE_WINDOW:
+            return False
+
+        recent = self.temperatures[-self.STABLE_WINDOW:]
+        if not recent:
+            return False
+
+        return (max(recent) - min(recent)) <= tolerance
+
+    def max_rate(self) -> float:
+        """Peak filtered heating rate (°C/s), 0 when the plate never rose."""
+
+        if len(self.timestamps) < 2:
+            return 0.0
+
+        _, rates = filter_series(self.timestamps, self.temperatures, PLATE_ACCELERATION_NOISE)
+        peak = float(np.nanmax(rates)) if np.isfinite(rates).any() else 0.0
+        return max(0.0, peak)
+
+    @staticmethod
+    def _moving_average(values: List[float], window: int = 10) -> float:
+        if not values:
+            return 0.0
+        if len(values) < window:
+            return sum(values) / len(values)
+        return sum(values[-window:]) / float(window)
+
+    def _estimate_dead_time(self, start_temp: float, final_temp: float) -> float:
+        if not self.timestamps:
+            return 0.0
+
+        delta = final_temp - start_temp
+        if abs(delta) < 1e-6:
+            return 0.0
+
+        threshold = start_temp + 0.05 * delta
+        for t, temp in zip(self.timestamps, self.temperatures):
+            if (delta > 0 and temp >= threshold) or (delta < 0 and temp <= threshold):
+                return max(0.0, t)
+        return 0.0
+
+    def _estimate_time_constant(self, start_temp: float, final_temp: float) -> float:
+        if not self.timestamps:
+            return 0.0
+
+        delta = final_temp - start_temp
+        if abs(delta) < 1e-6:
+            return 0.0
+
+        target = start_temp + 0.63 * delta
+        for t, temp in zip(self.timestamps, self.temperatures):
+            if (delta > 0 and temp >= target) or (delta < 0 and temp <= target):
+                return max(0.0, t)
+        return self.timestamps[-1]
+
+    def _estimate_settling_time(self, final_temp: float, tolerance: float = 0.1) -> float:
+        if not self.timestamps:
+            return 0.0
+
+        for idx in range(len(self.timestamps) - 1, -1, -1):
+            window = self.temperatures[idx:]
+            if not window:
+                continue
+            if max(abs(val - final_temp) for val in window) <= tolerance:
+                return self.timestamps[idx]
+        return self.timestamps[-1]
+
+    def fit_model(self) -> Optional[FOPDTFit]:
+        """Least-squares FOPDT fit of the samples collected so far."""
+
+        count = len(self.timestamps)
+        if self._fit_cache is None or self._fit_cache[0] != count:
+            self._fit_cache = (count, fit_fopdt(self.timestamps, self.temperatures, self.outputs))
+        return self._fit_cache[1]
+
+    def compute_results(self) -> Optional[Dict[str, Any]]:
+        if not self.has_enough_samples():
+            return None
+
+        initial_temp = self.temperatures[0]
+        final_temp = self._moving_average(self.temperatures, 10)
+        delta_temp = final_temp - initial_temp
+        if abs(delta_temp) < 0.05:
+            return None
+
+        initial_output = self._moving_average(self.outputs, 12)
+        final_output = self._moving_average(self.outputs, 4)
+        output_span = max(self.outputs) - min(self.outputs)
+        if abs(output_span) < 1.0:
+            output_span = final_output - initial_output
+
+        if abs(output_span) < 1e-3:
+            return None
+
+        step_fraction = output_span / 100.0
+        process_gain = delta_temp / step_fraction if step_fraction else 0.0
+        threshold_process_gain = process_gain
+
+        threshold_dead_time = self._estimate_dead_time(initial_temp, final_temp)
+        t63 = self._estimate_time_constant(initial_temp, final_temp)
+        threshold_time_constant = max(0.1, t63 - threshold_dead_time)
+
+        dead_time = threshold_dead_time
+        time_constant = threshold_time_constant
+        identification = "threshold"
+        fit = self.fit_model()
+        if fit is not None and fit.r_squared >= MIN_FIT_R_SQUARED and fit.gain * delta_temp > 0:
+            # Gain per 100 % output, matching the threshold estimate's units.
+            process_gain = fit.gain * 100.0
+            dead_time = fit.theta
+            time_constant = max(0.1, fit.tau)
+            identification = "fopdt_ls"
+
+        duration = self.timestamps[-1] if self.timestamps else 0.0
+        sample_count = len(self.timestamps)
+
+        kp, ki, kd = ziegler_nichols_pid(process_gain, dead_time, time_constant)
+
+        overshoot = max(self.temperatures) - final_temp
+        max_rate = self.max_rate()
+        settling_time = self._estimate_settling_time(final_temp)
+
+        results: Dict[str, Any] = {
+            "kp": kp,
+            "ki": ki,
+            "kd": kd,
+            "process_gain": process_gain,
+            "dead_time": dead_time,
+            "time_constant": time_constant,
+            "delta_temp": delta_temp,
+            "overshoot": overshoot,
+            "max_rate": max_rate,
+            "settling_time": settling_time,
+            "initial_temp": initial_temp,
+            "final_temp": final_temp,
+            "output_span": output_span,
+            "duration": duration,
+            "sample_count": sample_count,
+            "identification": identification,
+            "threshold_process_gain": threshold_process_gain,
+            "threshold_dead_time": threshold_dead_time,
+            "threshold_time_constant": threshold_time_constant,
+        }
+        if fit is not None:
+            results.update({
+                "fit_process_gain_ci": fit.gain_ci * 100.0,
+                "fit_dead_time_ci": fit.theta_ci,
+                "fit_time_constant_ci": fit.tau_ci,
+                "fit_residual_rms": fit.residual_rms,
+                "fit_r_squared": fit.r_squared,
+            })
+        return results
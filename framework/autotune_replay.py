@@ -0,0 +1,344 @@
+# Musehypothermi Python Autotune Replay Module
+# File: autotune_replay.py
+#
+# Offline replay of autotune runs recorded in session logs. A run starts at
+# the "ASYMMETRIC_CMD: start_asymmetric_autotune" event and ends at the next
+# AUTOTUNE_RESULT, abort or start event. Its plate temperature and PID output
+# are fed through AutotuneDataAnalyzer exactly as the wizard does live, and
+# the recommendations of each tuning method (least-squares FOPDT fit,
+# threshold crossings, the firmware's own result) are tabulated per rig with
+# the drift of the identified plant over time. Legacy data logs are replayed
+# together with the event log recorded alongside them. Sessions are replayed
+# in parallel across cores.
+#
+#   python -m framework.autotune_replay logs/ -r --output autotune_report.json
+
+import argparse
+import ast
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from framework.autotune_analysis import AutotuneDataAnalyzer, ziegler_nichols_pid
+from framework.journal import JOURNAL_EXTENSION
+from framework.session_catalog import AUTOTUNE_EVENT_PREFIX
+from framework.session_reader import SessionReader, spread_timestamps
+
+START_EVENT = "ASYMMETRIC_CMD: start_asymmetric_autotune"
+ABORT_EVENT = "ASYMMETRIC_CMD: abort_asymmetric_autotune"
+MAX_RUN_S = 2 * 3600.0  # Runs without an end event are cut here.
+PRE_ROLL_S = 30.0  # Baseline before the start command so the step is visible.
+
+METHODS = ("fopdt_ls", "threshold", "firmware")
+PLANT_FIELDS = ("process_gain", "dead_time", "time_constant")
+SESSION_EXTENSIONS = (".csv", JOURNAL_EXTENSION)
+
+
+def _command_params(event: str) -> Dict[str, Any]:
+    """Parameters logged as ``ASYMMETRIC_CMD: name → {...}``."""
+
+    _, sep, text = event.partition("→")
+    if not sep:
+        return {}
+    try:
+        params = ast.literal_eval(text.strip())
+    except (ValueError, SyntaxError):
+        return {}
+    return params if isinstance(params, dict) else {}
+
+
+def find_runs(events: Sequence[Tuple[float, str]], session_end: float) -> List[Dict[str, Any]]:
+    """Split a session's events into autotune run windows."""
+
+    runs: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+
+    def close(end: float, status: str, recorded: Optional[Dict[str, Any]] = None) -> None:
+        nonlocal current
+        current["end"] = min(end, current["start"] + MAX_RUN_S)
+        current["status"] = status
+        current["recorded"] = recorded
+        runs.append(current)
+        current = None
+
+    for t_value, event in events:
+        if event.startswith(START_EVENT):
+            if current is not None:
+                close(t_value, "superseded")
+            current = {"start": t_value, "params": _command_params(event)}
+        elif current is None:
+            continue
+        elif event.startswith(ABORT_EVENT):
+            close(t_value, "aborted")
+        elif event.startswith(AUTOTUNE_EVENT_PREFIX):
+            try:
+                recorded = json.loads(event[len(AUTOTUNE_EVENT_PREFIX):])
+            except json.JSONDecodeError:
+                recorded = None
+            close(t_value, "completed", recorded)
+
+    if current is not None:
+        close(session_end, "incomplete")
+    return runs
+
+
+def _method_entry(process_gain: float, dead_time: float, time_constant: float, **extra: Any) -> Dict[str, Any]:
+    kp, ki, kd = ziegler_nichols_pid(process_gain, dead_time, time_constant)
+    entry = {
+        "kp": kp, "ki": ki, "kd": kd,
+        "process_gain": process_gain, "dead_time": dead_time, "time_constant": time_constant,
+    }
+    entry.update(extra)
+    return entry
+
+
+def replay_run(
+    times: np.ndarray, temps: np.ndarray, outputs: np.ndarray, step_time: Optional[float] = None
+) -> Dict[str, Any]:
+    """Feed one run through the analyzer and return the per-method results.
+
+    *step_time* is the start command; the threshold dead time is measured
+    from it rather than from the first (pre-roll) sample.
+    """
+
+    analyzer = AutotuneDataAnalyzer()
+    valid = np.isfinite(times) & np.isfinite(temps) & np.isfinite(outputs)
+    for t_value, temp, output in zip(
+        spread_timestamps(times[valid]).tolist(), temps[valid].tolist(), outputs[valid].tolist()
+    ):
+        analyzer.add_sample(t_value, temp, output)
+
+    results = analyzer.compute_results()
+    lead = 0.0
+    if step_time is not None and analyzer.start_timestamp is not None:
+        lead = max(0.0, step_time - analyzer.start_timestamp)
+    methods: Dict[str, Optional[Dict[str, Any]]] = {"fopdt_ls": None, "threshold": None}
+    if results:
+        methods["threshold"] = _method_entry(
+            float(results["threshold_process_gain"]),
+            max(0.0, float(results["threshold_dead_time"]) - lead),
+            float(results["threshold_time_constant"]),
+        )
+        if results["identification"] == "fopdt_ls":
+            methods["fopdt_ls"] = _method_entry(
+                float(results["process_gain"]),
+                float(results["dead_time"]),
+                float(results["time_constant"]),
+                r_squared=float(results["fit_r_squared"]),
+                residual_rms=float(results["fit_residual_rms"]),
+            )
+    return {"samples": len(analyzer.timestamps), "methods": methods}
+
+
+def replay_session(path: str) -> List[Dict[str, Any]]:
+    """Replay every autotune run recorded in one session file."""
+
+    reader = SessionReader(path)
+    if reader.is_event_log:
+        return []
+
+    # Legacy GUIs logged the autotune commands in a separate event log.
+    events = reader.merge_paired_events(reader.events())
+    if not any(event.startswith(START_EVENT) for _, event in events):
+        return []
+
+    data = reader.read(fields=("cooling_plate_temp", "pid_output"))
+    times = data["time"]
+    session_end = float(np.nanmax(times)) if times.size else max(t for t, _ in events)
+    rig = reader.metadata.get("rig") or "unknown"
+
+    runs = []
+    for run in find_runs(events, session_end):
+        window = (times >= run["start"] - PRE_ROLL_S) & (times <= run["end"])
+        replayed = replay_run(
+            times[window], data["cooling_plate_temp"][window], data["pid_output"][window], step_time=run["start"]
+        )
+        recorded = run["recorded"]
+        if isinstance(recorded, dict) and "kp" in recorded:
+            replayed["methods"]["firmware"] = {
+                key: float(value) for key, value in recorded.items() if isinstance(value, (int, float))
+            }
+        else:
+            replayed["methods"]["firmware"] = None
+        runs.append({
+            "path": os.path.abspath(path),
+            "rig": rig,
+            "started_at": run["start"],
+            "ended_at": run["end"],
+            "status": run["status"],
+            "direction": run["params"].get("direction"),
+            "step_percent": run["params"].get("step_percent"),
+            **replayed,
+        })
+    return runs
+
+
+def _safe_replay(path: str) -> Dict[str, Any]:
+    try:
+        return {"path": path, "runs": replay_session(path), "error": None}
+    except (OSError, ValueError) as exc:
+        return {"path": path, "runs": [], "error": str(exc)}
+
+
+def find_sessions(paths: Sequence[str], recursive: bool = False) -> List[str]:
+    """Expand files and directories into session files.
+
+    Journals are only included when their CSV export is missing, as in
+    SessionCatalog.backfill.
+    """
+
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            pattern = os.path.join(path, "**", "*") if recursive else os.path.join(path, "*")
+            for candidate in glob.glob(pattern, recursive=recursive):
+                if not os.path.isfile(candidate) or not candidate.lower().endswith(SESSION_EXTENSIONS):
+                    continue
+                if candidate.endswith(JOURNAL_EXTENSION) and os.path.exists(os.path.splitext(candidate)[0] + ".csv"):
+                    continue
+                files.add(os.path.abspath(candidate))
+        else:
+            files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+def _spread(values: np.ndarray) -> Dict[str, float]:
+    p25, p50, p75 = np.percentile(values, (25, 50, 75))
+    return {"median": float(p50), "p25": float(p25), "p75": float(p75)}
+
+
+def drift_pct_per_30d(started_at: np.ndarray, values: np.ndarray) -> Optional[float]:
+    """Linear trend in percent of the median per 30 days (None when too little data)."""
+
+    if values.size < 3 or np.ptp(started_at) < 86400.0:
+        return None
+    median = float(np.median(values))
+    if median == 0:
+        return None
+    slope = np.polyfit(started_at / 86400.0, values, 1)[0]
+    return float(slope * 30.0 / abs(median) * 100.0)
+
+
+def tabulate(runs: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-rig PID recommendations for each method plus plant drift."""
+
+    table: Dict[str, Any] = {}
+    for rig in sorted({run["rig"] for run in runs}):
+        rig_runs = sorted((run for run in runs if run["rig"] == rig), key=lambda run: run["started_at"])
+        entry: Dict[str, Any] = {
+            "runs": len(rig_runs),
+            "completed": sum(1 for run in rig_runs if run["status"] == "completed"),
+            "first": rig_runs[0]["started_at"],
+            "last": rig_runs[-1]["started_at"],
+            "methods": {},
+            "plant": {},
+        }
+        for method in METHODS:
+            results = [run["methods"][method] for run in rig_runs if run["methods"].get(method)]
+            if not results:
+                continue
+            entry["methods"][method] = {"count": len(results)}
+            for key in ("kp", "ki", "kd"):
+                values = np.array([result[key] for result in results if key in result], dtype=np.float64)
+                if values.size:
+                    entry["methods"][method][key] = _spread(values)
+
+        fitted = [run for run in rig_runs if run["methods"].get("fopdt_ls")]
+        if fitted:
+            started_at = np.array([run["started_at"] for run in fitted])
+            for field in PLANT_FIELDS:
+                values = np.array([run["methods"]["fopdt_ls"][field] for run in fitted])
+                entry["plant"][field] = {
+                    **_spread(values),
+                    "drift_pct_per_30d": drift_pct_per_30d(started_at, values),
+                }
+        table[rig] = entry
+    return table
+
+
+def replay_sessions(paths: Sequence[str], workers: Optional[int] = None) -> Dict[str, Any]:
+    """Replay *paths* in parallel and return runs plus the per-rig table."""
+
+    started = time.perf_counter()
+    if workers == 1 or len(paths) <= 1:
+        results = list(map(_safe_replay, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_safe_replay, paths, chunksize=4))
+
+    runs = [run for result in results for run in result["runs"]]
+    return {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "summary": {
+            "sessions": len(results),
+            "sessions_with_runs": sum(1 for result in results if result["runs"]),
+            "runs": len(runs),
+            "errors": sum(1 for result in results if result["error"]),
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        },
+        "rigs": tabulate(runs),
+        "runs": runs,
+        "errors": [{"path": result["path"], "error": result["error"]} for result in results if result["error"]],
+    }
+
+
+def _format_gains(method: Dict[str, Any]) -> str:
+    parts = []
+    for key, label in (("kp", "Kp"), ("ki", "Ki"), ("kd", "Kd")):
+        if key in method:
+            spread = method[key]
+            parts.append(f"{label} {spread['median']:.3f} [{spread['p25']:.3f}–{spread['p75']:.3f}]")
+    return "  ".join(parts)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded autotune runs offline")
+    parser.add_argument("paths", nargs="+", help="Session files or directories")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("-o", "--output", default=None, help="Write the JSON report here ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    files = find_sessions(args.paths, recursive=args.recursive)
+    if not files:
+        print("⚠️ No session files found.")
+        return 2
+
+    report = replay_sessions(files, workers=args.workers)
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+        return 0
+
+    for rig, entry in report["rigs"].items():
+        first = datetime.fromtimestamp(entry["first"]).strftime("%Y-%m-%d")
+        last = datetime.fromtimestamp(entry["last"]).strftime("%Y-%m-%d")
+        print(f"🔧 {rig}: {entry['runs']} run(s), {entry['completed']} completed, {first} → {last}")
+        for method, values in entry["methods"].items():
+            print(f"   {method:<10} n={values['count']:<3} {_format_gains(values)}")
+        for field, values in entry["plant"].items():
+            drift = values["drift_pct_per_30d"]
+            drift_text = f", drift {drift:+.1f}%/30d" if drift is not None else ""
+            print(f"   📈 {field}: {values['median']:.3f} [{values['p25']:.3f}–{values['p75']:.3f}]{drift_text}")
+    for error in report["errors"]:
+        print(f"❌ {os.path.relpath(error['path'])}: {error['error']}")
+
+    summary = report["summary"]
+    print(
+        f"📋 {summary['runs']} run(s) in {summary['sessions_with_runs']}/{summary['sessions']} session(s) "
+        f"in {summary['elapsed_s']:.2f}s"
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"📝 Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
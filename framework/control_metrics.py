@@ -0,0 +1,212 @@
+# Musehypothermi Python Control Metrics Module
+# File: control_metrics.py
+#
+# Streaming control-quality metrics for the asymmetric PID, fed one
+# telemetry frame at a time. Tracking error integrals (IAE, ISE), the peak
+# overshoot and settling time of every setpoint change, time spent at the
+# heating/cooling output limits and heating/cooling mode switches are all
+# updated in constant time per sample. ``as_dict`` is what the GUI stores in
+# the session as a CONTROL_METRICS event and the session catalogue indexes.
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+CONTROL_METRICS_EVENT_PREFIX = "CONTROL_METRICS "
+
+SETPOINT_CHANGE_C = 0.05
+SETTLING_BAND_C = 0.3  # Firmware default deadband.
+SETTLING_HOLD_S = 30.0
+SATURATION_FRACTION = 0.99
+MAX_GAP_S = 10.0  # Longer telemetry gaps are not integrated.
+RECENT_STEPS = 20
+
+
+class SetpointStep:
+    """Response to one setpoint change, updated until the next change."""
+
+    FIELDS = (
+        "started_at", "from_target", "to_target", "overshoot", "settling_time", "iae",
+    )
+
+    def __init__(self, started_at: float, from_target: float, to_target: float):
+        self.started_at = started_at
+        self.from_target = from_target
+        self.to_target = to_target
+        self.direction = 1.0 if to_target >= from_target else -1.0
+        self.overshoot = 0.0
+        self.settling_time: Optional[float] = None
+        self.iae = 0.0
+        self._band_entered: Optional[float] = None
+
+    def update(self, t_value: float, error: float, dt: float) -> None:
+        """*error* is plate minus target."""
+
+        self.iae += abs(error) * dt
+        self.overshoot = max(self.overshoot, self.direction * error)
+        if abs(error) <= SETTLING_BAND_C:
+            if self._band_entered is None:
+                self._band_entered = t_value
+            if self.settling_time is None and t_value - self._band_entered >= SETTLING_HOLD_S:
+                self.settling_time = self._band_entered - self.started_at
+        else:
+            self._band_entered = None
+            # Leaving the band again means the earlier settle did not hold.
+            self.settling_time = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class ControlQualityMetrics:
+    """O(1)-per-sample control-quality accumulator."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self.duration_s = 0.0
+        self.iae = 0.0
+        self.ise = 0.0
+        self.max_abs_error = 0.0
+        self.saturated_heating_s = 0.0
+        self.saturated_cooling_s = 0.0
+        self.mode_switches = 0
+        self.heating_to_cooling = 0
+        self.cooling_to_heating = 0
+        self.step_count = 0
+        self.settled_steps = 0
+        self.max_overshoot = 0.0
+        self._settling_sum = 0.0
+        self.current_step: Optional[SetpointStep] = None
+        self.recent_steps: Deque[SetpointStep] = deque(maxlen=RECENT_STEPS)
+
+        self._last_error = 0.0
+        self._last_target: Optional[float] = None
+        self._last_output = 0.0
+        self._last_saturation = 0
+        self._cooling_mode: Optional[bool] = None
+        self._heating_limit: Optional[float] = None
+        self._cooling_limit: Optional[float] = None
+
+    def update(
+        self,
+        t_value: float,
+        plate: float,
+        target: float,
+        output: Optional[float] = None,
+        cooling_mode: Optional[bool] = None,
+        heating_limit: Optional[float] = None,
+        cooling_limit: Optional[float] = None,
+    ) -> None:
+        """Add one telemetry sample.
+
+        Limits are positive percentages as reported in status frames; the
+        last known limits and output are kept when a frame omits them.
+        Integrals hold the previous sample's values over the interval.
+        """
+
+        if not (math.isfinite(plate) and math.isfinite(target)):
+            return
+        if heating_limit is not None:
+            self._heating_limit = abs(heating_limit)
+        if cooling_limit is not None:
+            self._cooling_limit = abs(cooling_limit)
+
+        if self.last_time is None:
+            self.started_at = t_value
+            dt = 0.0
+        else:
+            dt = t_value - self.last_time
+            if dt < 0 or dt > MAX_GAP_S:
+                dt = 0.0
+        self.last_time = t_value
+        self.samples += 1
+        self.duration_s += dt
+
+        # Previous interval, zero-order hold.
+        if dt > 0:
+            self.iae += abs(self._last_error) * dt
+            self.ise += self._last_error * self._last_error * dt
+            if self._last_saturation > 0:
+                self.saturated_heating_s += dt
+            elif self._last_saturation < 0:
+                self.saturated_cooling_s += dt
+
+        error = plate - target
+        self.max_abs_error = max(self.max_abs_error, abs(error))
+        self._last_error = error
+
+        if self._last_target is not None and abs(target - self._last_target) > SETPOINT_CHANGE_C:
+            self._close_step()
+            self.current_step = SetpointStep(t_value, self._last_target, target)
+            self.step_count += 1
+        elif self.current_step is not None:
+            self.current_step.update(t_value, error, dt)
+        self._last_target = target
+
+        if output is not None and math.isfinite(output):
+            self._last_output = output
+        self._last_saturation = 0
+        if self._heating_limit and self._last_output >= self._heating_limit * SATURATION_FRACTION:
+            self._last_saturation = 1
+        elif self._cooling_limit and self._last_output <= -self._cooling_limit * SATURATION_FRACTION:
+            self._last_saturation = -1
+
+        if cooling_mode is not None:
+            cooling_mode = bool(cooling_mode)
+            if self._cooling_mode is not None and cooling_mode != self._cooling_mode:
+                self.mode_switches += 1
+                if cooling_mode:
+                    self.heating_to_cooling += 1
+                else:
+                    self.cooling_to_heating += 1
+            self._cooling_mode = cooling_mode
+
+    def _close_step(self) -> None:
+        step = self.current_step
+        if step is None:
+            return
+        self.recent_steps.append(step)
+        self.max_overshoot = max(self.max_overshoot, step.overshoot)
+        if step.settling_time is not None:
+            self.settled_steps += 1
+            self._settling_sum += step.settling_time
+        self.current_step = None
+
+    @property
+    def rms_error(self) -> Optional[float]:
+        return math.sqrt(self.ise / self.duration_s) if self.duration_s > 0 else None
+
+    @property
+    def mean_settling_time(self) -> Optional[float]:
+        return self._settling_sum / self.settled_steps if self.settled_steps else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Totals plus the open step; the open step counts towards the maxima."""
+
+        current = self.current_step.as_dict() if self.current_step is not None else None
+        max_overshoot = self.max_overshoot
+        if self.current_step is not None:
+            max_overshoot = max(max_overshoot, self.current_step.overshoot)
+        return {
+            "samples": self.samples,
+            "duration_s": self.duration_s,
+            "iae": self.iae,
+            "ise": self.ise,
+            "rms_error": self.rms_error,
+            "max_abs_error": self.max_abs_error,
+            "setpoint_changes": self.step_count,
+            "settled_steps": self.settled_steps,
+            "max_overshoot": max_overshoot,
+            "mean_settling_time": self.mean_settling_time,
+            "saturated_heating_s": self.saturated_heating_s,
+            "saturated_cooling_s": self.saturated_cooling_s,
+            "mode_switches": self.mode_switches,
+            "heating_to_cooling": self.heating_to_cooling,
+            "cooling_to_heating": self.cooling_to_heating,
+            "current_step": current,
+        }
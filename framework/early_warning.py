@@ -0,0 +1,197 @@
+# Musehypothermi Python Early Warning Module
+# File: early_warning.py
+#
+# Predictive warnings before a safety threshold is crossed. The filtered
+# temperature and rate of the plate and rectal probe (framework.state_filter)
+# are extrapolated with the filter's own constant-velocity model, and the
+# time until each threshold would be reached is graded: advisory within
+# five minutes, warning within two, critical within thirty seconds.
+#
+# Plate thresholds mirror the firmware's emergency stops: the 10-45 °C
+# plate range and, while cooling, the safety margin below the plate target.
+# The rectal thresholds are a host-side alarm band. Its lower limit is
+# tightened to the rectal setpoint minus RECTAL_UNDERSHOOT_C when a setpoint
+# is reported, but only once the probe has reached that level or is falling,
+# so rewarming from below does not raise an undershoot alarm.
+#
+# EarlyWarningMonitor is a SerialManager payload processor registered after
+# TelemetryFilter. It runs in the serial worker and adds "early_warning"
+# to each frame, so the display path only renders and logs the result.
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from framework.thermal_simulation import SAFE_PLATE_RANGE
+
+RECTAL_SAFE_RANGE = (20.0, 40.0)
+RECTAL_UNDERSHOOT_C = 1.5
+RECTAL_SETPOINT_KEYS = (
+    "rectal_override_target",
+    "rectal_setpoint",
+    "rectal_target_active",
+    "rectal_setpoint_active",
+)
+
+# (grade, seconds to threshold), most severe first.
+GRADES = (("critical", 30.0), ("warning", 120.0), ("advisory", 300.0))
+GRADE_RANK = {"": 0, "advisory": 1, "warning": 2, "critical": 3}
+# A grade is only lowered once the forecast is this much past its bound.
+HYSTERESIS = 1.2
+MIN_RATE_C_PER_S = 1e-4
+
+# (signal, filtered field, rate field)
+SIGNALS = (
+    ("plate", "cooling_plate_temp_filtered", "cooling_plate_rate"),
+    ("rectal", "anal_probe_temp_filtered", "anal_probe_rate"),
+)
+
+
+def _number(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number else None
+
+
+def time_to_threshold(value: float, rate: float, threshold: float, direction: int) -> Optional[float]:
+    """Seconds until *value* moving at *rate* crosses *threshold*.
+
+    *direction* is -1 for a lower limit and +1 for an upper one. Returns
+    None when the signal moves away from the limit, even from beyond it,
+    and 0 when the limit is crossed and the signal is not moving back.
+    """
+
+    distance = (threshold - value) * direction
+    approach = rate * direction
+    if distance <= 0:
+        return None if approach <= -MIN_RATE_C_PER_S else 0.0
+    if approach < MIN_RATE_C_PER_S:
+        return None
+    return distance / approach
+
+
+def grade_for(seconds: Optional[float], current: str = "") -> str:
+    """Grade of a forecast; *current* adds hysteresis against flapping."""
+
+    if seconds is None:
+        return ""
+    for grade, bound in GRADES:
+        if seconds <= bound:
+            if GRADE_RANK[current] > GRADE_RANK[grade]:
+                # Keep the higher grade until clearly past its bound.
+                current_bound = dict(GRADES)[current]
+                if seconds <= current_bound * HYSTERESIS:
+                    return current
+            return grade
+    if current and seconds <= dict(GRADES)[current] * HYSTERESIS:
+        return current
+    return ""
+
+
+class EarlyWarningMonitor:
+    """Payload processor grading forecast threshold crossings."""
+
+    def __init__(
+        self,
+        plate_range: Tuple[float, float] = SAFE_PLATE_RANGE,
+        rectal_range: Tuple[float, float] = RECTAL_SAFE_RANGE,
+        rectal_undershoot: float = RECTAL_UNDERSHOOT_C,
+    ):
+        if plate_range[0] >= plate_range[1] or rectal_range[0] >= rectal_range[1]:
+            raise ValueError("threshold ranges must be increasing")
+        self.plate_range = plate_range
+        self.rectal_range = rectal_range
+        self.rectal_undershoot = rectal_undershoot
+        self.grades: Dict[str, str] = {}
+
+    def reset(self) -> None:
+        self.grades = {}
+
+    def thresholds(self, payload: Dict[str, Any]) -> List[Tuple[str, str, float, int]]:
+        """(name, signal, level, direction) of every active threshold."""
+
+        thresholds = [
+            ("plate_low", "plate", self.plate_range[0], -1),
+            ("plate_high", "plate", self.plate_range[1], 1),
+            ("rectal_high", "rectal", self.rectal_range[1], 1),
+        ]
+
+        rectal_low = self.rectal_range[0]
+        rectal = _number(payload.get("anal_probe_temp_filtered"))
+        rectal_rate = _number(payload.get("anal_probe_rate"))
+        for key in RECTAL_SETPOINT_KEYS:
+            setpoint = _number(payload.get(key))
+            if setpoint is None:
+                continue
+            undershoot_limit = setpoint - self.rectal_undershoot
+            falling = rectal_rate is not None and rectal_rate <= -MIN_RATE_C_PER_S
+            if rectal is not None and (rectal >= undershoot_limit or falling):
+                rectal_low = max(rectal_low, undershoot_limit)
+            break
+        thresholds.append(("rectal_low", "rectal", rectal_low, -1))
+
+        target = _number(payload.get("plate_target_active"))
+        margin = _number(payload.get("safety_margin"))
+        if payload.get("cooling_mode") and target is not None and margin is not None:
+            thresholds.append(("plate_safety_margin", "plate", target - margin, -1))
+        return thresholds
+
+    def evaluate(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Forecast and grade every threshold (None without filtered signals)."""
+
+        states = {}
+        for signal, value_key, rate_key in SIGNALS:
+            value = _number(payload.get(value_key))
+            rate = _number(payload.get(rate_key))
+            if value is not None and rate is not None:
+                states[signal] = (value, rate)
+        if not states:
+            return None
+
+        warnings = []
+        changes = []
+        grades: Dict[str, str] = {}
+        for name, signal, level, direction in self.thresholds(payload):
+            if signal not in states:
+                grades[name] = self.grades.get(name, "")
+                continue
+            value, rate = states[signal]
+            seconds = time_to_threshold(value, rate, level, direction)
+            previous = self.grades.get(name, "")
+            grade = grade_for(seconds, previous)
+            grades[name] = grade
+            if grade != previous:
+                changes.append({"name": name, "from": previous, "to": grade})
+            if grade:
+                warnings.append(
+                    {
+                        "name": name,
+                        "signal": signal,
+                        "grade": grade,
+                        "time_to_threshold_s": seconds,
+                        "threshold": level,
+                        "value": value,
+                        "rate": rate,
+                    }
+                )
+        # Thresholds that disappeared (e.g. cooling mode ended) clear too.
+        for name, previous in self.grades.items():
+            if name not in grades and previous:
+                changes.append({"name": name, "from": previous, "to": ""})
+        self.grades = {name: grade for name, grade in grades.items() if grade}
+
+        warnings.sort(key=lambda item: (-GRADE_RANK[item["grade"]], item["time_to_threshold_s"] or 0.0))
+        return {
+            "level": warnings[0]["grade"] if warnings else "",
+            "warnings": warnings,
+            "changes": changes,
+        }
+
+    def __call__(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        result = self.evaluate(payload)
+        if result is not None:
+            payload["early_warning"] = result
+        return payload
+
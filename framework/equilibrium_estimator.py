@@ -0,0 +1,244 @@
+# Musehypothermi Python Equilibrium Estimator Module
+# File: equilibrium_estimator.py
+#
+# Host-side streaming estimate of the temperature a signal is settling
+# towards. A first-order approach is T(t) = T_eq + C exp(-t / tau); for a
+# fixed tau that is linear in (T_eq, C), so a small bank of time constants
+# (20 s to 2 h) is fitted side by side by recursive least squares with
+# exponential forgetting on binned telemetry, in constant time per sample.
+# The bank is averaged by likelihood, and the band combines each fit's
+# covariance with the spread between time constants. A prediction with an
+# honest uncertainty is therefore available while the approach is still
+# under way, long before the firmware's five-minute stability window ends.
+#
+# EquilibriumTracker applies the estimator to status frames: the plate is
+# only tracked while the output is passive (as in the firmware estimate,
+# which holds PWM at 0), the rectal probe from the last plate setpoint
+# change onwards.
+
+import math
+from typing import Any, Dict, Optional
+
+SAMPLE_INTERVAL_S = 2.0
+MEMORY_S = 600.0
+MIN_SAMPLES = 15
+MAX_GAP_S = 10.0
+CONFIDENCE_Z = 1.96
+CONVERGED_BAND_C = 0.1
+PASSIVE_OUTPUT_PCT = 5.0
+SETPOINT_CHANGE_C = 0.05
+TIME_CONSTANTS_S = tuple(20.0 * 1.08 ** index for index in range(78))  # 20 s .. ~2 h
+_INITIAL_COVARIANCE = 1e4
+
+
+class EquilibriumEstimate:
+    """Predicted equilibrium with a CONFIDENCE_Z band."""
+
+    FIELDS = ("temperature", "uncertainty", "time_constant", "samples", "span_s", "converged")
+
+    def __init__(
+        self,
+        temperature: float,
+        uncertainty: float,
+        time_constant: float,
+        samples: int,
+        span_s: float,
+    ):
+        self.temperature = temperature
+        self.uncertainty = uncertainty
+        self.time_constant = time_constant
+        self.samples = samples
+        self.span_s = span_s
+        self.converged = uncertainty <= CONVERGED_BAND_C
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class _ApproachFit:
+    """RLS fit of (T_eq, C) for one time constant.
+
+    Time is re-anchored to the newest bin at every step, so the regressor
+    is always (1, 1) and C is the remaining distance from equilibrium.
+    """
+
+    def __init__(self, time_constant: float):
+        self.time_constant = time_constant
+        self.level = 0.0
+        self.transient = 0.0
+        self.p11 = self.p22 = _INITIAL_COVARIANCE
+        self.p12 = 0.0
+        self.sse = 0.0
+
+    def update(self, value: float, elapsed: float, forgetting: float) -> None:
+        decay = math.exp(-elapsed / self.time_constant)
+        self.transient *= decay
+        self.p12 *= decay
+        self.p22 *= decay * decay
+
+        p11, p12, p22 = self.p11, self.p12, self.p22
+        k1 = p11 + p12
+        k2 = p12 + p22
+        denominator = forgetting + k1 + k2
+        k1 /= denominator
+        k2 /= denominator
+        error = value - self.level - self.transient
+        self.level += k1 * error
+        self.transient += k2 * error
+        self.p11 = (p11 - k1 * (p11 + p12)) / forgetting
+        self.p12 = (p12 - k1 * (p12 + p22)) / forgetting
+        self.p22 = (p22 - k2 * (p12 + p22)) / forgetting
+
+        residual = value - self.level - self.transient
+        self.sse = forgetting * self.sse + residual * residual
+
+
+class ExponentialApproachEstimator:
+    """Streaming first-order equilibrium fit for one signal."""
+
+    def __init__(self, sample_interval: float = SAMPLE_INTERVAL_S, memory_s: float = MEMORY_S):
+        if sample_interval <= 0 or memory_s <= sample_interval:
+            raise ValueError("memory_s must exceed a positive sample_interval")
+        self.sample_interval = sample_interval
+        self.forgetting = 1.0 - sample_interval / memory_s
+        self.reset()
+
+    def reset(self) -> None:
+        self.estimate: Optional[EquilibriumEstimate] = None
+        self.samples = 0
+        self._started_at: Optional[float] = None
+        self._bin_start: Optional[float] = None
+        self._bin_sum = 0.0
+        self._bin_time_sum = 0.0
+        self._bin_count = 0
+        self._bin_time: Optional[float] = None
+        self._last_time: Optional[float] = None
+        self._weight = 0.0
+        # Values are taken relative to the first bin for conditioning.
+        self._offset: Optional[float] = None
+        self._fits = [_ApproachFit(tau) for tau in TIME_CONSTANTS_S]
+
+    def add_sample(self, t_value: float, value: float) -> Optional[EquilibriumEstimate]:
+        """Add one reading; returns the current estimate (None until identifiable)."""
+
+        if not math.isfinite(value):
+            return self.estimate
+        if self._last_time is not None and (t_value < self._last_time or t_value - self._last_time > MAX_GAP_S):
+            self.reset()
+        self._last_time = t_value
+        if self._bin_start is None:
+            self._bin_start = t_value
+            if self._started_at is None:
+                self._started_at = t_value
+
+        if t_value - self._bin_start >= self.sample_interval and self._bin_count:
+            self._update(self._bin_time_sum / self._bin_count, self._bin_sum / self._bin_count)
+            self._bin_start = t_value
+            self._bin_sum = 0.0
+            self._bin_time_sum = 0.0
+            self._bin_count = 0
+        self._bin_sum += value
+        self._bin_time_sum += t_value
+        self._bin_count += 1
+        return self.estimate
+
+    def _update(self, t_bin: float, value: float) -> None:
+        if self._offset is None:
+            self._offset = value
+        # Bins close on the first frame past sample_interval, so they are
+        # usually further apart than that; decay and forget over the real gap.
+        elapsed = 0.0 if self._bin_time is None else t_bin - self._bin_time
+        self._bin_time = t_bin
+        forgetting = self.forgetting ** (elapsed / self.sample_interval)
+        x = value - self._offset
+        for fit in self._fits:
+            fit.update(x, elapsed, forgetting)
+        self._weight = forgetting * self._weight + 1.0
+        self.samples += 1
+        if self.samples >= MIN_SAMPLES:
+            self.estimate = self._estimate()
+
+    def _estimate(self) -> EquilibriumEstimate:
+        fits = self._fits
+        index = min(range(len(fits)), key=lambda i: fits[i].sse)
+        best = fits[index]
+        dof = max(self._weight - 2.0, 1.0)
+        variance = max(best.sse / dof, 1e-12)
+
+        # Refine between grid points with a parabola through the SSE; the
+        # level difference across one grid step bounds the resolution.
+        level = best.level
+        time_constant = best.time_constant
+        resolution = 0.0
+        if 0 < index < len(fits) - 1:
+            lower, upper = fits[index - 1], fits[index + 1]
+            curvature = lower.sse - 2.0 * best.sse + upper.sse
+            shift = 0.5 * (lower.sse - upper.sse) / curvature if curvature > 0 else 0.0
+            shift = max(-0.5, min(0.5, shift))
+            slope = 0.5 * (upper.level - lower.level)
+            level += shift * slope + 0.5 * shift * shift * (upper.level - 2.0 * best.level + lower.level)
+            neighbour = upper if shift > 0 else lower
+            time_constant *= (neighbour.time_constant / best.time_constant) ** abs(shift)
+            resolution = 0.5 * abs(slope)
+
+        # Likelihood weights over the time-constant bank.
+        weights = [math.exp(-(fit.sse - best.sse) / (2.0 * variance)) for fit in fits]
+        total = sum(weights)
+        spread = sum(
+            w * (variance * fit.p11 + (fit.level - level) ** 2) for w, fit in zip(weights, fits)
+        ) / total
+
+        return EquilibriumEstimate(
+            self._offset + level,
+            CONFIDENCE_Z * math.sqrt(max(spread, 0.0) + resolution * resolution),
+            time_constant,
+            self.samples,
+            self._last_time - self._started_at,
+        )
+
+
+class EquilibriumTracker:
+    """Plate and rectal equilibrium estimates from status frames."""
+
+    def __init__(self, sample_interval: float = SAMPLE_INTERVAL_S, memory_s: float = MEMORY_S):
+        self.plate = ExponentialApproachEstimator(sample_interval, memory_s)
+        self.rectal = ExponentialApproachEstimator(sample_interval, memory_s)
+        self._plate_passive = False
+        self._target: Optional[float] = None
+
+    def reset(self) -> None:
+        self.plate.reset()
+        self.rectal.reset()
+        self._plate_passive = False
+        self._target = None
+
+    def update(
+        self,
+        t_value: float,
+        plate: Optional[float] = None,
+        rectal: Optional[float] = None,
+        output: Optional[float] = None,
+        target: Optional[float] = None,
+        estimating: bool = False,
+    ) -> None:
+        """Feed one frame; *estimating* marks the firmware's PWM=0 estimate."""
+
+        passive = estimating or (output is not None and abs(output) <= PASSIVE_OUTPUT_PCT)
+        if passive != self._plate_passive:
+            self.plate.reset()
+            self._plate_passive = passive
+        if passive and plate is not None:
+            self.plate.add_sample(t_value, plate)
+
+        if target is not None:
+            if self._target is not None and abs(target - self._target) > SETPOINT_CHANGE_C:
+                self.rectal.reset()
+            self._target = target
+        if rectal is not None:
+            self.rectal.add_sample(t_value, rectal)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "plate": self.plate.estimate.as_dict() if self.plate.estimate is not None else None,
+            "rectal": self.rectal.estimate.as_dict() if self.rectal.estimate is not None else None,
+        }
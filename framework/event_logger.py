@@ -3,6 +3,8 @@ import os
 import json
 from datetime import datetime
 
+from framework.journal import atomic_write_json
+
 # All auto-generated timestamps use this canonical format.
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
@@ -63,8 +65,7 @@ class EventLogger:
     def flush_json(self):
         """Write JSON buffer to file."""
         try:
-            with open(self.filename_json, "w", encoding="utf-8") as file:
-                json.dump(self.json_content, file, indent=4)
+            atomic_write_json(self.filename_json, self.json_content)
         except Exception as e:
             print(f"❌ Failed to flush JSON log: {e}")
             try:
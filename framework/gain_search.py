@@ -0,0 +1,293 @@
+# Musehypothermi Python Gain Search Module
+# File: gain_search.py
+#
+# Closed-loop comparison of PID candidates before they are written to the
+# controller. The identified FOPDT plant (autotune gain, time constant and
+# dead time) is mapped onto the thermal_simulation plate model, and a grid
+# of Kp/Ki/Kd candidates for one mode is simulated as a single ensemble on a
+# setpoint step through the reference firmware PID (output limits, deadband
+# mode switching, tapering, rate limiting). Candidates are scored by IAE,
+# overshoot, settling time and time at the output limit, and the
+# non-dominated (Pareto) set is returned. Heating candidates are tested on an upward step, cooling
+# candidates on a downward one, with the other mode on its current gains.
+#
+#   python -m framework.gain_search --gain 0.12 --tau 180 --dead-time 25 --mode heating
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from framework.profile_timeline import ProfileTimeline
+from framework.thermal_simulation import (
+    DEFAULT_DT_S,
+    FAILSAFE_REASONS,
+    PIDParameters,
+    PlantParameters,
+    simulate_profile,
+)
+
+MODES = ("heating", "cooling")
+DEFAULT_STEP_C = 2.0
+# Settling band: AutotuneDataAnalyzer's tolerance, widened to the controller
+# deadband, inside which the firmware's mode switching leaves a small ripple.
+# It is measured around the final value reached: the firmware's output taper
+# leaves a steady offset from the setpoint that no gain set removes, and
+# that offset is already counted in the IAE.
+SETTLING_BAND_C = 0.1
+# Share of the horizon averaged for the final value, which must stay in the band.
+FINAL_WINDOW_FRACTION = 0.1
+STEP_DELAY_S = 30.0
+MIN_HORIZON_S = 600.0
+HORIZON_TIME_CONSTANTS = 8.0
+DEFAULT_GRID_POINTS = 8
+
+# Search ranges per gain when the caller gives none (the firmware's accepted
+# ranges in main/pid_module_asymmetric.cpp are much wider than is useful).
+DEFAULT_LIMITS = {
+    "heating": {"kp": (0.05, 10.0), "ki": (0.001, 1.0), "kd": (0.0, 20.0)},
+    "cooling": {"kp": (0.02, 5.0), "ki": (0.001, 0.5), "kd": (0.0, 20.0)},
+}
+
+
+def plant_from_fopdt(
+    gain: float,
+    time_constant: float,
+    dead_time: float,
+    baseline: float,
+    cooling_gain: Optional[float] = None,
+) -> PlantParameters:
+    """Plate model with the step response of an identified FOPDT plant.
+
+    *gain* is in °C per % output (the autotune ``process_gain`` / 100), the
+    same for both directions unless *cooling_gain* is given. The plate loses
+    heat towards *baseline*, so zero output holds it there.
+    """
+
+    if time_constant <= 0:
+        raise ValueError("time_constant must be positive")
+    if gain <= 0 or (cooling_gain is not None and cooling_gain <= 0):
+        raise ValueError("Plant gains must be positive °C per % output")
+
+    plant = PlantParameters(ambient_temp=baseline, plate_dead_time_s=max(0.0, dead_time))
+    loss = plant.plate_heat_capacity / time_constant
+    plant.plate_loss_w_per_c = loss
+    plant.heating_power_w = gain * 100.0 * loss
+    plant.cooling_power_w = (gain if cooling_gain is None else cooling_gain) * 100.0 * loss
+    return plant
+
+
+def candidate_grid(limits: Dict[str, Tuple[float, float]], points: int = DEFAULT_GRID_POINTS) -> np.ndarray:
+    """All Kp/Ki/Kd combinations on a per-gain grid, as rows of an ``(n, 3)`` array.
+
+    Gains are spaced logarithmically; a lower bound of zero (derivative off)
+    is kept as its own grid value.
+    """
+
+    if points < 2:
+        raise ValueError("points must be at least 2")
+
+    axes = []
+    for key in ("kp", "ki", "kd"):
+        low, high = (float(value) for value in limits[key])
+        if low < 0 or high <= 0 or high < low:
+            raise ValueError(f"Invalid {key} range ({low}, {high})")
+        if low == 0:
+            axes.append(np.concatenate(([0.0], np.geomspace(high / 100.0, high, points - 1))))
+        else:
+            axes.append(np.geomspace(low, high, points))
+    return np.stack([axis.ravel() for axis in np.meshgrid(*axes, indexing="ij")], axis=1)
+
+
+def pareto_front(costs: np.ndarray, chunk: int = 512) -> np.ndarray:
+    """Boolean mask of the rows of *costs* that no other row dominates."""
+
+    costs = np.asarray(costs, dtype=np.float64)
+    front = np.ones(costs.shape[0], dtype=bool)
+    for start in range(0, costs.shape[0], chunk):
+        block = costs[start:start + chunk, None, :]
+        no_worse = np.all(costs[None, :, :] <= block, axis=2)
+        better = np.any(costs[None, :, :] < block, axis=2)
+        front[start:start + chunk] = ~np.any(no_worse & better, axis=1)
+    return front
+
+
+class GainCandidate:
+    """One simulated gain set and its step-response scores."""
+
+    FIELDS = (
+        "mode", "source", "kp", "ki", "kd", "iae", "overshoot", "settling_time",
+        "saturated_s", "settled", "failsafe_reason",
+    )
+
+    def __init__(self, **values: Any):
+        for name in self.FIELDS:
+            setattr(self, name, values.get(name))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __repr__(self) -> str:
+        return (
+            f"GainCandidate({self.mode} Kp={self.kp:.3f} Ki={self.ki:.4f} Kd={self.kd:.3f}: "
+            f"IAE={self.iae:.1f}, overshoot={self.overshoot:.2f}, settling={self.settling_time:.0f}s)"
+        )
+
+
+class GainSearchResult:
+    """All candidates of one search plus the Pareto set, sorted by IAE."""
+
+    def __init__(self, mode: str, candidates: List[GainCandidate], pareto: List[GainCandidate], elapsed_s: float):
+        self.mode = mode
+        self.candidates = candidates
+        self.pareto = pareto
+        self.elapsed_s = elapsed_s
+
+    @property
+    def best(self) -> Optional[GainCandidate]:
+        return self.pareto[0] if self.pareto else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "evaluated": len(self.candidates),
+            "feasible": sum(1 for candidate in self.candidates if candidate.settled and not candidate.failsafe_reason),
+            "elapsed_s": self.elapsed_s,
+            "pareto": [candidate.as_dict() for candidate in self.pareto],
+        }
+
+
+def search_gains(
+    plant: PlantParameters,
+    mode: str = "heating",
+    step: float = DEFAULT_STEP_C,
+    pid: Optional[PIDParameters] = None,
+    limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    points: int = DEFAULT_GRID_POINTS,
+    extra: Optional[Dict[str, Sequence[float]]] = None,
+    dt: float = DEFAULT_DT_S,
+    horizon_s: Optional[float] = None,
+) -> GainSearchResult:
+    """Simulate a grid of *mode* gains on a *step* °C setpoint step.
+
+    *pid* supplies the output limits, deadband, safety settings and the
+    other mode's gains (firmware defaults if omitted). *extra* maps a source
+    label to a ``(kp, ki, kd)`` set that is scored alongside the grid, e.g.
+    the autotune recommendation and the gains currently on the controller.
+    A candidate is feasible when it settles within ±max(0.1 °C, deadband)
+    of its final value before the end of the horizon without tripping the
+    failsafe; only feasible candidates enter the Pareto set over (IAE,
+    overshoot, settling time, time at the output limit).
+    """
+
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+    if step <= 0:
+        raise ValueError("step must be positive")
+
+    started = time.perf_counter()
+    pid = pid or PIDParameters()
+    limits = limits or DEFAULT_LIMITS[mode]
+
+    gains = candidate_grid(limits, points)
+    sources = ["grid"] * len(gains)
+    for label, values in (extra or {}).items():
+        gains = np.vstack([gains, np.asarray(values, dtype=np.float64).reshape(1, 3)])
+        sources.append(label)
+
+    # Step from equilibrium at the plant baseline.
+    baseline = float(plant.ambient_temp)
+    direction = 1.0 if mode == "heating" else -1.0
+    target = baseline + direction * step
+    if horizon_s is None:
+        time_constant = plant.plate_heat_capacity / plant.plate_loss_w_per_c
+        horizon_s = max(MIN_HORIZON_S, HORIZON_TIME_CONSTANTS * (time_constant + plant.plate_dead_time_s))
+    timeline = ProfileTimeline(
+        [0.0, STEP_DELAY_S, STEP_DELAY_S + horizon_s], [baseline, target, target]
+    )
+
+    members = PIDParameters(**pid.as_dict())
+    prefix = "heating" if mode == "heating" else "cooling"
+    setattr(members, f"kp_{prefix}", gains[:, 0])
+    setattr(members, f"ki_{prefix}", gains[:, 1])
+    setattr(members, f"kd_{prefix}", gains[:, 2])
+
+    result = simulate_profile(timeline, plant=plant, pid=members, dt=dt, initial_plate=baseline)
+
+    after = result.times >= STEP_DELAY_S
+    plate = result.plate[:, after]
+    error = plate - target
+    window = max(1, int(round(plate.shape[1] * FINAL_WINDOW_FRACTION)))
+    final = plate[:, -window:].mean(axis=1, keepdims=True)
+    outside = np.abs(plate - final) > max(SETTLING_BAND_C, float(pid.deadband))
+    # Index of the last sample outside the band, counted from the step.
+    last_outside = np.where(
+        outside.any(axis=1), outside.shape[1] - 1 - np.argmax(outside[:, ::-1], axis=1), -1
+    )
+    iae = np.sum(np.abs(error), axis=1) * dt
+    overshoot = np.maximum(np.max(direction * error, axis=1), 0.0)
+    settling = (last_outside + 1) * dt
+    settled = ~outside[:, -window:].any(axis=1)
+    limit = abs(float(pid.heating_limit if mode == "heating" else pid.cooling_limit))
+    saturated = np.count_nonzero(np.abs(result.output[:, after]) >= limit * 0.99, axis=1) * dt
+    failed = ~np.isnan(result.failsafe_time)
+
+    candidates = [
+        GainCandidate(
+            mode=mode,
+            source=source,
+            kp=float(kp), ki=float(ki), kd=float(kd),
+            iae=float(iae_value),
+            overshoot=float(overshoot_value),
+            settling_time=float(settling_value),
+            saturated_s=float(saturated_value),
+            settled=bool(settled_value),
+            failsafe_reason=FAILSAFE_REASONS[int(code)] or None,
+        )
+        for source, (kp, ki, kd), iae_value, overshoot_value, settling_value, saturated_value, settled_value, code
+        in zip(sources, gains.tolist(), iae, overshoot, settling, saturated, settled, result.failsafe_code)
+    ]
+
+    feasible = np.flatnonzero(settled & ~failed)
+    costs = np.stack([iae, overshoot, settling, saturated], axis=1)
+    front = feasible[pareto_front(costs[feasible])]
+    front = front[np.lexsort((overshoot[front], iae[front]))]
+    return GainSearchResult(
+        mode, candidates, [candidates[index] for index in front.tolist()], time.perf_counter() - started
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search PID gains on an identified FOPDT plant")
+    parser.add_argument("--gain", type=float, required=True, help="Plant gain in °C per %% output")
+    parser.add_argument("--tau", type=float, required=True, help="Time constant in seconds")
+    parser.add_argument("--dead-time", type=float, default=0.0, help="Dead time in seconds")
+    parser.add_argument("--baseline", type=float, default=30.0, help="Plate temperature at zero output")
+    parser.add_argument("--mode", choices=MODES, default="heating")
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP_C, help="Setpoint step in °C")
+    parser.add_argument("--points", type=int, default=DEFAULT_GRID_POINTS, help="Grid points per gain")
+    parser.add_argument("--top", type=int, default=10, help="Pareto candidates to print")
+    args = parser.parse_args(argv)
+
+    plant = plant_from_fopdt(args.gain, args.tau, args.dead_time, args.baseline)
+    result = search_gains(plant, mode=args.mode, step=args.step, points=args.points)
+    summary = result.as_dict()
+    print(
+        f"🔎 {summary['evaluated']} {args.mode} candidates, {summary['feasible']} feasible, "
+        f"{len(result.pareto)} on the Pareto front in {result.elapsed_s:.2f}s"
+    )
+    if not result.pareto:
+        print("⚠️ No candidate settled within the horizon.")
+        return 1
+    for candidate in result.pareto[:args.top]:
+        print(
+            f"   Kp {candidate.kp:7.3f}  Ki {candidate.ki:7.4f}  Kd {candidate.kd:7.3f}  "
+            f"IAE {candidate.iae:8.1f}  overshoot {candidate.overshoot:5.2f} °C  "
+            f"settling {candidate.settling_time:6.0f} s  at limit {candidate.saturated_s:5.0f} s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,440 @@
+# Musehypothermi Python Journal Module
+# File: journal.py
+#
+# Crash-safe write-ahead journal for experiment logs. Every record is written
+# as one compact JSON line prefixed with its CRC32, so a torn or corrupted
+# line can be detected and skipped during recovery.
+
+import argparse
+import csv
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+JOURNAL_EXTENSION = ".journal"
+
+# Durability levels, from fastest to safest:
+#   none     - hand every record to the OS (survives a process crash)
+#   interval - additionally fsync at most every ``fsync_interval_seconds``
+#   always   - fsync after every record (survives power loss)
+FSYNC_POLICIES = ("none", "interval", "always")
+
+DATA_FIELDS = ("cooling_plate_temp", "rectal_temp", "pid_output", "breath_freq_bpm")
+# State-filter estimates (framework.state_filter). They follow the comment
+# column, so the Logger layout of the first six columns is unchanged.
+FILTERED_FIELDS = ("cooling_plate_temp_filtered", "cooling_plate_rate", "rectal_temp_filtered", "rectal_rate")
+CSV_HEADER = ["timestamp", *DATA_FIELDS, "comment", *FILTERED_FIELDS]
+
+
+def encode_record(record: Dict[str, Any]) -> str:
+    """Serialise *record* as ``<crc32> <compact json>\\n``."""
+
+    payload = json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+    crc = zlib.crc32(payload.encode("utf-8")) & 0xFFFFFFFF
+    return f"{crc:08x} {payload}\n"
+
+
+def decode_line(line: str) -> Optional[Dict[str, Any]]:
+    """Return the record stored in *line*, or ``None`` if it fails its checksum."""
+
+    line = line.rstrip("\r\n")
+    if len(line) < 10 or line[8] != " ":
+        return None
+
+    try:
+        expected = int(line[:8], 16)
+    except ValueError:
+        return None
+
+    payload = line[9:]
+    if zlib.crc32(payload.encode("utf-8")) & 0xFFFFFFFF != expected:
+        return None
+
+    try:
+        record = json.loads(payload)
+    except json.JSONDecodeError:
+        return None
+
+    return record if isinstance(record, dict) else None
+
+
+def iter_journal(path: str, stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield every valid record in the journal at *path*.
+
+    Corrupt lines (typically a torn final write after a crash) are skipped and
+    counted in ``stats["corrupt"]`` when a *stats* dict is supplied.
+    """
+
+    if stats is not None:
+        stats.setdefault("records", 0)
+        stats.setdefault("corrupt", 0)
+
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = decode_line(line)
+            if record is None:
+                if stats is not None:
+                    stats["corrupt"] += 1
+                continue
+            if stats is not None:
+                stats["records"] += 1
+            yield record
+
+
+def atomic_write_json(path: str, content: Any, indent: Optional[int] = 4, fsync: bool = False):
+    """Write *content* to *path* via a temporary file and ``os.replace``.
+
+    Readers either see the previous complete document or the new one, never a
+    half-written file.
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(content, file, indent=indent)
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class JournalWriter:
+    """Append-only journal writer with a configurable fsync policy."""
+
+    def __init__(
+        self,
+        path: str,
+        fsync_policy: str = "interval",
+        fsync_interval_seconds: float = 1.0,
+    ):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy '{fsync_policy}'. Use one of: {', '.join(FSYNC_POLICIES)}"
+            )
+
+        self.path = path
+        self.fsync_policy = fsync_policy
+        self.fsync_interval_seconds = max(0.0, float(fsync_interval_seconds))
+        self.records_written = 0
+        self.closed = False
+
+        needs_newline = False
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                needs_newline = existing.read(1) != b"\n"
+
+        self._file = open(path, "a", encoding="utf-8", newline="\n")
+        if needs_newline:
+            # Terminate a torn record left by a crash so new records stay readable.
+            self._file.write("\n")
+        self._last_fsync = time.monotonic()
+        self._dirty = False
+
+    def append(self, record: Dict[str, Any]):
+        """Write one record and apply the fsync policy."""
+
+        if self.closed:
+            raise ValueError("Journal is closed")
+
+        self._file.write(encode_record(record))
+        self._file.flush()
+        self.records_written += 1
+        self._dirty = True
+
+        if self.fsync_policy == "always":
+            self._fsync()
+        elif self.fsync_policy == "interval":
+            if time.monotonic() - self._last_fsync >= self.fsync_interval_seconds:
+                self._fsync()
+
+    def sync(self):
+        """Force pending records to stable storage regardless of policy."""
+
+        if self.closed:
+            return
+        self._file.flush()
+        self._fsync()
+
+    def _fsync(self):
+        if not self._dirty:
+            return
+        os.fsync(self._file.fileno())
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self.fsync_policy != "none":
+                self.sync()
+        finally:
+            self._file.close()
+            self.closed = True
+
+
+# ---------------------------------------------------------------------------
+# Recovery
+# ---------------------------------------------------------------------------
+
+def _csv_value(value):
+    return "NaN" if value is None else value
+
+
+def write_session_outputs(
+    records: Iterable[Dict[str, Any]],
+    csv_path: str,
+    json_path: str,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """Rebuild Logger-compatible CSV and JSON files from journal *records*.
+
+    The CSV is streamed row by row; the JSON document is written once and
+    atomically. Returns row counts per record type.
+    """
+
+    counts = {"data": 0, "comment": 0, "event": 0}
+    content: Dict[str, Any] = {
+        "metadata": dict(metadata) if metadata else {},
+        "data": [],
+        "comments": [],
+        "events": [],
+    }
+
+    csv_dir = os.path.dirname(os.path.abspath(csv_path))
+    fd, tmp_csv = tempfile.mkstemp(prefix=".tmp_", suffix=".csv", dir=csv_dir)
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            header_written = False
+            # Comment and event rows have no filtered values but keep the width.
+            no_filtered = [""] * len(FILTERED_FIELDS)
+
+            for record in records:
+                kind = record.get("type")
+
+                if kind in ("header", "metadata"):
+                    if kind == "header" and isinstance(record.get("metadata"), dict) and not metadata:
+                        content["metadata"] = dict(record["metadata"])
+                    continue
+
+                if not header_written:
+                    for key, value in content["metadata"].items():
+                        writer.writerow([f"# {key}: {value}"])
+                    writer.writerow(CSV_HEADER)
+                    header_written = True
+
+                timestamp = record.get("timestamp", "")
+                if kind == "data":
+                    writer.writerow(
+                        [timestamp]
+                        + [_csv_value(record.get(field)) for field in DATA_FIELDS]
+                        + [""]
+                        + [_csv_value(record.get(field)) for field in FILTERED_FIELDS]
+                    )
+                    entry = {"timestamp": timestamp}
+                    for field in DATA_FIELDS:
+                        entry[field] = record.get(field)
+                    for field in FILTERED_FIELDS:
+                        if record.get(field) is not None:
+                            entry[field] = record[field]
+                    content["data"].append(entry)
+                    counts["data"] += 1
+                elif kind == "comment":
+                    comment = record.get("comment", "")
+                    writer.writerow([timestamp, "", "", "", "", comment] + no_filtered)
+                    content["comments"].append({"timestamp": timestamp, "comment": comment})
+                    counts["comment"] += 1
+                elif kind == "event":
+                    event = record.get("event", "")
+                    writer.writerow([timestamp, "", "", "", "", f"EVENT: {event}"] + no_filtered)
+                    content["events"].append({"timestamp": timestamp, "event": event})
+                    counts["event"] += 1
+
+            if not header_written:
+                for key, value in content["metadata"].items():
+                    writer.writerow([f"# {key}: {value}"])
+                writer.writerow(CSV_HEADER)
+
+        os.replace(tmp_csv, csv_path)
+    except BaseException:
+        try:
+            os.remove(tmp_csv)
+        except OSError:
+            pass
+        raise
+
+    atomic_write_json(json_path, content)
+    return counts
+
+
+def journal_is_clean(path: str) -> bool:
+    """Return ``True`` if the journal ends with a close record."""
+
+    last = None
+    for record in iter_journal(path):
+        last = record
+    return bool(last and last.get("type") == "close")
+
+
+def recover_journal(path: str, output_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Rebuild the CSV/JSON outputs described by the journal at *path*.
+
+    Output paths come from the journal header; *output_dir* redirects them.
+    Returns a summary with output paths, record counts and corrupt line count.
+    """
+
+    stats: Dict[str, int] = {}
+    header: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = {}
+    for record in iter_journal(path):
+        kind = record.get("type")
+        if kind == "header" and not header:
+            header = record
+            metadata.update(record.get("metadata") or {})
+        elif kind == "metadata":
+            # Session writers append metadata learned after the header (port etc.)
+            metadata.update(record.get("metadata") or {})
+
+    base = os.path.splitext(path)[0]
+    csv_path = header.get("csv") or base + ".csv"
+    json_path = header.get("json") or base + ".json"
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        csv_path = os.path.join(output_dir, os.path.basename(csv_path))
+        json_path = os.path.join(output_dir, os.path.basename(json_path))
+
+    clean = False
+
+    def _tracked(records):
+        nonlocal clean
+        for record in records:
+            clean = record.get("type") == "close"
+            yield record
+
+    counts = write_session_outputs(
+        _tracked(iter_journal(path, stats)), csv_path, json_path, metadata=metadata
+    )
+
+    return {
+        "journal": path,
+        "csv": csv_path,
+        "json": json_path,
+        "clean_shutdown": clean,
+        "corrupt_lines": stats.get("corrupt", 0),
+        **counts,
+    }
+
+
+def find_unclean_journals(directory: str = "logs") -> List[str]:
+    """List journals in *directory* that were not closed cleanly."""
+
+    pattern = os.path.join(directory, f"*{JOURNAL_EXTENSION}")
+    return [path for path in sorted(glob.glob(pattern)) if not journal_is_clean(path)]
+
+
+# ---------------------------------------------------------------------------
+# Durability benchmark
+# ---------------------------------------------------------------------------
+
+def benchmark_fsync_policies(
+    record_count: int = 2000,
+    directory: Optional[str] = None,
+    fsync_interval_seconds: float = 1.0,
+) -> Dict[str, Dict[str, float]]:
+    """Measure journal write cost for each fsync policy.
+
+    Returns ``{policy: {"seconds", "us_per_record", "records_per_second"}}``.
+    """
+
+    sample = {
+        "type": "data",
+        "timestamp": "2025-01-01 12:00:00",
+        "cooling_plate_temp": 21.734,
+        "rectal_temp": 35.912,
+        "pid_output": -42.5,
+        "breath_freq_bpm": 88.0,
+    }
+
+    results: Dict[str, Dict[str, float]] = {}
+    workdir = tempfile.mkdtemp(prefix="journal_bench_", dir=directory)
+    try:
+        for policy in FSYNC_POLICIES:
+            path = os.path.join(workdir, f"bench_{policy}{JOURNAL_EXTENSION}")
+            writer = JournalWriter(path, fsync_policy=policy, fsync_interval_seconds=fsync_interval_seconds)
+            start = time.perf_counter()
+            for _ in range(record_count):
+                writer.append(sample)
+            writer.close()
+            elapsed = time.perf_counter() - start
+
+            results[policy] = {
+                "seconds": elapsed,
+                "us_per_record": elapsed / record_count * 1e6,
+                "records_per_second": record_count / elapsed if elapsed > 0 else float("inf"),
+            }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Musehypothermi journal recovery tool")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    recover = sub.add_parser("recover", help="Rebuild CSV/JSON from journal files")
+    recover.add_argument("journals", nargs="*", help="Journal files (default: all unclean journals in --logs)")
+    recover.add_argument("--logs", default="logs", help="Log directory to scan")
+    recover.add_argument("--output-dir", default=None, help="Write rebuilt files here instead")
+
+    bench = sub.add_parser("benchmark", help="Measure the cost of each fsync policy")
+    bench.add_argument("--records", type=int, default=2000, help="Records per policy")
+    bench.add_argument("--dir", default=None, help="Directory on the disk to measure")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "recover":
+        journals = args.journals or find_unclean_journals(args.logs)
+        if not journals:
+            print("✅ No unclean journals found.")
+            return 0
+        for path in journals:
+            try:
+                summary = recover_journal(path, args.output_dir)
+            except Exception as exc:
+                print(f"❌ Failed to recover {path}: {exc}")
+                continue
+            state = "clean" if summary["clean_shutdown"] else "unclean"
+            print(
+                f"♻️ {path} ({state}): {summary['data']} data, {summary['comment']} comments, "
+                f"{summary['event']} events, {summary['corrupt_lines']} corrupt lines"
+            )
+            print(f"   → {summary['csv']}")
+            print(f"   → {summary['json']}")
+        return 0
+
+    results = benchmark_fsync_policies(args.records, args.dir)
+    print(f"{'policy':<10} {'µs/record':>12} {'records/s':>12}")
+    for policy, result in results.items():
+        print(f"{policy:<10} {result['us_per_record']:>12.1f} {result['records_per_second']:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
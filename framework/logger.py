@@ -3,10 +3,11 @@
 
 import csv
 import os
-import json
 import time
 from datetime import datetime
 
+from framework.journal import atomic_write_json
+
 # All auto-generated timestamps use this canonical format.
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
@@ -131,8 +132,8 @@ class Logger:
         self._last_flush = time.monotonic()
 
     def flush_json(self):
-        with open(self.filename_json, "w") as file:
-            json.dump(self.json_content, file, indent=4)
+        # Replace atomically so a crash mid-write never leaves a corrupt document.
+        atomic_write_json(self.filename_json, self.json_content)
 
     def close(self):
         print("📝 Closing logger and writing JSON file...")
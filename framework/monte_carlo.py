@@ -0,0 +1,261 @@
+# Musehypothermi Python Monte Carlo Module
+# File: monte_carlo.py
+#
+# Robustness check of a profile across animals. Plant parameters (rectal
+# coupling gain, dead time, time constant, sensor noise ...) are sampled from
+# ranges, the runs are split into chunks simulated as ensembles by
+# thermal_simulation.simulate_profile on a process pool, and the results are
+# reduced to percentile bands for the rectal temperature, the distribution of
+# time spent outside target and the risk of tripping the failsafe.
+#
+#   python -m framework.monte_carlo Profiles/profile.json --runs 2000 -o report.json
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from framework.profile_timeline import ProfileTimeline
+from framework.thermal_simulation import (
+    DEFAULT_DT_S,
+    FAILSAFE_REASONS,
+    PIDParameters,
+    PlantParameters,
+    simulate_profile,
+)
+
+# Uniform sampling ranges per PlantParameters field.
+DEFAULT_SPREAD: Dict[str, Tuple[float, float]] = {
+    "rectal_gain": (0.75, 1.0),
+    "rectal_tau_s": (600.0, 1500.0),
+    "dead_time_s": (30.0, 120.0),
+    "sensor_noise_c": (0.0, 0.1),
+}
+
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+
+
+def sample_parameters(
+    runs: int,
+    spread: Optional[Dict[str, Tuple[float, float]]] = None,
+    nominal: Optional[PlantParameters] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Draw *runs* plant parameter sets; fields outside *spread* stay nominal."""
+
+    spread = DEFAULT_SPREAD if spread is None else spread
+    nominal = nominal or PlantParameters()
+    unknown = set(spread) - set(PlantParameters.FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown plant parameter(s): {', '.join(sorted(unknown))}")
+
+    rng = np.random.default_rng(seed)
+    samples: Dict[str, np.ndarray] = {}
+    for name in PlantParameters.FIELDS:
+        if name in spread:
+            low, high = spread[name]
+            samples[name] = rng.uniform(low, high, runs)
+        else:
+            samples[name] = np.full(runs, float(getattr(nominal, name)))
+    return samples
+
+
+def _time_outside(values: np.ndarray, target: np.ndarray, tolerance: float, dt: float) -> np.ndarray:
+    """Seconds per member where a defined target is missed by more than *tolerance*."""
+
+    defined = ~np.isnan(target)
+    if not defined.any():
+        return np.zeros(values.shape[0])
+    return np.count_nonzero(np.abs(values[:, defined] - target[defined]) > tolerance, axis=1) * dt
+
+
+def _simulate_chunk(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Simulate one chunk of members (runs in a worker process)."""
+
+    timeline: ProfileTimeline = job["timeline"]
+    dt = job["dt"]
+    result = simulate_profile(
+        timeline,
+        plant=PlantParameters(**job["plant"]),
+        pid=PIDParameters(**job["pid"]),
+        dt=dt,
+        seed=job["seed"],
+    )
+    rectal_target = timeline.rectal_targets(result.times)
+    stride = job["stride"]
+    return {
+        "rectal": result.rectal[:, ::stride],
+        "plate_outside_s": _time_outside(result.plate, result.plate_target, job["tolerance"], dt),
+        "rectal_outside_s": _time_outside(result.rectal, rectal_target, job["tolerance"], dt),
+        "min_rectal": result.rectal.min(axis=1),
+        "failsafe_time": result.failsafe_time,
+        "failsafe_code": result.failsafe_code,
+    }
+
+
+def _distribution(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, float]:
+    return {f"p{percentile:g}": float(value) for percentile, value in zip(percentiles, np.percentile(values, percentiles))}
+
+
+def run_monte_carlo(
+    timeline: ProfileTimeline,
+    runs: int = 1000,
+    spread: Optional[Dict[str, Tuple[float, float]]] = None,
+    nominal: Optional[PlantParameters] = None,
+    pid: Optional[PIDParameters] = None,
+    dt: float = DEFAULT_DT_S,
+    tolerance: float = 0.5,
+    band_step_s: float = 10.0,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    workers: Optional[int] = None,
+    chunk_size: int = 250,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Simulate *runs* sampled plants and summarise the spread.
+
+    Time outside target counts samples where the plate (or the rectal probe,
+    during rectal override intervals) is more than *tolerance* °C from its
+    target. Bands are reported every *band_step_s* seconds. Results do not
+    depend on the number of workers for a given *seed*.
+    """
+
+    if runs < 1:
+        raise ValueError("runs must be at least 1")
+
+    started = time.perf_counter()
+    pid = pid or PIDParameters()
+    samples = sample_parameters(runs, spread=spread, nominal=nominal, seed=seed)
+    noise_seeds = np.random.SeedSequence(seed).spawn((runs + chunk_size - 1) // chunk_size)
+    stride = max(1, int(round(band_step_s / dt)))
+
+    jobs = []
+    for index, start in enumerate(range(0, runs, chunk_size)):
+        end = min(start + chunk_size, runs)
+        jobs.append({
+            "timeline": timeline,
+            "plant": {name: values[start:end] for name, values in samples.items()},
+            "pid": pid.as_dict(),
+            "dt": dt,
+            "seed": noise_seeds[index],
+            "stride": stride,
+            "tolerance": tolerance,
+        })
+
+    if workers == 1 or len(jobs) == 1:
+        chunks = list(map(_simulate_chunk, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, jobs))
+
+    rectal = np.concatenate([chunk["rectal"] for chunk in chunks])
+    plate_outside = np.concatenate([chunk["plate_outside_s"] for chunk in chunks])
+    rectal_outside = np.concatenate([chunk["rectal_outside_s"] for chunk in chunks])
+    min_rectal = np.concatenate([chunk["min_rectal"] for chunk in chunks])
+    failsafe_time = np.concatenate([chunk["failsafe_time"] for chunk in chunks])
+    failsafe_code = np.concatenate([chunk["failsafe_code"] for chunk in chunks])
+
+    band_times = timeline.times[0] + np.arange(rectal.shape[1]) * stride * dt
+    bands = np.percentile(rectal, percentiles, axis=0)
+    tripped = ~np.isnan(failsafe_time)
+
+    return {
+        "runs": runs,
+        "dt": dt,
+        "tolerance": tolerance,
+        "spread": {name: list(bounds) for name, bounds in (DEFAULT_SPREAD if spread is None else spread).items()},
+        "rectal_bands": {
+            "times": band_times.tolist(),
+            **{f"p{percentile:g}": band.tolist() for percentile, band in zip(percentiles, bands)},
+        },
+        "min_rectal": _distribution(min_rectal, percentiles),
+        "plate_time_outside_s": _distribution(plate_outside, percentiles),
+        "rectal_time_outside_s": _distribution(rectal_outside, percentiles),
+        "failsafe": {
+            "risk": float(np.mean(tripped)),
+            "count": int(np.count_nonzero(tripped)),
+            "by_reason": {
+                reason: int(np.count_nonzero(failsafe_code == code))
+                for code, reason in enumerate(FAILSAFE_REASONS) if code
+            },
+            "earliest_s": float(np.nanmin(failsafe_time)) if tripped.any() else None,
+        },
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def _spread_item(value: str) -> Tuple[str, Tuple[float, float]]:
+    """argparse type for ``--spread NAME=LOW:HIGH``."""
+
+    try:
+        name, bounds = value.split("=", 1)
+        low, high = (float(part) for part in bounds.split(":", 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid spread '{value}', expected name=low:high")
+    name = name.strip()
+    if name not in PlantParameters.FIELDS:
+        raise argparse.ArgumentTypeError(
+            f"unknown plant parameter '{name}' (choose from {', '.join(PlantParameters.FIELDS)})"
+        )
+    return name, (low, high)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from framework.profile_loader import ProfileLoader
+
+    parser = argparse.ArgumentParser(description="Monte Carlo robustness analysis of a profile")
+    parser.add_argument("profile", help="Profile file (CSV or JSON)")
+    parser.add_argument("-n", "--runs", type=int, default=1000, help="Number of sampled plants")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT_S, help="Simulation step in seconds")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed deviation from target in °C")
+    parser.add_argument(
+        "--spread", action="append", default=[], type=_spread_item, metavar="NAME=LOW:HIGH",
+        help="Override a sampling range, e.g. rectal_tau_s=300:1200",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("-o", "--output", default=None, help="Write the JSON report here ('-' for stdout)")
+    args = parser.parse_args(argv)
+    spread = dict(DEFAULT_SPREAD)
+    spread.update(args.spread)
+
+    loader = ProfileLoader()
+    timeline = loader.compile_timeline(loader.load_profile(args.profile))
+    report = run_monte_carlo(
+        timeline,
+        runs=args.runs,
+        spread=spread,
+        dt=args.dt,
+        tolerance=args.tolerance,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    report["profile"] = os.path.abspath(args.profile)
+
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+        return 0
+
+    failsafe = report["failsafe"]
+    print(f"🎲 {report['runs']} runs in {report['elapsed_s']:.2f}s")
+    print(
+        "🌡️ Minimum rectal p5/p50/p95: "
+        + "/".join(f"{report['min_rectal'][key]:.2f}" for key in ("p5", "p50", "p95")) + " °C"
+    )
+    print(
+        "⏱️ Plate outside target p50/p95: "
+        f"{report['plate_time_outside_s']['p50']:.0f}/{report['plate_time_outside_s']['p95']:.0f} s"
+    )
+    print(f"🚨 Failsafe risk {failsafe['risk'] * 100.0:.1f}% ({failsafe['count']} runs)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"📝 Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+# Musehypothermi Python Profile Builder Module
+# File: profile_builder.py
+#
+# Programmatic profile construction. Segments (holds, jumps, linear ramps,
+# exponential cooling curves, rectal override holds) are generated as NumPy
+# arrays and chained into one set of breakpoints. The controller holds each
+# target until the next breakpoint, so ramps and curves are emitted as
+# staircases sampled every ``resolution_min`` minutes. The result is checked
+# with the loader's own validation rules and handed to the loader, the GUI
+# step format or a ProfileTimeline without going through a file.
+#
+#   points = (
+#       ProfileBuilder(start_temp=37.0)
+#       .hold(10)
+#       .exponential(to=25.0, tau_min=15.0, minutes=60)
+#       .rectal_override(28.0, minutes=30)
+#       .ramp(to=37.0, minutes=40)
+#       .to_points()
+#   )
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from framework.profile_loader import ProfileLoader
+from framework.profile_parser import RAMP_MIN, TEMP_MAX, TEMP_MIN, TIME_MIN
+from framework.profile_streamer import convert_profile_points_to_steps
+from framework.profile_timeline import RECTAL_OVERRIDE_DISABLED, ProfileTimeline
+
+
+class ProfileBuilder:
+    """Chainable builder of profile breakpoints (times in minutes)."""
+
+    def __init__(self, start_temp: float = 37.0, resolution_min: float = 1.0):
+        if resolution_min <= 0:
+            raise ValueError("resolution_min must be positive")
+        self.resolution_min = float(resolution_min)
+        self._times: List[np.ndarray] = [np.zeros(1)]
+        self._temps: List[np.ndarray] = [np.array([float(start_temp)])]
+        self._rectal: List[np.ndarray] = [np.array([np.nan])]
+
+    # --- State ---
+    @property
+    def duration_min(self) -> float:
+        return float(self._times[-1][-1])
+
+    @property
+    def current_temp(self) -> float:
+        return float(self._temps[-1][-1])
+
+    def __len__(self) -> int:
+        return sum(array.size for array in self._times)
+
+    def _offsets(self, minutes: float, resolution_min: Optional[float]) -> np.ndarray:
+        if not minutes > 0:
+            raise ValueError("Segment duration must be positive")
+        resolution = self.resolution_min if resolution_min is None else float(resolution_min)
+        if resolution <= 0:
+            raise ValueError("resolution_min must be positive")
+        count = max(1, int(math.ceil(minutes / resolution - 1e-9)))
+        return np.linspace(0.0, float(minutes), count + 1)[1:]
+
+    def _append(self, offsets: np.ndarray, temps: np.ndarray, rectal: Optional[float]) -> "ProfileBuilder":
+        self._times.append(self.duration_min + offsets)
+        self._temps.append(np.asarray(temps, dtype=np.float64))
+        self._rectal.append(np.full(offsets.size, np.nan if rectal is None else float(rectal)))
+        return self
+
+    # --- Segments ---
+    def hold(self, minutes: float, rectal: Optional[float] = None) -> "ProfileBuilder":
+        """Keep the current target for *minutes*."""
+
+        offsets = self._offsets(minutes, minutes)
+        return self._append(offsets, np.full(offsets.size, self.current_temp), rectal)
+
+    def jump(self, temp: float) -> "ProfileBuilder":
+        """Switch the target to *temp* from the current end of the profile."""
+
+        self._temps[-1] = self._temps[-1].copy()
+        self._temps[-1][-1] = float(temp)
+        return self
+
+    def ramp(
+        self,
+        to: float,
+        minutes: float,
+        resolution_min: Optional[float] = None,
+        rectal: Optional[float] = None,
+    ) -> "ProfileBuilder":
+        """Linear ramp from the current target to *to* over *minutes*."""
+
+        offsets = self._offsets(minutes, resolution_min)
+        start = self.current_temp
+        return self._append(offsets, start + (float(to) - start) * (offsets / float(minutes)), rectal)
+
+    def exponential(
+        self,
+        to: float,
+        tau_min: float,
+        minutes: float,
+        resolution_min: Optional[float] = None,
+        rectal: Optional[float] = None,
+    ) -> "ProfileBuilder":
+        """Exponential approach to *to* with time constant *tau_min*.
+
+        The curve is ``to + (start - to) * exp(-t / tau_min)``; it is not
+        forced onto *to* at the end of the segment.
+        """
+
+        if not tau_min > 0:
+            raise ValueError("tau_min must be positive")
+        offsets = self._offsets(minutes, resolution_min)
+        start = self.current_temp
+        return self._append(offsets, float(to) + (start - float(to)) * np.exp(-offsets / float(tau_min)), rectal)
+
+    def rectal_override(self, target: float, minutes: float) -> "ProfileBuilder":
+        """Hold the plate target for *minutes* with a rectal override active."""
+
+        return self.hold(minutes, rectal=target)
+
+    # --- Output ---
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Breakpoint times (min), plate targets and rectal overrides (NaN = none)."""
+
+        return np.concatenate(self._times), np.concatenate(self._temps), np.concatenate(self._rectal)
+
+    def validate(self, loader: Optional[ProfileLoader] = None) -> None:
+        """Check every breakpoint with the loader's rules; raises ``ValueError``.
+
+        The checks run vectorised; the first offending point is then passed
+        through ``_validate_entry`` / ``_validate_step_entry`` so the message
+        matches what loading the same profile from a file would report.
+        """
+
+        loader = loader or ProfileLoader()
+        times, temps, rectal = self.arrays()
+
+        finite = np.isfinite(times) & np.isfinite(temps)
+        if not finite.all():
+            index = int(np.argmin(finite))
+            raise ValueError(f"Point {index + 1} has a non-finite time or temperature")
+
+        bad = (times < TIME_MIN) | (temps < TEMP_MIN) | (temps > TEMP_MAX)
+        if bad.any():
+            index = int(np.argmax(bad))
+            loader._validate_entry(index, float(times[index]), float(temps[index]), RAMP_MIN)
+
+        if times.size > 1 and np.any(np.diff(times) <= 0):
+            index = int(np.argmax(np.diff(times) <= 0)) + 1
+            raise ValueError(f"Time {times[index]} min is not after previous {times[index - 1]} min")
+
+        overrides = ~np.isnan(rectal)
+        bad_rectal = overrides & ((rectal < TEMP_MIN) | (rectal > TEMP_MAX) | ~np.isfinite(rectal))
+        if bad_rectal.any():
+            index = int(np.argmax(bad_rectal))
+            loader._validate_step_entry(
+                index, float(temps[index - 1]), float(temps[index]), 0.0,
+                float(times[index] - times[index - 1]) * 60000.0, float(rectal[index]),
+            )
+            raise ValueError(f"Point {index + 1} has an invalid rectal override")
+
+    def to_points(self, validate: bool = True) -> List[Dict[str, Any]]:
+        """Normalised loader points (``time_min``, ``temp_c`` ...)."""
+
+        if validate:
+            self.validate()
+        times, temps, rectal = self.arrays()
+        points: List[Dict[str, Any]] = []
+        for time_min, temp_c, override in zip(times.tolist(), temps.tolist(), rectal.tolist()):
+            point: Dict[str, Any] = {"time_min": time_min, "temp_c": temp_c, "ramp_min": 0.0}
+            if not math.isnan(override):
+                point["rectal_override_target"] = override
+            points.append(point)
+        return points
+
+    def to_steps(self, max_steps: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Controller timeline steps (``t`` seconds, ``temp``) as the GUI uploads them."""
+
+        return convert_profile_points_to_steps(self.to_points(), max_steps=max_steps)
+
+    def to_step_entries(self) -> List[Dict[str, Any]]:
+        """Controller-ready JSON entries (``plate_start_temp`` ... ``total_step_time_ms``)."""
+
+        self.validate()
+        loader = ProfileLoader()
+        times, temps, rectal = self.arrays()
+        entries: List[Dict[str, Any]] = []
+        for index in range(1, times.size):
+            total_ms = int(round((times[index] - times[index - 1]) * 60000.0))
+            override = RECTAL_OVERRIDE_DISABLED if math.isnan(rectal[index]) else float(rectal[index])
+            start_temp, end_temp = float(temps[index - 1]), float(temps[index])
+            loader._validate_step_entry(index - 1, start_temp, end_temp, 0.0, total_ms, override)
+            entries.append({
+                "plate_start_temp": start_temp,
+                "plate_end_temp": end_temp,
+                "ramp_time_ms": 0,
+                "total_step_time_ms": total_ms,
+                "rectal_override_target": override,
+            })
+        return entries
+
+    def to_timeline(self) -> ProfileTimeline:
+        return ProfileTimeline.from_points(self.to_points())
+
+    def load_into(self, loader: ProfileLoader, name: str = "builder") -> List[Dict[str, Any]]:
+        """Install the built profile in *loader* as if it had been loaded from a file."""
+
+        return loader.load_points(self.to_points(), name=name)
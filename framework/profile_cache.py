@@ -0,0 +1,106 @@
+# Musehypothermi Python Profile Cache Module
+# File: profile_cache.py
+#
+# Bounded LRU cache of compiled profiles. Entries are keyed by path and
+# validated against the file's mtime and size; when those change the content
+# hash decides whether the file really changed, so a touched or copied
+# profile is not parsed again. Each entry keeps the normalised points,
+# controller steps, compiled timeline and (once built) the preview series.
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from framework.profile_loader import ProfileLoader
+from framework.profile_streamer import convert_profile_points_to_steps
+from framework.profile_timeline import ProfileTimeline
+
+
+class CompiledProfile:
+    """Everything derived from one profile file's content."""
+
+    def __init__(self, path: str, digest: str, points: List[Dict]):
+        self.path = path
+        self.digest = digest
+        self.points = points
+        self.steps: List[Dict[str, Any]] = []
+        self.timeline: Optional[ProfileTimeline] = None
+        self.conversion_error: Optional[str] = None
+        # Filled by the GUI the first time the profile is previewed.
+        self.preview: Optional[Tuple[List[float], ...]] = None
+
+        try:
+            self.steps = convert_profile_points_to_steps(points, max_steps=None)
+            self.timeline = ProfileTimeline.from_points(points)
+        except ValueError as exc:
+            self.steps = []
+            self.timeline = None
+            self.conversion_error = str(exc)
+
+
+class ProfileCache:
+    """LRU cache of CompiledProfile entries, at most *max_entries* files."""
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, Tuple[int, int, CompiledProfile]]" = OrderedDict()
+        self._loader = ProfileLoader()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return os.path.abspath(path) in self._entries
+
+    def _by_digest(self, digest: str) -> Optional[CompiledProfile]:
+        for _, _, compiled in self._entries.values():
+            if compiled.digest == digest:
+                return compiled
+        return None
+
+    def _store(self, key: str, stat: os.stat_result, compiled: CompiledProfile):
+        self._entries[key] = (stat.st_mtime_ns, stat.st_size, compiled)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def load(self, filepath: str) -> CompiledProfile:
+        """Return the compiled profile for *filepath*, parsing only on change.
+
+        Raises the loader's exceptions (``FileNotFoundError``, ``ValueError``
+        ...) for files that cannot be parsed; those are not cached.
+        """
+
+        key = os.path.abspath(filepath)
+        stat = os.stat(key)
+
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[2]
+
+        with open(key, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+
+        compiled = cached[2] if cached is not None and cached[2].digest == digest else self._by_digest(digest)
+        if compiled is not None:
+            # Same content under a new mtime or path: reuse the compiled result.
+            self.hits += 1
+        else:
+            self.misses += 1
+            compiled = CompiledProfile(key, digest, self._loader.load_profile(key))
+
+        self._store(key, stat, compiled)
+        return compiled
+
+    def invalidate(self, filepath: Optional[str] = None):
+        """Drop one entry, or everything when *filepath* is ``None``."""
+
+        if filepath is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(os.path.abspath(filepath), None)
@@ -2,15 +2,109 @@
 # Module: profile_loader.py
 
 import csv
+import heapq
 import json
 import os
-from typing import Dict, List
-
-# Grenser for validering (justeres om nødvendig)
-TEMP_MIN = -10
-TEMP_MAX = 50
-RAMP_MIN = 0
-TIME_MIN = 0
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from framework.profile_parser import parse_csv, parse_json, point_messages, step_messages
+from framework.profile_streamer import MAX_CONTROLLER_STEPS
+from framework.profile_timeline import ProfileTimeline, rectal_value
+
+
+def _segment_error(temps: np.ndarray, start: int, end: int) -> Tuple[float, int]:
+    """Largest deviation in (start, end) from the target held at *start*.
+
+    Also returns the split point: the first point deviating by more than
+    half of that error, which halves a ramp and lands on a jump.
+    """
+
+    if end - start < 2:
+        return 0.0, -1
+    deviation = np.abs(temps[start + 1:end] - temps[start])
+    error = float(deviation.max())
+    offset = int(np.argmax(deviation > 0.5 * error))
+    return error, start + 1 + offset
+
+
+def simplify_profile(
+    points: List[Dict],
+    max_steps: int = MAX_CONTROLLER_STEPS,
+    max_deviation: float = 0.1,
+) -> Tuple[List[Dict], float]:
+    """Reduce a dense profile to at most *max_steps* points.
+
+    The controller holds each target until the next breakpoint, so the
+    error is measured under the same hold semantics: every original point
+    is compared with the kept target active at its time. Ramer–Douglas–
+    Peucker-style refinement in priority order then splits the segment with
+    the largest deviation (in °C) until every point lies within
+    *max_deviation* or *max_steps* points are used. Both points around a
+    rectal override change are always kept, so every override interval
+    keeps its start and end.
+
+    Returns the simplified points and the maximum deviation actually
+    achieved, which exceeds *max_deviation* only when *max_steps* was the
+    binding limit. Points have ``time_min``, ``temp_c`` and a ``ramp_min``
+    of 0, plus ``rectal_override_target`` for overrides given under any of
+    the accepted rectal keys.
+    """
+
+    if max_steps < 2:
+        raise ValueError("max_steps must be at least 2")
+    if not points:
+        raise ValueError("Profile is empty")
+
+    ordered = sorted(points, key=lambda point: float(point["time_min"]))
+    times = np.array([float(point["time_min"]) for point in ordered], dtype=np.float64)
+    temps = np.array(
+        [float(point.get("plate_target", point["temp_c"])) for point in ordered],
+        dtype=np.float64,
+    )
+    if np.any(np.diff(times) <= 0):
+        raise ValueError("Profile times must be strictly ascending")
+
+    last = len(ordered) - 1
+    keep = {0, last}
+    rectal = [rectal_value(point) for point in ordered]
+    # A point's override covers the segment leading into it, which starts at i - 1.
+    for i in range(1, len(ordered)):
+        if rectal[i] != rectal[i - 1]:
+            keep.update((i - 1, i))
+    if len(keep) > max_steps:
+        raise ValueError(
+            f"Profile needs {len(keep)} points to preserve rectal overrides; max_steps is {max_steps}"
+        )
+
+    heap: List[Tuple[float, int, int, int]] = []
+    anchors = sorted(keep)
+    for start, end in zip(anchors, anchors[1:]):
+        error, index = _segment_error(temps, start, end)
+        if index >= 0:
+            heapq.heappush(heap, (-error, start, end, index))
+
+    while heap and len(keep) < max_steps and -heap[0][0] > max_deviation:
+        _, start, end, index = heapq.heappop(heap)
+        keep.add(index)
+        for segment in ((start, index), (index, end)):
+            error, split = _segment_error(temps, *segment)
+            if split >= 0:
+                heapq.heappush(heap, (-error, segment[0], segment[1], split))
+
+    kept = sorted(keep)
+    held = temps[kept][np.searchsorted(kept, np.arange(len(ordered)), side="right") - 1]
+    achieved = float(np.max(np.abs(temps - held)))
+
+    simplified: List[Dict] = []
+    for index in kept:
+        point = {"time_min": float(times[index]), "temp_c": float(temps[index]), "ramp_min": 0.0}
+        if rectal[index] is not None:
+            point["rectal_override_target"] = rectal[index]
+        simplified.append(point)
+
+    return simplified, achieved
 
 
 class ProfileLoader:
@@ -48,6 +142,33 @@ class ProfileLoader:
 
         return self.profile
 
+    def load_points(self, points: List[Dict], name: str = "points") -> List[Dict]:
+        """Validate and install profile points built in code (see ProfileBuilder)."""
+
+        if not points:
+            raise ValueError("Profile is empty")
+
+        profile_data: List[Dict] = []
+        last_time = None
+        for idx, entry in enumerate(points):
+            time_min = float(entry["time_min"])
+            temp_c = float(entry["temp_c"])
+            ramp_min = float(entry.get("ramp_min", 0) or 0)
+            self._validate_entry(idx, time_min, temp_c, ramp_min)
+            if last_time is not None and time_min <= last_time:
+                raise ValueError(f"Time {time_min} min is not after previous {last_time} min")
+            last_time = time_min
+            profile_data.append(dict(entry))
+
+        self.profile = profile_data
+
+        if self.event_logger:
+            self.event_logger.log_event(
+                f"PROFILE_LOADED file={name} steps={len(self.profile)}"
+            )
+
+        return self.profile
+
     # --- Backward-compatible public helpers used by GUI/TestSuite ---
     def load_profile_json(self, filepath: str) -> bool:
         """Load a JSON profile and store it on the instance.
@@ -106,144 +227,50 @@ class ProfileLoader:
             return False
 
     def _load_profile_csv(self, filepath: str) -> List[Dict]:
-        """Load and normalize a temperature profile from a CSV file."""
-        profile_data: List[Dict] = []
+        """Load and normalize a temperature profile from a CSV file.
 
-        with open(filepath, "r", encoding="utf-8") as file:
-            reader = csv.reader(file)
-            for idx, row in enumerate(reader):
-                if not row or row[0].strip().startswith("#"):
-                    continue  # Hopp over kommentarer eller tomme linjer
-
-                if len(row) < 2:
-                    raise ValueError(f"Line {idx + 1} must include time and temperature")
-
-                time_min = float(row[0].strip())
-                temp_c = float(row[1].strip())
-                ramp_min = float(row[2].strip()) if len(row) > 2 else 0.0
-
-                self._validate_entry(idx, time_min, temp_c, ramp_min)
-
-                profile_data.append(
-                    {
-                        "time_min": time_min,
-                        "temp_c": temp_c,
-                        "ramp_min": ramp_min,
-                    }
-                )
-
-        if not profile_data:
-            raise ValueError("CSV file did not contain any profile rows")
-
-        return profile_data
+        Rows are parsed and validated by ``profile_parser``; every invalid row
+        is reported at once in a ``ProfileParseError`` (a ``ValueError``).
+        """
+        parsed = parse_csv(filepath)
+        parsed.raise_for_errors()
+        return parsed.to_points()
 
     def _load_profile_json(self, filepath: str) -> List[Dict]:
-        """Load and normalize a temperature profile from a JSON file."""
-        with open(filepath, "r", encoding="utf-8") as file:
-            data = json.load(file)
-
-        if not isinstance(data, list):
-            raise ValueError("Profile JSON must contain a list of steps")
-
-        if not data:
-            raise ValueError("JSON profile is empty")
-
-        # Detect controller-ready structure (plate_* fields) and convert to
-        # timeline points. Otherwise, accept time-based entries directly.
-        controller_keys = {"plate_start_temp", "plate_end_temp", "total_step_time_ms"}
-        profile_data: List[Dict] = []
-
-        if controller_keys.issubset(data[0].keys() if isinstance(data[0], dict) else {}):
-            profile_data = self._convert_controller_steps_to_points(data)
-        else:
-            for idx, entry in enumerate(data):
-                if not isinstance(entry, dict):
-                    raise ValueError(f"Entry {idx + 1} must be an object")
+        """Load and normalize a temperature profile from a JSON file.
 
-                if "time_min" not in entry or "temp_c" not in entry:
-                    raise ValueError(
-                        f"Entry {idx + 1} must include 'time_min' and 'temp_c'"
-                    )
-
-                time_min = float(entry.get("time_min"))
-                temp_c = float(entry.get("temp_c"))
-                ramp_min = float(entry.get("ramp_min", 0))
-
-                self._validate_entry(idx, time_min, temp_c, ramp_min)
-
-                point = {
-                    "time_min": time_min,
-                    "temp_c": temp_c,
-                }
-
-                if ramp_min:
-                    point["ramp_min"] = ramp_min
-
-                if "plate_target" in entry:
-                    point["plate_target"] = float(entry["plate_target"])
-
-                profile_data.append(point)
-
-        return profile_data
-
-    def _convert_controller_steps_to_points(self, steps: List[Dict]) -> List[Dict]:
-        """
-        Convert controller-ready steps to normalized profile points.
-
-        The resulting timeline starts at t=0 with the first ``plate_start_temp``
-        and adds an entry at the end of each step using ``plate_end_temp``.
+        Controller-ready entries (plate_* fields) are converted to timeline
+        points; time-based entries are accepted directly. The document is
+        streamed by ``profile_parser`` and all invalid entries are reported
+        together.
         """
+        parsed = parse_json(filepath)
+        parsed.raise_for_errors()
+        return parsed.to_points()
 
-        profile_data: List[Dict] = []
-        cumulative_time_min = 0.0
-
-        for idx, entry in enumerate(steps):
-            if not isinstance(entry, dict):
-                raise ValueError(f"Entry {idx + 1} must be an object")
-
-            plate_start = float(entry.get("plate_start_temp"))
-            plate_end = float(entry.get("plate_end_temp"))
-            ramp_time_ms = float(entry.get("ramp_time_ms", 0))
-            total_time_ms = float(entry.get("total_step_time_ms"))
-            rectal_target = entry.get("rectal_override_target", -1000)
-            rectal_target = float(rectal_target) if rectal_target is not None else -1000.0
-
-            self._validate_step_entry(
-                idx,
-                plate_start,
-                plate_end,
-                ramp_time_ms,
-                total_time_ms,
-                rectal_target,
-            )
-
-            if not profile_data:
-                # First point uses the starting plate temperature.
-                self._validate_entry(idx, cumulative_time_min, plate_start, 0)
-                profile_data.append(
-                    {
-                        "time_min": cumulative_time_min,
-                        "temp_c": plate_start,
-                        "ramp_min": 0.0,
-                    }
-                )
+    def simplify(self, max_steps: int = MAX_CONTROLLER_STEPS, max_deviation: float = 0.1) -> float:
+        """Simplify the loaded profile in place; returns the achieved max deviation."""
 
-            total_time_min = total_time_ms / 60000.0
-            ramp_min = ramp_time_ms / 60000.0
-            cumulative_time_min += total_time_min
+        if not self.profile:
+            raise ValueError("No profile loaded to simplify.")
 
-            self._validate_entry(idx, cumulative_time_min, plate_end, ramp_min)
+        original_count = len(self.profile)
+        self.profile, achieved = simplify_profile(self.profile, max_steps, max_deviation)
 
-            profile_data.append(
-                {
-                    "time_min": cumulative_time_min,
-                    "temp_c": plate_end,
-                    "ramp_min": ramp_min,
-                    "plate_target": plate_end,
-                }
+        if self.event_logger:
+            self.event_logger.log_event(
+                f"PROFILE_SIMPLIFIED points={original_count}->{len(self.profile)} "
+                f"max_error={achieved:.3f}C tolerance={max_deviation:.3f}C"
             )
+        return achieved
 
-        return profile_data
+    def compile_timeline(self, profile: Optional[List[Dict]] = None) -> ProfileTimeline:
+        """Compile the loaded (or given) profile points into a ProfileTimeline."""
+
+        points = self.profile if profile is None else profile
+        if not points:
+            raise ValueError("No profile loaded to compile.")
+        return ProfileTimeline.from_points(points)
 
     def export_profile_csv(self, filepath, metadata=None):
         """Export current profile to CSV."""
@@ -361,14 +388,9 @@ class ProfileLoader:
 
     def _validate_entry(self, idx, time_min, temp_c, ramp_min):
         """Internal validation for each step entry."""
-        if time_min < TIME_MIN:
-            raise ValueError(f"Time ({time_min}) cannot be below {TIME_MIN} min")
-
-        if not (TEMP_MIN <= temp_c <= TEMP_MAX):
-            raise ValueError(f"Temperature ({temp_c}°C) out of range ({TEMP_MIN}°C to {TEMP_MAX}°C)")
-
-        if ramp_min < RAMP_MIN:
-            raise ValueError(f"Ramp ({ramp_min}) cannot be below {RAMP_MIN} min")
+        message = point_messages(time_min, temp_c, ramp_min)[0]
+        if message:
+            raise ValueError(message)
 
     def _validate_step_entry(
         self,
@@ -380,26 +402,6 @@ class ProfileLoader:
         rectal_target,
     ):
         """Validation for controller-ready step definitions."""
-
-        for temp_value, label in (
-            (plate_start, "plate_start_temp"),
-            (plate_end, "plate_end_temp"),
-        ):
-            if not (TEMP_MIN <= temp_value <= TEMP_MAX):
-                raise ValueError(
-                    f"{label} ({temp_value}°C) out of range ({TEMP_MIN}°C to {TEMP_MAX}°C)"
-                )
-
-        if rectal_target != -1000.0 and not (TEMP_MIN <= rectal_target <= TEMP_MAX):
-            raise ValueError(
-                f"rectal_override_target ({rectal_target}°C) out of range ({TEMP_MIN}°C to {TEMP_MAX}°C)"
-            )
-
-        if total_time_ms <= 0:
-            raise ValueError("total_step_time_ms must be positive")
-
-        if ramp_time_ms < 0:
-            raise ValueError("ramp_time_ms cannot be negative")
-
-        if ramp_time_ms > total_time_ms:
-            raise ValueError("ramp_time_ms cannot exceed total_step_time_ms")
+        message = step_messages(plate_start, plate_end, ramp_time_ms, total_time_ms, rectal_target)[0]
+        if message:
+            raise ValueError(message)
@@ -0,0 +1,649 @@
+# Musehypothermi Python Profile Parser Module
+# File: profile_parser.py
+#
+# Streaming, error-collecting profile parser. CSV rows and JSON array entries
+# are read incrementally into preallocated NumPy columns. JSON files that fit
+# in memory are decoded with json.load; larger ones element by element with
+# the json module's scanner on a sliding buffer, so the document is never
+# materialised as one list. Each full batch is validated vectorised, and
+# every problem is collected with its line number instead of stopping at the
+# first one.
+
+import csv
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from framework.profile_timeline import RECTAL_OVERRIDE_DISABLED
+
+# Grenser for validering (justeres om nødvendig)
+TEMP_MIN = -10
+TEMP_MAX = 50
+RAMP_MIN = 0
+TIME_MIN = 0
+
+BATCH_SIZE = 4096
+READ_CHUNK = 1 << 16
+# JSON files up to this size are decoded with json.load (see parse_json).
+IN_MEMORY_LIMIT = 64 << 20
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+CONTROLLER_KEYS = ("plate_start_temp", "plate_end_temp", "total_step_time_ms")
+
+POINT_COLUMNS = ("time_min", "temp_c", "ramp_min", "plate_target", "rectal")
+STEP_COLUMNS = ("plate_start", "plate_end", "ramp_ms", "total_ms", "rectal")
+
+
+class ProfileParseError(ValueError):
+    """Raised with every collected error once parsing has finished."""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        first = format_issue(errors[0]) if errors else "Invalid profile"
+        more = f" (+{len(errors) - 1} more)" if len(errors) > 1 else ""
+        super().__init__(first + more)
+
+
+def make_issue(message: str, line: Optional[int] = None, entry: Optional[int] = None) -> Dict[str, Any]:
+    """Build an error record; ``line`` and ``entry`` are 1-based when known."""
+
+    issue: Dict[str, Any] = {"message": message}
+    if line is not None:
+        issue["line"] = line
+    if entry is not None:
+        issue["entry"] = entry
+    return issue
+
+
+def format_issue(error: Dict[str, Any]) -> str:
+    """One-line text for a collected error (``Line 12: ...``)."""
+
+    if "line" in error:
+        return f"Line {error['line']}: {error['message']}"
+    if "entry" in error:
+        return f"Entry {error['entry']}: {error['message']}"
+    return error["message"]
+
+
+class _Columns:
+    """Preallocated float rows plus the source line (and entry) of each.
+
+    Rows are staged in plain lists and copied into the arrays a batch at a
+    time; the arrays double in size when the estimate was too small.
+    """
+
+    def __init__(self, names: Tuple[str, ...], capacity: int):
+        self.names = names
+        self.capacity = max(BATCH_SIZE, int(capacity))
+        self.data = np.empty((self.capacity, len(names)), dtype=np.float64)
+        self.lines = np.empty(self.capacity, dtype=np.int64)
+        self.entries = np.zeros(self.capacity, dtype=np.int64)
+        self.count = 0
+        # Staged rows; parse loops append to these lists directly.
+        self.staged_rows: List[Tuple[float, ...]] = []
+        self.staged_lines: List[int] = []
+        self.staged_entries: List[int] = []
+
+    def commit(self) -> None:
+        end = self.count + len(self.staged_rows)
+        if end > self.capacity:
+            self.capacity = max(self.capacity * 2, end)
+            self.data = np.resize(self.data, (self.capacity, len(self.names)))
+            self.lines = np.resize(self.lines, self.capacity)
+            self.entries = np.resize(self.entries, self.capacity)
+        if self.staged_rows:
+            self.data[self.count:end] = self.staged_rows
+            self.lines[self.count:end] = self.staged_lines
+            self.entries[self.count:end] = self.staged_entries or 0
+        self.count = end
+        self.staged_rows.clear()
+        self.staged_lines.clear()
+        self.staged_entries.clear()
+
+    def column(self, name: str) -> np.ndarray:
+        return self.data[:self.count, self.names.index(name)]
+
+
+class ParsedProfile:
+    """Parsed columns, their source lines and all collected errors."""
+
+    def __init__(self, kind: str, columns: _Columns, valid: np.ndarray, errors: List[Dict[str, Any]]):
+        self.kind = kind  # "csv", "json" or "json_steps"
+        # Validation runs per batch, so restore file order; global errors last.
+        self.errors = sorted(errors, key=lambda error: error.get("line", float("inf")))
+        keep = valid[:columns.count]
+        self.lines = columns.lines[:columns.count][keep]
+        self.columns = {name: columns.column(name)[keep] for name in columns.names}
+
+    def __len__(self) -> int:
+        return int(self.lines.size)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        if self.errors:
+            raise ProfileParseError(self.errors)
+
+    def to_points(self) -> List[Dict[str, Any]]:
+        """Loader points, normalised exactly as ProfileLoader does per format."""
+
+        if self.kind == "json_steps":
+            return self._step_points()
+
+        points: List[Dict[str, Any]] = []
+        columns = self.columns
+        rows = zip(
+            columns["time_min"].tolist(), columns["temp_c"].tolist(), columns["ramp_min"].tolist(),
+            columns["plate_target"].tolist(), columns["rectal"].tolist(),
+        )
+        for time_min, temp_c, ramp_min, plate_target, rectal in rows:
+            point: Dict[str, Any] = {"time_min": time_min, "temp_c": temp_c}
+            if self.kind == "csv":
+                point["ramp_min"] = ramp_min
+            else:
+                if ramp_min:
+                    point["ramp_min"] = ramp_min
+                if plate_target == plate_target:
+                    point["plate_target"] = plate_target
+                if rectal == rectal:
+                    point["rectal_override_target"] = rectal
+            points.append(point)
+        return points
+
+    def _step_points(self) -> List[Dict[str, Any]]:
+        columns = self.columns
+        if not len(self):
+            return []
+        end_times = np.cumsum(columns["total_ms"] / 60000.0)
+        points: List[Dict[str, Any]] = [
+            {"time_min": 0.0, "temp_c": float(columns["plate_start"][0]), "ramp_min": 0.0}
+        ]
+        rows = zip(
+            end_times.tolist(), columns["plate_end"].tolist(),
+            (columns["ramp_ms"] / 60000.0).tolist(), columns["rectal"].tolist(),
+        )
+        for time_min, plate_end, ramp_min, rectal in rows:
+            point: Dict[str, Any] = {
+                "time_min": time_min,
+                "temp_c": plate_end,
+                "ramp_min": ramp_min,
+                "plate_target": plate_end,
+            }
+            if rectal != RECTAL_OVERRIDE_DISABLED:
+                point["rectal_override_target"] = rectal
+            points.append(point)
+        return points
+
+
+def point_messages(time_min: np.ndarray, temp_c: np.ndarray, ramp_min: np.ndarray) -> np.ndarray:
+    """Return the first rule each profile point breaks ("" when it is valid).
+
+    This is the one definition of the point rules; ProfileLoader applies it
+    to single entries and the parsers to whole columns.
+    """
+
+    time_min, temp_c, ramp_min = np.atleast_1d(time_min, temp_c, ramp_min)
+    conditions = [
+        ~(np.isfinite(time_min) & np.isfinite(temp_c) & np.isfinite(ramp_min)),
+        time_min < TIME_MIN,
+        ~((TEMP_MIN <= temp_c) & (temp_c <= TEMP_MAX)),
+        ramp_min < RAMP_MIN,
+    ]
+    messages = np.full(time_min.size, "", dtype=object)
+    for index in np.flatnonzero(np.logical_or.reduce(conditions)).tolist():
+        if conditions[0][index]:
+            messages[index] = "Values must be finite numbers"
+        elif conditions[1][index]:
+            messages[index] = f"Time ({time_min[index]}) cannot be below {TIME_MIN} min"
+        elif conditions[2][index]:
+            messages[index] = f"Temperature ({temp_c[index]}°C) out of range ({TEMP_MIN}°C to {TEMP_MAX}°C)"
+        else:
+            messages[index] = f"Ramp ({ramp_min[index]}) cannot be below {RAMP_MIN} min"
+    return messages
+
+
+def step_messages(
+    plate_start: np.ndarray,
+    plate_end: np.ndarray,
+    ramp_ms: np.ndarray,
+    total_ms: np.ndarray,
+    rectal: np.ndarray,
+) -> np.ndarray:
+    """Return the first rule each controller step breaks ("" when it is valid)."""
+
+    plate_start, plate_end, ramp_ms, total_ms, rectal = np.atleast_1d(
+        plate_start, plate_end, ramp_ms, total_ms, rectal
+    )
+    conditions = [
+        ~(
+            np.isfinite(plate_start) & np.isfinite(plate_end) & np.isfinite(ramp_ms)
+            & np.isfinite(total_ms) & np.isfinite(rectal)
+        ),
+        ~((TEMP_MIN <= plate_start) & (plate_start <= TEMP_MAX)),
+        ~((TEMP_MIN <= plate_end) & (plate_end <= TEMP_MAX)),
+        (rectal != RECTAL_OVERRIDE_DISABLED) & ~((TEMP_MIN <= rectal) & (rectal <= TEMP_MAX)),
+        total_ms <= 0,
+        ramp_ms < 0,
+        ramp_ms > total_ms,
+    ]
+    messages = np.full(plate_start.size, "", dtype=object)
+    for index in np.flatnonzero(np.logical_or.reduce(conditions)).tolist():
+        if conditions[0][index]:
+            messages[index] = "Values must be finite numbers"
+        elif conditions[1][index]:
+            messages[index] = (
+                f"plate_start_temp ({plate_start[index]}°C) out of range ({TEMP_MIN}°C to {TEMP_MAX}°C)"
+            )
+        elif conditions[2][index]:
+            messages[index] = f"plate_end_temp ({plate_end[index]}°C) out of range ({TEMP_MIN}°C to {TEMP_MAX}°C)"
+        elif conditions[3][index]:
+            messages[index] = (
+                f"rectal_override_target ({rectal[index]}°C) out of range ({TEMP_MIN}°C to {TEMP_MAX}°C)"
+            )
+        elif conditions[4][index]:
+            messages[index] = "total_step_time_ms must be positive"
+        elif conditions[5][index]:
+            messages[index] = "ramp_time_ms cannot be negative"
+        else:
+            messages[index] = "ramp_time_ms cannot exceed total_step_time_ms"
+    return messages
+
+
+class _Validator:
+    """Vectorised batch validation that records errors per source line."""
+
+    def __init__(self, columns: _Columns, errors: List[Dict[str, Any]], kind: str, require_ascending: bool):
+        self.columns = columns
+        self.errors = errors
+        self.kind = kind
+        self.require_ascending = require_ascending
+        self.valid = np.ones(columns.capacity, dtype=bool)
+        self.validated = 0
+        self.last_time: Optional[float] = None
+
+    def mark_invalid(self, line: int, message: str, entry: Optional[int] = None) -> None:
+        self.errors.append(make_issue(message, line=line, entry=entry))
+
+    def flush(self, force: bool = False) -> None:
+        columns = self.columns
+        if len(columns.staged_rows) < (1 if force else BATCH_SIZE):
+            return
+        columns.commit()
+        self.validate()
+
+    def validate(self) -> None:
+        """Validate the committed rows that have not been checked yet."""
+
+        columns = self.columns
+        if self.valid.size < columns.capacity:
+            self.valid = np.concatenate([self.valid, np.ones(columns.capacity - self.valid.size, dtype=bool)])
+
+        start, end = self.validated, columns.count
+        data = columns.data[start:end].T
+        if self.kind == "json_steps":
+            messages = self._step_messages(data)
+        else:
+            messages = self._point_messages(data)
+
+        bad = np.flatnonzero(messages != "")
+        for offset in bad.tolist():
+            self._record(start + offset, str(messages[offset]))
+        self.valid[start + bad] = False
+
+        if self.require_ascending and self.kind != "json_steps":
+            self._check_ascending(start, end)
+        self.validated = end
+
+    def _record(self, row: int, message: str) -> None:
+        entry = int(self.columns.entries[row]) or None
+        self.errors.append(make_issue(message, line=int(self.columns.lines[row]), entry=entry))
+
+    def _point_messages(self, data: np.ndarray) -> np.ndarray:
+        names = self.columns.names
+        return point_messages(
+            data[names.index("time_min")], data[names.index("temp_c")], data[names.index("ramp_min")]
+        )
+
+    def _step_messages(self, data: np.ndarray) -> np.ndarray:
+        names = self.columns.names
+        return step_messages(*(data[names.index(name)] for name in STEP_COLUMNS))
+
+    def _check_ascending(self, start: int, end: int) -> None:
+        times = self.columns.column("time_min")[start:end]
+        valid = self.valid[start:end]
+        rows = np.flatnonzero(valid)
+        if not rows.size:
+            return
+        valid_times = times[rows]
+        previous = np.empty_like(valid_times)
+        previous[1:] = valid_times[:-1]
+        previous[0] = np.nan if self.last_time is None else self.last_time
+        bad = previous >= valid_times
+        for offset in np.flatnonzero(bad).tolist():
+            row = start + int(rows[offset])
+            self._record(row, f"Time {valid_times[offset]} min is not after previous {previous[offset]} min")
+        # A rejected point does not move the reference time forward.
+        self.valid[start + rows[bad]] = False
+        good = valid_times[~bad]
+        if good.size:
+            self.last_time = float(good[-1]) if self.last_time is None else max(self.last_time, float(good[-1]))
+
+
+def _estimated_rows(path: str, bytes_per_row: int) -> int:
+    try:
+        return os.path.getsize(path) // bytes_per_row + 1
+    except OSError:
+        return BATCH_SIZE
+
+
+def parse_csv(path: str, require_ascending: bool = False) -> ParsedProfile:
+    """Parse a CSV profile (``time_min, temp_c[, ramp_min]`` per row)."""
+
+    errors: List[Dict[str, Any]] = []
+    columns = _Columns(POINT_COLUMNS, _estimated_rows(path, 12))
+    validator = _Validator(columns, errors, "csv", require_ascending)
+    nan = float("nan")
+    rows, lines = columns.staged_rows, columns.staged_lines
+
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        for row in reader:
+            if not row or row[0].strip().startswith("#"):
+                continue
+            if len(row) < 2:
+                validator.mark_invalid(reader.line_num, "Line must include time and temperature")
+                continue
+            try:
+                # float() ignores surrounding whitespace.
+                time_min = float(row[0])
+                temp_c = float(row[1])
+                ramp_min = float(row[2]) if len(row) > 2 and row[2].strip() else 0.0
+            except ValueError as exc:
+                validator.mark_invalid(reader.line_num, f"Invalid number: {exc}")
+                continue
+            rows.append((time_min, temp_c, ramp_min, nan, nan))
+            lines.append(reader.line_num)
+            if len(rows) >= BATCH_SIZE:
+                validator.flush()
+
+    validator.flush(force=True)
+    if columns.count == 0 and not errors:
+        errors.append(make_issue("CSV file did not contain any profile rows"))
+    return ParsedProfile("csv", columns, validator.valid, errors)
+
+
+def _iter_json_array(file) -> Iterator[List[Tuple[int, Any]]]:
+    """Yield batches of ``(line, value)`` for the elements of a top-level JSON array.
+
+    Raises ``json.JSONDecodeError`` (with an absolute line number) for
+    syntax errors and ``ValueError`` when the document is not an array.
+    """
+
+    # scan_once is the C scanner behind JSONDecoder.raw_decode.
+    scan = json.JSONDecoder().scan_once
+    buffer = ""
+    line_index = 0  # buffer[:line_index] has been counted into line_number.
+    line_number = 1
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, eof
+        chunk = "" if eof else file.read(READ_CHUNK)
+        if not chunk:
+            eof = True
+            return False
+        buffer += chunk
+        return True
+
+    def line_at(index: int) -> int:
+        nonlocal line_index, line_number
+        if index < line_index:
+            return line_number - buffer.count("\n", index, line_index)
+        line_number += buffer.count("\n", line_index, index)
+        line_index = index
+        return line_number
+
+    def syntax_error(message: str, index: int) -> json.JSONDecodeError:
+        error = json.JSONDecodeError(message, buffer, index)
+        error.lineno = line_at(index)
+        return error
+
+    fill()
+    pos = WHITESPACE.match(buffer).end()
+    while pos == len(buffer) and fill():
+        pos = WHITESPACE.match(buffer, pos).end()
+    if pos >= len(buffer):
+        raise ValueError("JSON profile is empty")
+    if buffer[pos] != "[":
+        raise ValueError("Profile JSON must contain a list of steps")
+
+    pos = WHITESPACE.match(buffer, pos + 1).end()
+    while pos == len(buffer) and fill():
+        pos = WHITESPACE.match(buffer, pos).end()
+    closed = buffer.startswith("]", pos)
+    if closed:
+        pos += 1
+
+    separator = SEPARATOR.match
+    batch: List[Tuple[int, Any]] = []
+    try:
+        while not closed:
+            try:
+                value, end = scan(buffer, pos)
+            except StopIteration as exc:
+                if fill():
+                    continue  # Token cut at the buffer end.
+                raise syntax_error("Expecting value", exc.value)
+            except json.JSONDecodeError as exc:
+                if fill():
+                    continue  # Element cut at the buffer end.
+                exc.lineno = line_at(exc.pos)
+                raise exc
+
+            match = separator(buffer, end)
+            if match is None or match.end() == len(buffer):
+                # The element or its separator may continue in the next chunk.
+                if fill():
+                    continue
+                if match is None:
+                    raise syntax_error("Expecting ',' delimiter", WHITESPACE.match(buffer, end).end())
+
+            line_number += buffer.count("\n", line_index, pos)
+            line_index = pos
+            batch.append((line_number, value))
+            closed = match.group(1) == "]"
+            pos = match.end()
+
+            if len(batch) >= BATCH_SIZE:
+                yield batch
+                batch = []
+            # Drop consumed text so the buffer stays around one chunk.
+            if pos > READ_CHUNK:
+                line_at(pos)
+                buffer = buffer[pos:]
+                pos = line_index = 0
+    except ValueError:
+        if batch:
+            yield batch  # Entries before the syntax error are still checked.
+        raise
+
+    if batch:
+        yield batch
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer) or not fill():
+            break
+    if pos < len(buffer):
+        raise syntax_error("Extra data", pos)
+
+
+def _parse_json_document(path: str, require_ascending: bool) -> Optional[ParsedProfile]:
+    """Decode with one ``json.load`` and convert whole columns at once.
+
+    Returns None when anything is wrong with the document or an entry, so
+    the caller can rescan it element by element for line-numbered errors.
+    """
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            document = json.load(file)
+    except ValueError:
+        return None
+    if not isinstance(document, list) or not document:
+        return None
+
+    first = document[0]
+    is_steps = isinstance(first, dict) and all(key in first for key in CONTROLLER_KEYS)
+    nan = float("nan")
+    try:
+        if is_steps:
+            kind, names = "json_steps", STEP_COLUMNS
+            values = [
+                [float(entry["plate_start_temp"]) for entry in document],
+                [float(entry["plate_end_temp"]) for entry in document],
+                [float(entry.get("ramp_time_ms", 0)) for entry in document],
+                [float(entry["total_step_time_ms"]) for entry in document],
+                [
+                    RECTAL_OVERRIDE_DISABLED if entry.get("rectal_override_target") is None
+                    else float(entry["rectal_override_target"])
+                    for entry in document
+                ],
+            ]
+        else:
+            kind, names = "json", POINT_COLUMNS
+            values = [
+                [float(entry["time_min"]) for entry in document],
+                [float(entry["temp_c"]) for entry in document],
+                [float(entry.get("ramp_min", 0)) for entry in document],
+                [float(entry["plate_target"]) if "plate_target" in entry else nan for entry in document],
+                [
+                    nan if entry.get("rectal_override_target") is None
+                    else float(entry["rectal_override_target"])
+                    for entry in document
+                ],
+            ]
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+    count = len(document)
+    columns = _Columns(names, count)
+    for index, column in enumerate(values):
+        columns.data[:count, index] = column
+    # Lines are unknown here; a document with any error is rescanned.
+    columns.lines[:count] = 0
+    columns.entries[:count] = np.arange(1, count + 1)
+    columns.count = count
+
+    errors: List[Dict[str, Any]] = []
+    validator = _Validator(columns, errors, kind, require_ascending)
+    validator.validate()
+    if errors:
+        return None
+    return ParsedProfile(kind, columns, validator.valid, errors)
+
+
+def parse_json(path: str, require_ascending: bool = False) -> ParsedProfile:
+    """Parse a JSON profile: time-based points or controller-ready steps.
+
+    Files up to IN_MEMORY_LIMIT bytes are decoded with one ``json.load``
+    call and converted column by column; only when that finds a problem is
+    the file scanned again element by element, which gives every error its
+    line number. Larger files are always streamed so they are never held as
+    one list.
+    """
+
+    try:
+        in_memory = os.path.getsize(path) <= IN_MEMORY_LIMIT
+    except OSError:
+        in_memory = False
+    if in_memory:
+        parsed = _parse_json_document(path, require_ascending)
+        if parsed is not None:
+            return parsed
+    return _parse_json_stream(path, require_ascending)
+
+
+def _parse_json_stream(path: str, require_ascending: bool) -> ParsedProfile:
+    errors: List[Dict[str, Any]] = []
+    columns: Optional[_Columns] = None
+    validator: Optional[_Validator] = None
+    kind = "json"
+    entry = 0
+    nan = float("nan")
+
+    with open(path, "r", encoding="utf-8") as file:
+        try:
+            for line, value in (item for batch in _iter_json_array(file) for item in batch):
+                entry += 1
+                if columns is None:
+                    is_steps = isinstance(value, dict) and all(key in value for key in CONTROLLER_KEYS)
+                    kind = "json_steps" if is_steps else "json"
+                    names = STEP_COLUMNS if is_steps else POINT_COLUMNS
+                    columns = _Columns(names, _estimated_rows(path, 60))
+                    validator = _Validator(columns, errors, kind, require_ascending)
+
+                if not isinstance(value, dict):
+                    validator.mark_invalid(line, "Entry must be an object", entry)
+                    continue
+                try:
+                    if kind == "json_steps":
+                        missing = [key for key in CONTROLLER_KEYS if key not in value]
+                        if missing:
+                            raise ValueError(f"Missing field(s): {', '.join(missing)}")
+                        rectal = value.get("rectal_override_target", RECTAL_OVERRIDE_DISABLED)
+                        row = (
+                            float(value["plate_start_temp"]),
+                            float(value["plate_end_temp"]),
+                            float(value.get("ramp_time_ms", 0)),
+                            float(value["total_step_time_ms"]),
+                            float(rectal) if rectal is not None else RECTAL_OVERRIDE_DISABLED,
+                        )
+                    else:
+                        if "time_min" not in value or "temp_c" not in value:
+                            raise ValueError("Entry must include 'time_min' and 'temp_c'")
+                        rectal = value.get("rectal_override_target")
+                        row = (
+                            float(value["time_min"]),
+                            float(value["temp_c"]),
+                            float(value.get("ramp_min", 0)),
+                            float(value["plate_target"]) if "plate_target" in value else nan,
+                            float(rectal) if rectal is not None else nan,
+                        )
+                except (TypeError, ValueError) as exc:
+                    validator.mark_invalid(line, str(exc), entry)
+                    continue
+
+                columns.staged_rows.append(row)
+                columns.staged_lines.append(line)
+                columns.staged_entries.append(entry)
+                if len(columns.staged_rows) >= BATCH_SIZE:
+                    validator.flush()
+        except json.JSONDecodeError as exc:
+            errors.append(make_issue(f"Invalid JSON: {exc.msg}", line=exc.lineno))
+        except ValueError as exc:
+            errors.append(make_issue(str(exc)))
+
+    if columns is None:
+        if entry == 0 and not errors:
+            errors.append(make_issue("JSON profile is empty"))
+        columns = _Columns(POINT_COLUMNS, 0)
+        validator = _Validator(columns, errors, kind, require_ascending)
+    validator.flush(force=True)
+    return ParsedProfile(kind, columns, validator.valid, errors)
+
+
+def parse_profile(path: str, require_ascending: bool = False) -> ParsedProfile:
+    """Parse a CSV or JSON profile file, collecting every error."""
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return parse_csv(path, require_ascending=require_ascending)
+    if extension == ".json":
+        return parse_json(path, require_ascending=require_ascending)
+    raise ValueError("Unsupported profile format. Use CSV or JSON.")
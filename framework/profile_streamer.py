@@ -0,0 +1,241 @@
+# Musehypothermi Python Profile Streamer Module
+# File: profile_streamer.py
+#
+# Controller-step conversion and sliding-window upload for profiles longer
+# than the firmware's ProfileManager::MAX_STEPS. The first window is uploaded
+# before start; while the profile runs, status frames (profile_step_index,
+# profile_remaining_time, profile_window_*) tell the streamer when to send the
+# next window, which always begins at the step currently executing so the
+# controller swaps windows without a gap at step boundaries.
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# Mirrors ProfileManager::MAX_STEPS in main/profile_manager.h.
+MAX_CONTROLLER_STEPS = 10
+
+RECTAL_TARGET_KEYS = (
+    "rectal_override_target",
+    "rectal_setpoint",
+    "rectalSetpoint",
+    "rectalTarget",
+    "rectal_target",
+)
+
+
+def _first_present(entry: Dict[str, Any], keys: Sequence[str]) -> Any:
+    for key in keys:
+        if key in entry and entry[key] is not None:
+            return entry[key]
+    return None
+
+
+def convert_profile_points_to_steps(
+    profile_points: List[Dict[str, Any]],
+    max_steps: Optional[int] = MAX_CONTROLLER_STEPS,
+) -> List[Dict[str, Any]]:
+    """Normalize loader output into a controller-ready profile timeline.
+
+    Pass ``max_steps=None`` when the steps are streamed with ProfileStreamer.
+    """
+
+    if not profile_points:
+        raise ValueError("Loaded profile is empty")
+
+    def _extract_rectal_target(entry: Dict[str, Any]) -> Optional[float]:
+        target = _first_present(entry, RECTAL_TARGET_KEYS)
+        if target is None:
+            return None
+        try:
+            return float(target)
+        except (TypeError, ValueError):
+            return None
+
+    def _validate_and_append(
+        steps: List[Dict[str, Any]], t_value: float, target: float, index: int, source: Dict[str, Any]
+    ):
+        if t_value < 0:
+            raise ValueError(f"Time cannot be negative at position {index}")
+
+        if steps and t_value <= steps[-1]["t"]:
+            raise ValueError(
+                f"Time must be ascending. Entry {index} has t={t_value} which is not greater than previous t={steps[-1]['t']}"
+            )
+
+        step_entry: Dict[str, Any] = {"t": t_value, "temp": target}
+        rectal_value = _extract_rectal_target(source)
+        if rectal_value is not None:
+            step_entry["rectal_override_target"] = rectal_value
+
+        steps.append(step_entry)
+
+    def _check_length(steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if max_steps is not None and len(steps) > max_steps:
+            raise ValueError(f"Profile may contain at most {max_steps} steps")
+        return steps
+
+    # Case 1: Already in controller timeline format
+    first_entry = profile_points[0]
+    if "t" in first_entry and ("temp" in first_entry or "plate_target" in first_entry):
+        steps: List[Dict[str, Any]] = []
+        for idx, entry in enumerate(profile_points, start=1):
+            try:
+                t_value = float(entry["t"])
+                target = float(entry.get("temp", entry.get("plate_target")))
+            except (TypeError, ValueError, KeyError) as exc:
+                raise ValueError(f"Invalid timeline entry at position {idx}: {exc}") from exc
+
+            _validate_and_append(steps, t_value, target, idx, entry)
+
+        return _check_length(steps)
+
+    step_keys = {"plate_start_temp", "plate_end_temp", "total_step_time_ms"}
+    if step_keys.issubset(first_entry.keys()):
+        steps = []
+        cumulative_sec = 0.0
+
+        for index, entry in enumerate(profile_points, start=1):
+            try:
+                start_temp = float(entry["plate_start_temp"])
+                end_temp = float(entry["plate_end_temp"])
+                total_time_ms = int(float(entry["total_step_time_ms"]))
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(
+                    f"Invalid step entry at position {index}: {exc}"
+                ) from exc
+
+            if total_time_ms <= 0:
+                raise ValueError(
+                    f"total_step_time_ms must be positive at step {index}"
+                )
+
+            if not steps:
+                _validate_and_append(steps, 0.0, start_temp, index, entry)
+
+            cumulative_sec += total_time_ms / 1000.0
+            _validate_and_append(steps, cumulative_sec, end_temp, index, entry)
+
+        return _check_length(steps)
+
+    try:
+        ordered_points = sorted(
+            profile_points,
+            key=lambda entry: float(entry["time_min"])
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("Profile entries must include valid 'time_min' values") from exc
+
+    steps = []
+
+    for index, entry in enumerate(ordered_points, start=1):
+        try:
+            target_temp = float(entry.get("plate_target", entry["temp_c"]))
+            t_value = float(entry["time_min"]) * 60.0
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid profile entry at position {index}") from exc
+
+        _validate_and_append(steps, t_value, target_temp, index, entry)
+
+    return _check_length(steps)
+
+
+class ProfileStreamer:
+    """Feed a long profile to the controller one window at a time.
+
+    A new window is sent, starting at the executing step, once fewer than
+    ``refill_margin`` steps or less than ``lead_time_s`` seconds remain in
+    the window the controller holds. Unconfirmed windows are re-sent after
+    ``retry_interval_s``.
+    """
+
+    def __init__(
+        self,
+        steps: List[Dict[str, Any]],
+        window_size: int = MAX_CONTROLLER_STEPS,
+        refill_margin: Optional[int] = None,
+        lead_time_s: float = 30.0,
+        retry_interval_s: float = 2.0,
+    ):
+        if not steps:
+            raise ValueError("Cannot stream an empty profile")
+        if not 2 <= window_size <= MAX_CONTROLLER_STEPS:
+            raise ValueError(f"window_size must be between 2 and {MAX_CONTROLLER_STEPS}")
+
+        self.steps = list(steps)
+        self.window_size = window_size
+        self.refill_margin = window_size // 2 if refill_margin is None else max(1, refill_margin)
+        self.lead_time_s = max(0.0, lead_time_s)
+        self.retry_interval_s = retry_interval_s
+
+        self.sent_offset: Optional[int] = None
+        self.sent_at = 0.0
+        self.windows_sent = 0
+
+    @property
+    def needs_streaming(self) -> bool:
+        return len(self.steps) > self.window_size
+
+    def window(self, offset: int) -> Dict[str, Any]:
+        """Payload for the ``profile_window`` SET command starting at *offset*."""
+
+        offset = max(0, min(int(offset), len(self.steps) - 1))
+        end = min(offset + self.window_size, len(self.steps))
+        return {
+            "offset": offset,
+            "final": end >= len(self.steps),
+            "steps": [
+                {"t": step["t"], "temp": step.get("temp", step.get("plate_target"))}
+                for step in self.steps[offset:end]
+            ],
+        }
+
+    def _send(self, offset: int) -> Dict[str, Any]:
+        payload = self.window(offset)
+        self.sent_offset = payload["offset"]
+        self.sent_at = time.monotonic()
+        self.windows_sent += 1
+        return payload
+
+    def initial_window(self) -> Dict[str, Any]:
+        """First window, uploaded before the profile is started."""
+
+        return self._send(0)
+
+    def on_status(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the next window to send for this status frame, if any."""
+
+        if not data.get("profile_active") or "profile_step_index" not in data:
+            return None
+
+        try:
+            index = int(data["profile_step_index"])
+            remaining_s = float(data.get("profile_remaining_time", 0.0)) / 1000.0
+            loaded_offset = int(data.get("profile_window_offset", self.sent_offset or 0))
+            loaded_length = int(data.get("profile_window_length", self.window_size))
+        except (TypeError, ValueError):
+            return None
+
+        if data.get("profile_window_final") or loaded_offset + loaded_length >= len(self.steps):
+            return None
+
+        now = time.monotonic()
+        if (
+            self.sent_offset is not None
+            and self.sent_offset != loaded_offset
+            and now - self.sent_at < self.retry_interval_s
+        ):
+            return None  # Previous window not confirmed yet.
+
+        steps_ahead = loaded_offset + loaded_length - 1 - index
+        if steps_ahead > self.refill_margin and remaining_s > self.lead_time_s:
+            return None
+        if index <= loaded_offset:
+            return None  # Same window as the one already loaded.
+
+        return self._send(index)
+
+    def on_response(self, message: str) -> None:
+        """Allow an immediate retry when the controller rejects a window."""
+
+        if "profile window rejected" in message.lower():
+            self.sent_at = 0.0
@@ -0,0 +1,160 @@
+# Musehypothermi Python Profile Sync Module
+# File: profile_sync.py
+#
+# Tracks which profile the controller has acknowledged so uploads can be
+# skipped or reduced to the changed steps. The host hashes the steps it sends;
+# once the controller answers "Profile loaded" or "Profile patched" that hash
+# becomes the acknowledged one. Identical profiles are not resent, small
+# edits of a single-window profile go out as a ``profile_patch`` SET, and
+# anything the tracker cannot vouch for (reconnects, streamed windows,
+# rejected uploads) falls back to a full ``profile_data`` upload.
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from framework.profile_streamer import MAX_CONTROLLER_STEPS
+
+# Upload plans returned by ProfileSync.plan().
+SKIP = "skip"
+PATCH = "patch"
+FULL = "full"
+
+ACCEPTED_RESPONSES = ("profile loaded", "profile patched")
+PATCH_FALLBACK_RESPONSES = ("profile patch rejected", "invalid profile patch payload", "unknown set variable")
+
+
+def controller_steps(steps: Sequence[Dict[str, Any]]) -> List[Tuple[float, float]]:
+    """The ``(t, temp)`` pairs the controller actually stores."""
+
+    return [
+        (float(step["t"]), float(step.get("temp", step.get("plate_target"))))
+        for step in steps
+    ]
+
+
+def _hash_pairs(pairs: Sequence[Tuple[float, float]]) -> str:
+    payload = json.dumps([list(pair) for pair in pairs], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def profile_hash(steps: Sequence[Dict[str, Any]]) -> str:
+    """Stable hash of the controller-visible part of *steps*."""
+
+    return _hash_pairs(controller_steps(steps))
+
+
+def diff_steps(
+    old: Sequence[Tuple[float, float]], new: Sequence[Tuple[float, float]]
+) -> Optional[Tuple[int, int]]:
+    """Smallest ``[start, end)`` range of *new* that turns *old* into it.
+
+    Returns ``None`` when both are identical. A shorter *new* with an equal
+    prefix gives an empty range at its end (a pure truncation).
+    """
+
+    if list(old) == list(new):
+        return None
+
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and old[start] == new[start]:
+        start += 1
+
+    end = len(new)
+    if len(old) == len(new):
+        while end > start and old[end - 1] == new[end - 1]:
+            end -= 1
+    return start, end
+
+
+class ProfileSync:
+    """Acknowledged-profile tracker deciding how to upload the next profile."""
+
+    def __init__(self):
+        self.acknowledged: Optional[List[Tuple[float, float]]] = None
+        self.acknowledged_hash: Optional[str] = None
+        self._pending: Optional[List[Tuple[float, float]]] = None
+        self._pending_patch = False
+        self.skipped = 0
+        self.patched = 0
+        self.full_uploads = 0
+
+    def invalidate(self) -> None:
+        """Forget what the controller holds (reconnect, streamed window ...)."""
+
+        self.acknowledged = None
+        self.acknowledged_hash = None
+        self._pending = None
+        self._pending_patch = False
+
+    def plan(self, steps: Sequence[Dict[str, Any]], allow_patch: bool = True) -> Tuple[str, Any]:
+        """Return ``(SKIP, None)``, ``(PATCH, payload)`` or ``(FULL, steps)``.
+
+        Only profiles that fit in one controller window are tracked; longer
+        ones are streamed and always start from a fresh first window. Pass
+        ``allow_patch=False`` when a command that depends on the upload
+        follows immediately, since a refused patch is only retried later.
+        """
+
+        if len(steps) > MAX_CONTROLLER_STEPS or self.acknowledged is None:
+            return FULL, list(steps)
+
+        new = controller_steps(steps)
+        if _hash_pairs(new) == self.acknowledged_hash:
+            return SKIP, None
+
+        changed = diff_steps(self.acknowledged, new)
+        if changed is None:
+            return SKIP, None
+        start, end = changed
+        if not allow_patch or end - start >= len(new):
+            return FULL, list(steps)
+
+        return PATCH, {
+            "index": start,
+            "length": len(new),
+            "steps": [{"t": t_value, "temp": temp} for t_value, temp in new[start:end]],
+        }
+
+    def on_sent(self, steps: Sequence[Dict[str, Any]], patch: bool = False) -> None:
+        """Record an upload awaiting the controller's response."""
+
+        self._pending = controller_steps(steps)
+        self._pending_patch = patch
+        if patch:
+            self.patched += 1
+        else:
+            self.full_uploads += 1
+
+    def on_skipped(self) -> None:
+        self.skipped += 1
+
+    def on_response(self, message: str) -> bool:
+        """Update the acknowledged profile from a controller response.
+
+        Returns ``True`` when a pending patch was refused and the caller
+        should fall back to a full upload.
+        """
+
+        if self._pending is None:
+            return False
+
+        text = message.strip().lower()
+        if text in ACCEPTED_RESPONSES:
+            self.acknowledged = self._pending
+            self.acknowledged_hash = _hash_pairs(self._pending)
+            self._pending = None
+            return False
+
+        if self._pending_patch and text in PATCH_FALLBACK_RESPONSES:
+            self.invalidate()
+            return True
+
+        if text.startswith("profile") or text.startswith("invalid profile"):
+            # Any other profile answer means the upload did not land as sent.
+            self.invalidate()
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        return {"skipped": self.skipped, "patched": self.patched, "full": self.full_uploads}
@@ -0,0 +1,218 @@
+# Musehypothermi Python Profile Timeline Module
+# File: profile_timeline.py
+#
+# Compiled, read-only view of a loaded profile. Breakpoints are kept as sorted
+# arrays so the GUI, simulator and analysis tools share one evaluator with
+# O(log n) scalar lookups (bisect) and vectorised lookups (searchsorted).
+
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Controller sentinel meaning "no rectal override for this step".
+RECTAL_OVERRIDE_DISABLED = -1000.0
+
+RECTAL_KEYS = (
+    "rectal_override_target",
+    "rectal_setpoint",
+    "rectalSetpoint",
+    "rectalTarget",
+    "rectal_target",
+)
+
+
+def rectal_value(point: Dict[str, Any]) -> Optional[float]:
+    """Rectal override of *point* under any RECTAL_KEYS spelling (None when off)."""
+
+    for key in RECTAL_KEYS:
+        if point.get(key) is None:
+            continue
+        try:
+            value = float(point[key])
+        except (TypeError, ValueError):
+            return None
+        return value if value > RECTAL_OVERRIDE_DISABLED + 1.0 else None
+    return None
+
+
+class ProfileTimeline:
+    """Plate target breakpoints, ramps and rectal override intervals.
+
+    Plate target semantics follow the controller: breakpoint *i* becomes the
+    target at ``times[i]`` and holds until the next breakpoint. With
+    ``ramp=True`` the target instead moves linearly from the previous value
+    over the last ``ramps[i]`` seconds before ``times[i]``, so both modes
+    agree at every breakpoint and are identical when no ramps are defined.
+    Outside ``[0, duration]`` no target is active.
+
+    Rectal overrides are half-open ``[start, end)`` intervals in seconds.
+    """
+
+    def __init__(
+        self,
+        times: Sequence[float],
+        targets: Sequence[float],
+        ramps: Optional[Sequence[float]] = None,
+        rectal_intervals: Iterable[Tuple[float, float, float]] = (),
+    ):
+        times_arr = np.asarray(times, dtype=np.float64)
+        targets_arr = np.asarray(targets, dtype=np.float64)
+        if times_arr.ndim != 1 or times_arr.shape != targets_arr.shape:
+            raise ValueError("times and targets must be 1-D sequences of equal length")
+        if times_arr.size == 0:
+            raise ValueError("Profile timeline needs at least one breakpoint")
+        if np.any(np.diff(times_arr) <= 0):
+            raise ValueError("Breakpoint times must be strictly ascending")
+
+        if ramps is None:
+            ramps_arr = np.zeros_like(times_arr)
+        else:
+            ramps_arr = np.asarray(ramps, dtype=np.float64)
+            if ramps_arr.shape != times_arr.shape:
+                raise ValueError("ramps must match times in length")
+            ramps_arr = np.maximum(ramps_arr, 0.0)
+
+        # A ramp never starts before the previous breakpoint.
+        ramp_starts = times_arr - ramps_arr
+        ramp_starts[1:] = np.maximum(ramp_starts[1:], times_arr[:-1])
+        ramp_starts[0] = times_arr[0]
+
+        intervals = sorted(
+            (float(start), float(end), float(value))
+            for start, end, value in rectal_intervals
+            if end > start
+        )
+        for (_, prev_end, _), (start, _, _) in zip(intervals, intervals[1:]):
+            if start < prev_end:
+                raise ValueError("Rectal override intervals must not overlap")
+
+        self.times = times_arr
+        self.targets = targets_arr
+        self.ramps = ramps_arr
+        self.ramp_starts = ramp_starts
+        self.rectal_starts = np.array([entry[0] for entry in intervals], dtype=np.float64)
+        self.rectal_ends = np.array([entry[1] for entry in intervals], dtype=np.float64)
+        self.rectal_values = np.array([entry[2] for entry in intervals], dtype=np.float64)
+        for array in (self.times, self.targets, self.ramps, self.ramp_starts,
+                      self.rectal_starts, self.rectal_ends, self.rectal_values):
+            array.flags.writeable = False
+
+        # Plain lists keep scalar lookups free of NumPy call overhead.
+        self._times = self.times.tolist()
+        self._targets = self.targets.tolist()
+        self._ramp_starts = self.ramp_starts.tolist()
+        self._rectal_starts = self.rectal_starts.tolist()
+        self._rectal_ends = self.rectal_ends.tolist()
+        self._rectal_values = self.rectal_values.tolist()
+
+    # --- Construction ---
+    @classmethod
+    def from_points(cls, points: Sequence[Dict[str, Any]]) -> "ProfileTimeline":
+        """Compile normalized loader points (``time_min``, ``temp_c`` ...).
+
+        A point's rectal override applies to the segment leading into it, the
+        same span as the controller step it was converted from.
+        """
+
+        ordered = sorted(points, key=lambda point: float(point["time_min"]))
+        times: List[float] = []
+        targets: List[float] = []
+        ramps: List[float] = []
+        intervals: List[Tuple[float, float, float]] = []
+
+        for point in ordered:
+            t_value = float(point["time_min"]) * 60.0
+            target = point.get("plate_target", point.get("temp_c"))
+            times.append(t_value)
+            targets.append(float(target))
+            ramps.append(float(point.get("ramp_min", 0.0) or 0.0) * 60.0)
+
+            rectal = rectal_value(point)
+            if rectal is not None and len(times) > 1:
+                intervals.append((times[-2], t_value, rectal))
+
+        return cls(times, targets, ramps, intervals)
+
+    @classmethod
+    def from_steps(cls, steps: Sequence[Dict[str, Any]]) -> "ProfileTimeline":
+        """Compile controller timeline steps (``t`` seconds, ``temp``)."""
+
+        times = [float(step["t"]) for step in steps]
+        targets = [float(step.get("temp", step.get("plate_target"))) for step in steps]
+        intervals = []
+        for index in range(1, len(steps)):
+            rectal = rectal_value(steps[index])
+            if rectal is not None:
+                intervals.append((times[index - 1], times[index], rectal))
+        return cls(times, targets, None, intervals)
+
+    # --- Properties ---
+    @property
+    def duration(self) -> float:
+        return self._times[-1]
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def rectal_schedule(self) -> List[Tuple[float, float, float]]:
+        """Rectal override intervals as ``(start, end, value)`` tuples."""
+
+        return list(zip(self._rectal_starts, self._rectal_ends, self._rectal_values))
+
+    # --- Scalar lookups ---
+    def step_index_at(self, t: float) -> Optional[int]:
+        """Index of the breakpoint active at *t*, or ``None`` outside the profile."""
+
+        if not (self._times[0] <= t <= self._times[-1]):
+            return None
+        return bisect_right(self._times, t) - 1
+
+    def plate_target_at(self, t: float, ramp: bool = False) -> Optional[float]:
+        index = self.step_index_at(t)
+        if index is None:
+            return None
+        value = self._targets[index]
+        if ramp and index + 1 < len(self._times):
+            ramp_start = self._ramp_starts[index + 1]
+            if t > ramp_start:
+                span = self._times[index + 1] - ramp_start
+                value += (self._targets[index + 1] - value) * (t - ramp_start) / span
+        return value
+
+    def rectal_target_at(self, t: float) -> Optional[float]:
+        index = bisect_right(self._rectal_starts, t) - 1
+        if index >= 0 and t < self._rectal_ends[index]:
+            return self._rectal_values[index]
+        return None
+
+    # --- Vectorised lookups ---
+    def plate_targets(self, t: np.ndarray, ramp: bool = False) -> np.ndarray:
+        """Plate targets at every time in *t* (NaN outside the profile)."""
+
+        t = np.asarray(t, dtype=np.float64)
+        index = np.searchsorted(self.times, t, side="right") - 1
+        inside = (t >= self.times[0]) & (t <= self.times[-1])
+        index = np.clip(index, 0, len(self.times) - 1)
+        values = self.targets[index]
+
+        if ramp and len(self.times) > 1:
+            nxt = np.minimum(index + 1, len(self.times) - 1)
+            ramp_start = self.ramp_starts[nxt]
+            ramping = (nxt > index) & (t > ramp_start)
+            span = np.where(ramping, self.times[nxt] - ramp_start, 1.0)
+            fraction = np.where(ramping, (t - ramp_start) / span, 0.0)
+            values = values + (self.targets[nxt] - values) * fraction
+
+        return np.where(inside, values, np.nan)
+
+    def rectal_targets(self, t: np.ndarray) -> np.ndarray:
+        """Rectal override targets at every time in *t* (NaN when inactive)."""
+
+        t = np.asarray(t, dtype=np.float64)
+        if self.rectal_starts.size == 0:
+            return np.full(t.shape, np.nan)
+        index = np.searchsorted(self.rectal_starts, t, side="right") - 1
+        safe = np.clip(index, 0, self.rectal_starts.size - 1)
+        active = (index >= 0) & (t < self.rectal_ends[safe])
+        return np.where(active, self.rectal_values[safe], np.nan)
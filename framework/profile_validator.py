@@ -0,0 +1,183 @@
+# Musehypothermi Python Profile Validator Module
+# File: profile_validator.py
+#
+# Batch validation of profile files. Every file is checked completely by
+# profile_parser (all errors are collected with their line and, for JSON,
+# entry number instead of stopping at the first), then run through the same
+# controller-step conversion and step limit the GUI applies. Files are validated in parallel across cores and the
+# result is written as a machine-readable JSON report.
+#
+#   python -m framework.profile_validator Profiles/ --output report.json
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from framework.profile_loader import ProfileLoader
+from framework.profile_parser import make_issue, parse_profile
+from framework.profile_streamer import MAX_CONTROLLER_STEPS, convert_profile_points_to_steps
+
+PROFILE_EXTENSIONS = (".csv", ".json")
+
+
+def validate_profile_file(path: str, max_steps: Optional[int] = None) -> Dict[str, Any]:
+    """Validate one profile file and return its report entry.
+
+    *max_steps* limits the number of controller steps; ``None`` accepts
+    longer profiles because the GUI streams them in windows (a warning is
+    added instead).
+    """
+
+    report: Dict[str, Any] = {
+        "path": os.path.abspath(path),
+        "valid": False,
+        "errors": [],
+        "warnings": [],
+        "points": 0,
+        "steps": 0,
+        "duration_s": None,
+        "streamed": False,
+    }
+    errors: List[Dict[str, Any]] = report["errors"]
+    loader = ProfileLoader()
+
+    try:
+        parsed = parse_profile(path, require_ascending=True)
+        errors.extend(parsed.errors)
+        points = [] if errors else parsed.to_points()
+    except ValueError as exc:
+        errors.append(make_issue(str(exc)))
+        points = []
+    except (OSError, UnicodeDecodeError) as exc:
+        errors.append(make_issue(f"Could not read file: {exc}"))
+        points = []
+
+    report["points"] = len(points)
+    if errors or not points:
+        return report
+
+    # Same conversion and limits as the GUI upload path.
+    try:
+        steps = convert_profile_points_to_steps(points, max_steps=max_steps)
+        timeline = loader.compile_timeline(points)
+    except ValueError as exc:
+        errors.append(make_issue(f"Controller conversion failed: {exc}"))
+        return report
+
+    report["steps"] = len(steps)
+    report["duration_s"] = timeline.duration
+    if len(steps) > MAX_CONTROLLER_STEPS:
+        report["streamed"] = True
+        report["warnings"].append(
+            make_issue(
+                f"{len(steps)} steps exceed the controller limit of {MAX_CONTROLLER_STEPS}; "
+                "the profile will be streamed in windows"
+            )
+        )
+    report["valid"] = True
+    return report
+
+
+def find_profiles(paths: Sequence[str], recursive: bool = False) -> List[str]:
+    """Expand files and directories into a sorted list of profile files."""
+
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            pattern = os.path.join(path, "**", "*") if recursive else os.path.join(path, "*")
+            for candidate in glob.glob(pattern, recursive=recursive):
+                if os.path.isfile(candidate) and candidate.lower().endswith(PROFILE_EXTENSIONS):
+                    files.add(os.path.abspath(candidate))
+        else:
+            files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+def validate_profiles(
+    paths: Sequence[str],
+    max_steps: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Validate *paths* in parallel and return the full report."""
+
+    start = time.perf_counter()
+    limits = [max_steps] * len(paths)
+    if workers == 1 or len(paths) <= 1:
+        results = list(map(validate_profile_file, paths, limits))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(validate_profile_file, paths, limits, chunksize=4))
+
+    valid = sum(1 for result in results if result["valid"])
+    return {
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "max_steps": max_steps,
+        "summary": {
+            "files": len(results),
+            "valid": valid,
+            "invalid": len(results) - valid,
+            "errors": sum(len(result["errors"]) for result in results),
+            "elapsed_s": round(time.perf_counter() - start, 3),
+        },
+        "files": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate Musehypothermi profile files")
+    parser.add_argument("paths", nargs="+", help="Profile files or directories")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    limit = parser.add_mutually_exclusive_group()
+    limit.add_argument("--max-steps", type=int, default=None, help="Maximum controller steps")
+    limit.add_argument(
+        "--no-streaming", action="store_true",
+        help=f"Reject profiles over the controller limit ({MAX_CONTROLLER_STEPS} steps)",
+    )
+    parser.add_argument("-o", "--output", default=None, help="Write the JSON report here ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    files = find_profiles(args.paths, recursive=args.recursive)
+    if not files:
+        print("⚠️ No profile files found.")
+        return 2
+
+    max_steps = MAX_CONTROLLER_STEPS if args.no_streaming else args.max_steps
+    report = validate_profiles(files, max_steps=max_steps, workers=args.workers)
+
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        for result in report["files"]:
+            name = os.path.relpath(result["path"])
+            if result["valid"]:
+                suffix = " (streamed)" if result["streamed"] else ""
+                print(f"✅ {name}: {result['steps']} steps, {result['duration_s'] / 60.0:.1f} min{suffix}")
+            else:
+                print(f"❌ {name}: {len(result['errors'])} error(s)")
+                for error in result["errors"]:
+                    where = (
+                        f"line {error['line']}: " if "line" in error
+                        else f"entry {error['entry']}: " if "entry" in error
+                        else ""
+                    )
+                    print(f"   {where}{error['message']}")
+        summary = report["summary"]
+        print(
+            f"📋 {summary['valid']}/{summary['files']} valid, {summary['errors']} error(s) "
+            f"in {summary['elapsed_s']:.2f}s"
+        )
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+            print(f"📝 Report written to {args.output}")
+
+    return 0 if report["summary"]["invalid"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
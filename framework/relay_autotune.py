@@ -0,0 +1,212 @@
+# Musehypothermi Python Relay Autotune Module
+# File: relay_autotune.py
+#
+# Streaming analysis of relay-feedback (Åström-Hägglund) experiments. The
+# relay switches with hysteresis around a centre temperature; every sample
+# updates the running extremes and output sums of the current half cycle in
+# constant time, and each completed cycle yields a period, a temperature
+# amplitude and a relay amplitude. Once the last few cycles agree, the
+# ultimate gain Ku = 4 d / (pi a) and period Pu give Ziegler-Nichols gains,
+# usually after a handful of short cycles instead of a full open-loop settle.
+#
+# Gains use the step test's convention (AutotuneDataAnalyzer and the
+# firmware autotune): the plant gain is in °C per 100 % output, so d is the
+# relay amplitude as a fraction of full output and Ku is in (100 %)/°C.
+#
+# The firmware has no direct output command, so the wizard realises the
+# relay by moving the setpoint to centre ± swing; the PID saturates and the
+# measured output levels give d.
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_HYSTERESIS_C = 0.2
+DEFAULT_CYCLES = 3
+DEFAULT_TOLERANCE = 0.1
+
+
+def ultimate_cycle_pid(ultimate_gain: float, ultimate_period: float) -> Tuple[float, float, float]:
+    """Classic Ziegler-Nichols ultimate-cycle PID gains.
+
+    *ultimate_gain* is in (100 %)/°C, so the gains match ziegler_nichols_pid.
+    """
+
+    if ultimate_gain <= 0 or ultimate_period <= 0:
+        return 0.0, 0.0, 0.0
+    kp = 0.6 * ultimate_gain
+    ki = kp / (0.5 * ultimate_period)
+    kd = kp * ultimate_period / 8.0
+    return kp, ki, kd
+
+
+class RelayFeedbackAnalyzer:
+    """Streams (time, temperature, output) samples of a relay experiment.
+
+    ``add_sample`` returns True when the relay should switch; ``relay_high``
+    is then the new state (True drives the plate up). Samples are also kept
+    in ``timestamps`` / ``temperatures`` / ``outputs`` for plotting, with
+    the same elapsed-time convention as AutotuneDataAnalyzer.
+    """
+
+    def __init__(
+        self,
+        center: float,
+        hysteresis: float = DEFAULT_HYSTERESIS_C,
+        cycles: int = DEFAULT_CYCLES,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ) -> None:
+        if hysteresis <= 0:
+            raise ValueError("hysteresis must be positive")
+        if cycles < 2:
+            raise ValueError("cycles must be at least 2")
+        self.center = center
+        self.hysteresis = hysteresis
+        self.cycles = cycles
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self) -> None:
+        self.start_timestamp: Optional[float] = None
+        self.timestamps: List[float] = []
+        self.temperatures: List[float] = []
+        self.outputs: List[float] = []
+        self.relay_high: Optional[bool] = None
+        self.completed_cycles = 0
+
+        # Running state of the current half cycle.
+        self._half_start: Optional[float] = None
+        self._half_extreme = 0.0
+        self._half_output_sum = 0.0
+        self._half_output_time = 0.0
+        self._last_time: Optional[float] = None
+        self._last_output = 0.0
+
+        # Closed halves of the cycle in progress: (peak, mean output).
+        self._high_half: Optional[Tuple[float, float]] = None
+        self._low_half: Optional[Tuple[float, float]] = None
+        self._cycle_start: Optional[float] = None
+
+        self._periods: Deque[float] = deque(maxlen=self.cycles)
+        self._amplitudes: Deque[float] = deque(maxlen=self.cycles)
+        self._relay_amplitudes: Deque[float] = deque(maxlen=self.cycles)
+
+    def add_sample(self, timestamp: float, temperature: float, output: float) -> bool:
+        if self.start_timestamp is None:
+            self.start_timestamp = timestamp
+        elapsed = max(0.0, timestamp - self.start_timestamp)
+        self.timestamps.append(elapsed)
+        self.temperatures.append(temperature)
+        self.outputs.append(output)
+
+        if self.relay_high is None:
+            self.relay_high = temperature < self.center
+            self._open_half(elapsed, temperature)
+            self._last_time = elapsed
+            self._last_output = output
+            return True
+
+        # Time-weighted output mean (zero-order hold of the previous sample).
+        dt = elapsed - self._last_time
+        if dt > 0:
+            self._half_output_sum += self._last_output * dt
+            self._half_output_time += dt
+        self._last_time = elapsed
+        self._last_output = output
+
+        # The extreme of a half cycle lags the switch by the dead time: the
+        # minimum falls in the high (heating) half, the maximum in the low one.
+        if self.relay_high:
+            self._half_extreme = min(self._half_extreme, temperature)
+            switch = temperature > self.center + self.hysteresis
+        else:
+            self._half_extreme = max(self._half_extreme, temperature)
+            switch = temperature < self.center - self.hysteresis
+
+        if not switch:
+            return False
+
+        self._close_half(elapsed)
+        self.relay_high = not self.relay_high
+        self._open_half(elapsed, temperature)
+        return True
+
+    def _open_half(self, elapsed: float, temperature: float) -> None:
+        self._half_start = elapsed
+        self._half_extreme = temperature
+        self._half_output_sum = 0.0
+        self._half_output_time = 0.0
+
+    def _close_half(self, elapsed: float) -> None:
+        mean_output = (
+            self._half_output_sum / self._half_output_time if self._half_output_time > 0 else self._last_output
+        )
+        if self.relay_high:
+            self._high_half = (self._half_extreme, mean_output)
+            # A cycle is measured from one start of a high half to the next.
+            return
+        self._low_half = (self._half_extreme, mean_output)
+        if self._high_half is None or self._cycle_start is None:
+            # The first low half may be partial; start counting from here.
+            self._cycle_start = elapsed
+            self._high_half = None
+            return
+
+        (minimum, high_output), (maximum, low_output) = self._high_half, self._low_half
+        amplitude = (maximum - minimum) / 2.0
+        relay_amplitude = abs(high_output - low_output) / 2.0
+        if amplitude > 0 and relay_amplitude > 0:
+            self._periods.append(elapsed - self._cycle_start)
+            self._amplitudes.append(amplitude)
+            self._relay_amplitudes.append(relay_amplitude)
+            self.completed_cycles += 1
+        self._cycle_start = elapsed
+        self._high_half = None
+
+    @staticmethod
+    def _spread(values: Deque[float]) -> float:
+        mean = sum(values) / len(values)
+        return (max(values) - min(values)) / mean if mean else math.inf
+
+    def is_stable(self) -> bool:
+        """True once the last ``cycles`` periods and amplitudes agree within tolerance."""
+
+        if len(self._periods) < self.cycles:
+            return False
+        return (
+            self._spread(self._periods) <= self.tolerance
+            and self._spread(self._amplitudes) <= self.tolerance
+        )
+
+    def compute_results(self) -> Optional[Dict[str, Any]]:
+        """Ku/Pu and PID gains from the recent cycles (None before two cycles)."""
+
+        if len(self._periods) < 2:
+            return None
+
+        count = len(self._periods)
+        period = sum(self._periods) / count
+        amplitude = sum(self._amplitudes) / count
+        relay_amplitude = sum(self._relay_amplitudes) / count
+        # relay_amplitude is in % output; Ku is per 100 % like the step test.
+        ultimate_gain = 4.0 * (relay_amplitude / 100.0) / (math.pi * amplitude)
+        kp, ki, kd = ultimate_cycle_pid(ultimate_gain, period)
+
+        return {
+            "kp": kp,
+            "ki": ki,
+            "kd": kd,
+            "identification": "relay",
+            "ultimate_gain": ultimate_gain,
+            "ultimate_period": period,
+            "oscillation_amplitude": amplitude,
+            "relay_amplitude": relay_amplitude,
+            "cycles": self.completed_cycles,
+            "stable": self.is_stable(),
+            "period_spread": self._spread(self._periods),
+            "amplitude_spread": self._spread(self._amplitudes),
+            "center_temp": self.center,
+            "hysteresis": self.hysteresis,
+            "duration": self.timestamps[-1] if self.timestamps else 0.0,
+            "sample_count": len(self.timestamps),
+        }
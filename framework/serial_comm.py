@@ -4,7 +4,7 @@ import json
 import threading
 import time
 import queue
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from PySide6.QtCore import QObject, Signal
 
@@ -41,6 +41,8 @@ class SerialManager(QObject):
         self.failsafe_triggered_flag = False
         self.latest_data = None
         self._on_data_received = None
+        # Run in the reader thread on every payload before it is emitted.
+        self._payload_processors: List[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = []
 
     @property
     def on_data_received(self):
@@ -60,6 +62,19 @@ class SerialManager(QObject):
             except TypeError as exc:
                 print(f"⚠️ Failed to connect on_data_received callback: {exc}")
 
+    def add_payload_processor(self, processor: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]):
+        """Register a callable that enriches payloads in the reader thread.
+
+        It receives the payload dict and returns the (possibly new) dict, or
+        None to keep the one it was given. It must be cheap: it runs once
+        per received line.
+        """
+        self._payload_processors.append(processor)
+
+    def remove_payload_processor(self, processor):
+        if processor in self._payload_processors:
+            self._payload_processors.remove(processor)
+
     def connect(self, port, write_timeout: Optional[float] = None):
         self.port = port
         if write_timeout is not None:
@@ -256,7 +271,16 @@ class SerialManager(QObject):
         self.last_data_time = time.time()
         if reset_failsafe:
             self.failsafe_triggered_flag = False
-        self.data_received.emit(dict(payload))
+        payload = dict(payload)
+        for processor in list(self._payload_processors):
+            try:
+                processed = processor(payload)
+            except Exception as e:
+                print(f"⚠️ Payload processor error: {e}")
+                continue
+            if processed is not None:
+                payload = processed
+        self.data_received.emit(payload)
 
     def _drain_send_queue(self):
         while not self._send_queue.empty():
@@ -0,0 +1,401 @@
+# Musehypothermi Python Session Catalogue Module
+# File: session_catalog.py
+#
+# Local SQLite index of every session under logs/. Each entry stores session
+# metadata, duration, profile, autotune results, failsafe counts, control-
+# quality metrics and summary statistics so questions like "all runs on
+# rig 2 with a profile and a failsafe" are answered by an indexed query
+# instead of opening every file.
+
+import argparse
+import glob
+import json
+import math
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from framework.control_metrics import CONTROL_METRICS_EVENT_PREFIX
+from framework.journal import JOURNAL_EXTENSION
+from framework.session_reader import DATA_FIELDS, SessionReader, parse_timestamp
+
+DEFAULT_CATALOG_PATH = os.path.join("logs", "session_catalog.sqlite")
+
+PROFILE_EVENT_PATTERNS = (
+    re.compile(r"PROFILE_LOADED file=(?P<name>.+?) steps="),
+    re.compile(r"Profile loaded: (?P<name>.+)$"),
+)
+AUTOTUNE_EVENT_PREFIX = "AUTOTUNE_RESULT "
+FAILSAFE_EVENT_MARKER = "FAILSAFE_TRIGGERED"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    file_mtime REAL NOT NULL,
+    file_size INTEGER NOT NULL,
+    rig TEXT,
+    operator TEXT,
+    port TEXT,
+    started_at REAL,
+    ended_at REAL,
+    duration_s REAL,
+    sample_count INTEGER NOT NULL DEFAULT 0,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    profile TEXT,
+    failsafe_count INTEGER NOT NULL DEFAULT 0,
+    autotune_count INTEGER NOT NULL DEFAULT 0,
+    autotune_results TEXT,
+    control_metrics TEXT,
+    plate_min REAL,
+    plate_max REAL,
+    plate_mean REAL,
+    rectal_min REAL,
+    rectal_max REAL,
+    rectal_mean REAL,
+    pid_output_mean_abs REAL,
+    metadata TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_rig_started ON sessions (rig, started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions (started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_profile ON sessions (profile);
+CREATE INDEX IF NOT EXISTS idx_sessions_failsafe ON sessions (failsafe_count);
+"""
+
+# Columns added after the first schema; older catalogues are migrated.
+_ADDED_COLUMNS = (("control_metrics", "TEXT"),)
+
+
+def _finite_or_none(value: float) -> Optional[float]:
+    return float(value) if value is not None and math.isfinite(value) else None
+
+
+def summarize_session(filepath: str) -> Dict[str, Any]:
+    """Stream a session file once and return its catalogue summary."""
+
+    reader = SessionReader(filepath)
+    metadata = reader.metadata
+
+    summary: Dict[str, Any] = {
+        "path": os.path.abspath(filepath),
+        "rig": metadata.get("rig"),
+        "operator": metadata.get("operator"),
+        "port": metadata.get("port"),
+        "metadata": metadata,
+        "sample_count": 0,
+        "event_count": 0,
+        "comment_count": 0,
+        "profile": None,
+        "failsafe_count": 0,
+        "autotune_results": [],
+        "control_metrics": [],
+    }
+
+    t_first = math.inf
+    t_last = -math.inf
+    stats = {
+        field: {"min": math.inf, "max": -math.inf, "sum": 0.0, "count": 0}
+        for field in DATA_FIELDS
+    }
+    abs_output_sum = 0.0
+    abs_output_count = 0
+
+    for chunk in reader.iter_chunks(chunk_size=20000):
+        times = chunk["time"][np.isfinite(chunk["time"])]
+        if times.size:
+            t_first = min(t_first, float(times.min()))
+            t_last = max(t_last, float(times.max()))
+        summary["sample_count"] += int(chunk["time"].size)
+
+        for field in DATA_FIELDS:
+            values = chunk[field][np.isfinite(chunk[field])]
+            if not values.size:
+                continue
+            entry = stats[field]
+            entry["min"] = min(entry["min"], float(values.min()))
+            entry["max"] = max(entry["max"], float(values.max()))
+            entry["sum"] += float(values.sum())
+            entry["count"] += int(values.size)
+            if field == "pid_output":
+                abs_output_sum += float(np.abs(values).sum())
+                abs_output_count += int(values.size)
+
+    events = []
+    for record in reader.iter_records():
+        kind = record["type"]
+        if kind == "data":
+            continue
+
+        t_value = parse_timestamp(record.get("timestamp"))
+        if math.isfinite(t_value):
+            t_first = min(t_first, t_value)
+            t_last = max(t_last, t_value)
+
+        if kind == "comment":
+            summary["comment_count"] += 1
+        else:
+            events.append((t_value, str(record.get("event", ""))))
+
+    # Legacy data logs keep most of their events in a paired EventLogger CSV.
+    for _, event in reader.merge_paired_events(events):
+        summary["event_count"] += 1
+        if FAILSAFE_EVENT_MARKER in event:
+            summary["failsafe_count"] += 1
+        if event.startswith(AUTOTUNE_EVENT_PREFIX):
+            try:
+                summary["autotune_results"].append(json.loads(event[len(AUTOTUNE_EVENT_PREFIX):]))
+            except json.JSONDecodeError:
+                pass
+        elif event.startswith(CONTROL_METRICS_EVENT_PREFIX):
+            try:
+                summary["control_metrics"].append(json.loads(event[len(CONTROL_METRICS_EVENT_PREFIX):]))
+            except json.JSONDecodeError:
+                pass
+        for pattern in PROFILE_EVENT_PATTERNS:
+            match = pattern.search(event)
+            if match:
+                summary["profile"] = os.path.basename(match.group("name").strip())
+                break
+
+    summary["started_at"] = _finite_or_none(t_first)
+    summary["ended_at"] = _finite_or_none(t_last)
+    if summary["started_at"] is not None and summary["ended_at"] is not None:
+        summary["duration_s"] = summary["ended_at"] - summary["started_at"]
+    else:
+        summary["duration_s"] = None
+
+    for prefix, field in (("plate", "cooling_plate_temp"), ("rectal", "rectal_temp")):
+        entry = stats[field]
+        summary[f"{prefix}_min"] = _finite_or_none(entry["min"])
+        summary[f"{prefix}_max"] = _finite_or_none(entry["max"])
+        summary[f"{prefix}_mean"] = entry["sum"] / entry["count"] if entry["count"] else None
+    summary["pid_output_mean_abs"] = abs_output_sum / abs_output_count if abs_output_count else None
+
+    return summary
+
+
+class SessionCatalog:
+    """SQLite-backed catalogue of experiment sessions."""
+
+    COLUMNS = (
+        "path", "file_mtime", "file_size", "rig", "operator", "port",
+        "started_at", "ended_at", "duration_s", "sample_count", "event_count",
+        "comment_count", "profile", "failsafe_count", "autotune_count",
+        "autotune_results", "control_metrics", "plate_min", "plate_max", "plate_mean",
+        "rectal_min", "rectal_max", "rectal_mean", "pid_output_mean_abs",
+        "metadata", "indexed_at",
+    )
+
+    def __init__(self, db_path: str = DEFAULT_CATALOG_PATH):
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(sessions)")}
+        for column, kind in _ADDED_COLUMNS:
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE sessions ADD COLUMN {column} {kind}")
+        self.conn.commit()
+
+    # --- Indexing ---
+    def _is_current(self, path: str, mtime: float, size: int) -> bool:
+        row = self.conn.execute(
+            "SELECT file_mtime, file_size FROM sessions WHERE path = ?", (path,)
+        ).fetchone()
+        return bool(row and row["file_mtime"] == mtime and row["file_size"] == size)
+
+    def index_session(self, filepath: str, force: bool = False, commit: bool = True) -> bool:
+        """Index *filepath*; returns ``False`` when the entry was already current."""
+
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        if not force and self._is_current(path, stat.st_mtime, stat.st_size):
+            return False
+
+        summary = summarize_session(path)
+        values = dict(summary)
+        values.update(
+            {
+                "path": path,
+                "file_mtime": stat.st_mtime,
+                "file_size": stat.st_size,
+                "autotune_count": len(summary["autotune_results"]),
+                "autotune_results": json.dumps(summary["autotune_results"]),
+                "control_metrics": json.dumps(summary["control_metrics"]),
+                "metadata": json.dumps(summary["metadata"], default=str),
+                "indexed_at": time.time(),
+            }
+        )
+
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in self.COLUMNS[1:])
+        self.conn.execute(
+            f"INSERT INTO sessions ({', '.join(self.COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(path) DO UPDATE SET {updates}",
+            [values.get(column) for column in self.COLUMNS],
+        )
+        if commit:
+            self.conn.commit()
+        return True
+
+    def backfill(self, directory: str = "logs") -> Dict[str, int]:
+        """Incrementally index every session under *directory*.
+
+        Unchanged files (same mtime and size) are skipped, entries for deleted
+        files are removed. EventLogger CSVs are not indexed on their own;
+        their events are merged into the data log they were recorded
+        alongside (see SessionReader.merge_paired_events).
+        """
+
+        result = {"indexed": 0, "skipped": 0, "failed": 0, "removed": 0}
+        seen = set()
+
+        candidates = sorted(glob.glob(os.path.join(directory, "*.csv")))
+        # Session streams left behind without an export (e.g. after a crash).
+        for journal in sorted(glob.glob(os.path.join(directory, f"*{JOURNAL_EXTENSION}"))):
+            if not os.path.exists(os.path.splitext(journal)[0] + ".csv"):
+                candidates.append(journal)
+
+        for filepath in candidates:
+            path = os.path.abspath(filepath)
+            try:
+                if SessionReader(path).is_event_log:
+                    continue
+                seen.add(path)
+                if self.index_session(path, commit=False):
+                    result["indexed"] += 1
+                else:
+                    result["skipped"] += 1
+            except Exception as exc:
+                print(f"⚠️ Could not index {filepath}: {exc}")
+                result["failed"] += 1
+
+        prefix = os.path.abspath(directory) + os.sep
+        for row in self.conn.execute("SELECT path FROM sessions").fetchall():
+            if row["path"].startswith(prefix) and row["path"] not in seen and not os.path.exists(row["path"]):
+                self.conn.execute("DELETE FROM sessions WHERE path = ?", (row["path"],))
+                result["removed"] += 1
+
+        self.conn.commit()
+        return result
+
+    # --- Queries ---
+    def query(
+        self,
+        rig: Optional[str] = None,
+        profile: Optional[str] = None,
+        has_profile: Optional[bool] = None,
+        min_failsafes: Optional[int] = None,
+        has_autotune: Optional[bool] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return catalogue rows matching every given filter, newest first."""
+
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if rig is not None:
+            clauses.append("rig = ?")
+            params.append(rig)
+        if profile is not None:
+            clauses.append("profile = ?")
+            params.append(profile)
+        if has_profile is not None:
+            clauses.append("profile IS NOT NULL" if has_profile else "profile IS NULL")
+        if min_failsafes is not None:
+            clauses.append("failsafe_count >= ?")
+            params.append(int(min_failsafes))
+        if has_autotune is not None:
+            clauses.append("autotune_count > 0" if has_autotune else "autotune_count = 0")
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(float(since))
+        if until is not None:
+            clauses.append("started_at <= ?")
+            params.append(float(until))
+
+        sql = "SELECT * FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY started_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        rows = []
+        for row in self.conn.execute(sql, params):
+            entry = dict(row)
+            entry["autotune_results"] = json.loads(entry["autotune_results"] or "[]")
+            entry["control_metrics"] = json.loads(entry["control_metrics"] or "[]")
+            entry["metadata"] = json.loads(entry["metadata"] or "{}")
+            rows.append(entry)
+        return rows
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Musehypothermi session catalogue")
+    parser.add_argument("--db", default=DEFAULT_CATALOG_PATH, help="Catalogue database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    backfill = sub.add_parser("backfill", help="Index new or changed sessions")
+    backfill.add_argument("--logs", default="logs", help="Log directory to scan")
+
+    query = sub.add_parser("query", help="List matching sessions")
+    query.add_argument("--rig", default=None)
+    query.add_argument("--profile", default=None)
+    query.add_argument("--with-profile", action="store_true", help="Only sessions that ran a profile")
+    query.add_argument("--min-failsafes", type=int, default=None)
+    query.add_argument("--with-autotune", action="store_true", help="Only sessions with autotune results")
+    query.add_argument("--limit", type=int, default=50)
+
+    args = parser.parse_args(argv)
+    catalog = SessionCatalog(args.db)
+    try:
+        if args.command == "backfill":
+            start = time.perf_counter()
+            result = catalog.backfill(args.logs)
+            print(
+                f"✅ Indexed {result['indexed']}, skipped {result['skipped']}, "
+                f"failed {result['failed']}, removed {result['removed']} "
+                f"({time.perf_counter() - start:.2f}s)"
+            )
+            return 0
+
+        start = time.perf_counter()
+        rows = catalog.query(
+            rig=args.rig,
+            profile=args.profile,
+            has_profile=True if args.with_profile else None,
+            min_failsafes=args.min_failsafes,
+            has_autotune=True if args.with_autotune else None,
+            limit=args.limit,
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        for row in rows:
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["started_at"])) if row["started_at"] else "?"
+            duration = f"{row['duration_s'] / 60.0:.1f} min" if row["duration_s"] is not None else "?"
+            print(
+                f"{started}  rig={row['rig'] or '-'}  {duration}  profile={row['profile'] or '-'}  "
+                f"failsafes={row['failsafe_count']}  autotune={row['autotune_count']}  {row['path']}"
+            )
+        print(f"📋 {len(rows)} session(s) in {elapsed_ms:.1f} ms")
+        return 0
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
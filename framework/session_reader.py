@@ -0,0 +1,418 @@
+# Musehypothermi Python Session Reader Module
+# File: session_reader.py
+#
+# Streams sessions written by Logger/SessionWriter back into NumPy column
+# arrays. Files are read lazily in fixed-size chunks so arbitrarily large logs
+# can be processed within a bounded memory budget.
+
+import csv
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from framework.journal import FILTERED_FIELDS, JOURNAL_EXTENSION, iter_journal
+
+# All auto-generated timestamps use this canonical format.
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+DATA_FIELDS = ("cooling_plate_temp", "rectal_temp", "pid_output", "breath_freq_bpm")
+# Every readable column; FILTERED_FIELDS follow the comment column in CSVs.
+RECORD_FIELDS = DATA_FIELDS + FILTERED_FIELDS
+
+TimeBound = Union[None, float, int, str, datetime]
+
+
+def parse_timestamp(value: Any) -> float:
+    """Convert a logged timestamp to POSIX seconds (NaN when unparseable)."""
+
+    if value is None:
+        return float("nan")
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+
+    text = str(value).strip()
+    if not text:
+        return float("nan")
+    if len(text) == 19 and text[4] == "-" and text[13] == ":":
+        # Fast path for TIMESTAMP_FORMAT; strptime dominates read time otherwise.
+        try:
+            return datetime(
+                int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                int(text[11:13]), int(text[14:16]), int(text[17:19]),
+            ).timestamp()
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(text, TIMESTAMP_FORMAT).timestamp()
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return float("nan")
+
+
+def spread_timestamps(times: np.ndarray) -> np.ndarray:
+    """Spread rows sharing a one-second log timestamp evenly across that second.
+
+    Sub-second timestamps (e.g. millisecond-stamped compressed rows) are
+    already exact and are left alone.
+    """
+
+    if times.size < 2:
+        return times
+    _, first, counts = np.unique(times, return_index=True, return_counts=True)
+    group_start = np.repeat(first, counts)
+    group_size = np.repeat(counts, counts)
+    order = np.argsort(times, kind="stable")
+    ordered = times[order]
+    offset = (np.arange(times.size) - group_start) / group_size
+    spread = np.empty_like(times)
+    spread[order] = np.where(ordered == np.floor(ordered), ordered + offset, ordered)
+    return spread
+
+
+def _to_float(value: Any) -> float:
+    if value is None or value == "":
+        return float("nan")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _column_to_array(raw: List[Any]) -> np.ndarray:
+    """Convert one chunk of raw CSV/journal values to float64 in a single pass."""
+
+    try:
+        return np.array(
+            [value if value not in (None, "") else "nan" for value in raw], dtype=np.str_
+        ).astype(np.float64)
+    except ValueError:
+        return np.array([_to_float(value) for value in raw], dtype=np.float64)
+
+
+class SessionReader:
+    """Lazy reader for session CSV files and session/journal streams."""
+
+    def __init__(self, filepath: str):
+        if not os.path.isfile(filepath):
+            raise FileNotFoundError(f"Session file does not exist: {filepath}")
+
+        extension = os.path.splitext(filepath)[1].lower()
+        if extension not in (".csv", JOURNAL_EXTENSION):
+            raise ValueError("Unsupported session format. Use CSV or journal files.")
+
+        self.filepath = filepath
+        self.format = "csv" if extension == ".csv" else "journal"
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._ts_cache: Tuple[Optional[str], float] = (None, float("nan"))
+
+    @property
+    def is_event_log(self) -> bool:
+        """``True`` for EventLogger CSV files (``timestamp,event`` columns)."""
+
+        if self.format != "csv":
+            return False
+        with open(self.filepath, "r", encoding="utf-8", newline="") as file:
+            for row in csv.reader(file):
+                if row and not row[0].startswith("#"):
+                    return row[:2] == ["timestamp", "event"]
+        return False
+
+    # --- Metadata ---
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Session metadata (``# key: value`` lines or header records)."""
+
+        if self._metadata is None:
+            self._metadata = self._read_metadata()
+        return self._metadata
+
+    def _read_metadata(self) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {}
+        if self.format == "journal":
+            for record in iter_journal(self.filepath):
+                kind = record.get("type")
+                if kind in ("header", "metadata"):
+                    metadata.update(record.get("metadata") or {})
+            return metadata
+
+        with open(self.filepath, "r", encoding="utf-8", newline="") as file:
+            for row in csv.reader(file):
+                if not row:
+                    continue
+                if not row[0].startswith("#"):
+                    break
+                key, sep, value = ",".join(row)[1:].partition(":")
+                if sep:
+                    metadata[key.strip()] = value.strip()
+        return metadata
+
+    # --- Record stream ---
+    def _timestamp(self, text: Any) -> float:
+        # Consecutive rows usually share the same one-second timestamp.
+        if text == self._ts_cache[0]:
+            return self._ts_cache[1]
+        value = parse_timestamp(text)
+        self._ts_cache = (text, value)
+        return value
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield typed records (``data``, ``event``, ``comment``) in file order."""
+
+        if self.format == "journal":
+            for record in iter_journal(self.filepath):
+                if record.get("type") in ("data", "event", "comment"):
+                    yield record
+            return
+
+        event_log = False
+        with open(self.filepath, "r", encoding="utf-8", newline="") as file:
+            reader = csv.reader(file)
+            for row in reader:
+                if not row or row[0].startswith("#"):
+                    continue
+                if row[0] == "timestamp":
+                    # EventLogger files use a two-column ``timestamp,event`` layout.
+                    event_log = row[1:2] == ["event"]
+                    continue
+                if event_log:
+                    yield {"type": "event", "timestamp": row[0], "event": ",".join(row[1:])}
+                    continue
+
+                row = row + [""] * (6 - len(row))
+                timestamp, comment = row[0], row[5]
+                if comment:
+                    if comment.startswith("EVENT: "):
+                        yield {"type": "event", "timestamp": timestamp, "event": comment[7:]}
+                    else:
+                        yield {"type": "comment", "timestamp": timestamp, "comment": comment}
+                    continue
+
+                record: Dict[str, Any] = {"type": "data", "timestamp": timestamp}
+                for field, raw in zip(DATA_FIELDS, row[1:5]):
+                    record[field] = raw
+                for field, raw in zip(FILTERED_FIELDS, row[6:]):
+                    record[field] = raw
+                yield record
+
+    def _iter_data_rows(self) -> Iterator[Tuple[Any, Sequence[Any]]]:
+        """Yield ``(timestamp, values)`` for data rows only, in RECORD_FIELDS order."""
+
+        if self.format == "journal":
+            for record in iter_journal(self.filepath):
+                if record.get("type") == "data":
+                    yield record.get("timestamp"), [record.get(field) for field in RECORD_FIELDS]
+            return
+
+        missing = [""] * len(FILTERED_FIELDS)
+
+        with open(self.filepath, "r", encoding="utf-8", newline="") as file:
+            for row in csv.reader(file):
+                if len(row) < 5 or row[0].startswith("#") or row[0] == "timestamp":
+                    # Also skips EventLogger rows, which only have two columns.
+                    continue
+                if len(row) > 5 and row[5]:
+                    continue  # comment or event row
+                filtered = row[6:6 + len(FILTERED_FIELDS)]
+                yield row[0], row[1:5] + filtered + missing[len(filtered):]
+
+    # --- NumPy access ---
+    def iter_chunks(
+        self,
+        chunk_size: int = 10000,
+        fields: Optional[Sequence[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None,
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield data rows as dicts of NumPy arrays, *chunk_size* rows at a time.
+
+        Every chunk contains a ``time`` column (POSIX seconds) plus the requested
+        *fields* (default: the raw data fields; FILTERED_FIELDS on request) as
+        float64 with NaN for gaps. Rows outside ``[start, end]`` are skipped.
+        """
+
+        fields = tuple(fields) if fields else DATA_FIELDS
+        unknown = [field for field in fields if field not in RECORD_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+
+        chunk_size = max(1, int(chunk_size))
+        t_min = parse_timestamp(start) if start is not None else -np.inf
+        t_max = parse_timestamp(end) if end is not None else np.inf
+
+        indices = [RECORD_FIELDS.index(field) for field in fields]
+        times: List[float] = []
+        raw_columns: List[List[Any]] = [[] for _ in fields]
+
+        def _emit() -> Dict[str, np.ndarray]:
+            chunk = {"time": np.array(times, dtype=np.float64)}
+            for field, raw in zip(fields, raw_columns):
+                chunk[field] = _column_to_array(raw)
+                raw.clear()
+            times.clear()
+            return chunk
+
+        for t_text, values in self._iter_data_rows():
+            t_value = self._timestamp(t_text)
+            if t_value < t_min:
+                continue
+            if t_value > t_max:
+                # Logs are written in time order, so nothing later can match.
+                break
+
+            times.append(t_value)
+            for raw, index in zip(raw_columns, indices):
+                raw.append(values[index])
+
+            if len(times) == chunk_size:
+                yield _emit()
+
+        if times:
+            yield _emit()
+
+    def read(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None,
+        chunk_size: int = 10000,
+    ) -> Dict[str, np.ndarray]:
+        """Read the whole (filtered) session into one dict of arrays."""
+
+        fields = tuple(fields) if fields else DATA_FIELDS
+        parts: Dict[str, List[np.ndarray]] = {"time": []}
+        parts.update({field: [] for field in fields})
+
+        for chunk in self.iter_chunks(chunk_size, fields, start, end):
+            for key, values in chunk.items():
+                parts[key].append(values)
+
+        return {
+            key: np.concatenate(values) if values else np.empty(0, dtype=np.float64)
+            for key, values in parts.items()
+        }
+
+    def events(self, start: TimeBound = None, end: TimeBound = None) -> List[Tuple[float, str]]:
+        """Return ``(time, event)`` tuples within the optional time range."""
+
+        t_min = parse_timestamp(start) if start is not None else -np.inf
+        t_max = parse_timestamp(end) if end is not None else np.inf
+
+        events: List[Tuple[float, str]] = []
+        for record in self.iter_records():
+            if record["type"] != "event":
+                continue
+            t_value = self._timestamp(record.get("timestamp"))
+            if t_min <= t_value <= t_max:
+                events.append((t_value, str(record.get("event", ""))))
+        return events
+
+    def comments(self, start: TimeBound = None, end: TimeBound = None) -> List[Tuple[float, str]]:
+        """Return ``(time, comment)`` tuples within the optional time range."""
+
+        t_min = parse_timestamp(start) if start is not None else -np.inf
+        t_max = parse_timestamp(end) if end is not None else np.inf
+
+        comments: List[Tuple[float, str]] = []
+        for record in self.iter_records():
+            if record["type"] != "comment":
+                continue
+            t_value = self._timestamp(record.get("timestamp"))
+            if t_min <= t_value <= t_max:
+                comments.append((t_value, str(record.get("comment", ""))))
+        return comments
+
+    # --- Legacy event logs ---
+    def time_span(self) -> Tuple[float, float]:
+        """First and last row timestamp (NaN when the file has no rows)."""
+
+        first = last = float("nan")
+        for record in self.iter_records():
+            t_value = parse_timestamp(record.get("timestamp"))
+            if np.isfinite(t_value):
+                if np.isnan(first):
+                    first = t_value
+                    if self.format == "csv":
+                        break
+                last = t_value
+        if self.format != "csv":
+            return first, last
+
+        # CSV rows are appended in time order, so only the tail needs reading.
+        with open(self.filepath, "rb") as file:
+            file.seek(0, os.SEEK_END)
+            file.seek(max(0, file.tell() - 8192))
+            tail = file.read().decode("utf-8", errors="replace")
+        for line in reversed(tail.splitlines()):
+            t_value = parse_timestamp(line.split(",", 1)[0])
+            if np.isfinite(t_value):
+                last = t_value
+                break
+        return first, last
+
+    def paired_event_logs(self) -> List[str]:
+        """EventLogger CSVs recorded alongside this legacy data log.
+
+        Older GUI versions wrote most events to a separate ``timestamp,event``
+        CSV next to the data log; a pair is recognised by an overlapping time
+        span in the same directory.
+        """
+
+        if self.format != "csv" or self.is_event_log:
+            return []
+        first, last = self.time_span()
+        if not (np.isfinite(first) and np.isfinite(last)):
+            return []
+
+        own = os.path.abspath(self.filepath)
+        paired = []
+        directory = os.path.dirname(own)
+        for candidate in sorted(os.listdir(directory)):
+            path = os.path.join(directory, candidate)
+            if path == own or not candidate.lower().endswith(".csv") or not os.path.isfile(path):
+                continue
+            reader = SessionReader(path)
+            if not reader.is_event_log:
+                continue
+            start, end = reader.time_span()
+            if start <= last and end >= first:
+                paired.append(path)
+        return paired
+
+    def merge_paired_events(self, events: Sequence[Tuple[float, str]]) -> List[Tuple[float, str]]:
+        """Merge the paired event logs' events into this file's *events*.
+
+        Only events within this log's time span are taken. The ``EVENT: ``
+        prefix is dropped as for data-log events, and events already mirrored
+        into the data log (same text within a second) are not repeated.
+        """
+
+        paired = self.paired_event_logs()
+        if not paired:
+            return list(events)
+
+        first, last = self.time_span()
+        own: Dict[str, List[float]] = {}
+        for t_value, event in events:
+            own.setdefault(event, []).append(t_value)
+
+        merged = list(events)
+        for path in paired:
+            for t_value, event in SessionReader(path).events(first, last):
+                if event.startswith("EVENT: "):
+                    event = event[7:]
+                if any(abs(t_value - t_own) <= 1.0 for t_own in own.get(event, ())):
+                    continue
+                merged.append((t_value, event))
+        merged.sort(key=lambda item: item[0])
+        return merged
@@ -0,0 +1,298 @@
+# Musehypothermi Python Session Writer Module
+# File: session_writer.py
+#
+# One ordered record stream per session. Data rows, events and comments are
+# serialised once into a single crash-safe journal; Logger/EventLogger style
+# views write into the same stream, and the classic CSV/JSON files are
+# exported once when the session closes.
+
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from framework.journal import (
+    JOURNAL_EXTENSION,
+    JournalWriter,
+    iter_journal,
+    write_session_outputs,
+)
+from framework.session_reader import parse_timestamp
+from framework.telemetry_compression import TelemetryCompressor
+
+# All auto-generated timestamps use this canonical format.
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _now_ts():
+    """Return the current timestamp using TIMESTAMP_FORMAT."""
+
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+
+def _precise_ts(t_value: float) -> str:
+    """TIMESTAMP_FORMAT with milliseconds (read back by parse_timestamp)."""
+
+    return datetime.fromtimestamp(t_value).strftime(TIMESTAMP_FORMAT + ".%f")[:-3]
+
+
+class SessionWriter:
+    """Unified writer for typed data, event and comment records."""
+
+    def __init__(
+        self,
+        filename_prefix="session",
+        metadata=None,
+        directory="logs",
+        fsync_policy: str = "interval",
+        export_on_close: bool = True,
+        keep_journal: bool = False,
+        on_close: Optional[Callable[["SessionWriter"], None]] = None,
+        compression=None,
+    ):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(directory, exist_ok=True)
+
+        base = os.path.join(directory, f"{filename_prefix}_{timestamp}")
+        self.filename_journal = base + JOURNAL_EXTENSION
+        self.filename_csv = base + ".csv"
+        self.filename_json = base + ".json"
+
+        self.metadata: Dict[str, Any] = dict(metadata) if metadata else {}
+
+        # Optional lossy compression: *compression* maps field names to
+        # tolerances (True selects the defaults). Tolerances are recorded in
+        # the metadata so the reconstruction error bound travels with the log.
+        self.compressor = None
+        if compression:
+            self.compressor = TelemetryCompressor(None if compression is True else compression)
+            self.metadata.update(self.compressor.describe())
+        self.export_on_close = export_on_close
+        self.keep_journal = keep_journal
+        self.on_close = on_close
+        self.closed = False
+        self.sequence = 0
+        self.counts = {"data": 0, "comment": 0, "event": 0}
+
+        self.journal = JournalWriter(self.filename_journal, fsync_policy=fsync_policy)
+        self.journal.append(
+            {
+                "type": "header",
+                "metadata": self.metadata,
+                "csv": self.filename_csv,
+                "json": self.filename_json,
+            }
+        )
+        print(f"✅ Session stream at {self.filename_journal}")
+
+    # --- Record API ---
+    def _append(self, record_type: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        if self.closed:
+            raise ValueError("Session writer is closed")
+
+        self.sequence += 1
+        record = {"type": record_type, "seq": self.sequence}
+        record.update(fields)
+        self.journal.append(record)
+        if record_type in self.counts:
+            self.counts[record_type] += 1
+        return record
+
+    def update_metadata(self, metadata: Dict[str, Any]):
+        """Merge *metadata* into the session header (e.g. port once connected)."""
+
+        if not metadata:
+            return
+        self.metadata.update(metadata)
+        self._append("metadata", {"metadata": dict(metadata)})
+
+    def write_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a data record and return its fields.
+
+        With compression enabled the row may be held back or dropped; the
+        returned fields are those of the offered row either way, and rows
+        without a timestamp are stamped to the millisecond.
+        """
+
+        fields = {
+            "timestamp": data.get("timestamp", _now_ts()),
+            "cooling_plate_temp": data.get("cooling_plate_temp", None),
+            "rectal_temp": data.get("anal_probe_temp", None),
+            "pid_output": data.get("pid_output", None),
+            "breath_freq_bpm": data.get("breath_freq_bpm", None),
+            # Added by the state filter in the serial reader thread.
+            "cooling_plate_temp_filtered": data.get("cooling_plate_temp_filtered", None),
+            "cooling_plate_rate": data.get("cooling_plate_rate", None),
+            "rectal_temp_filtered": data.get("anal_probe_temp_filtered", None),
+            "rectal_rate": data.get("anal_probe_rate", None),
+        }
+        if self.compressor is None:
+            return self._append("data", fields)
+
+        if self.closed:
+            raise ValueError("Session writer is closed")
+        if "timestamp" in data:
+            t_value = parse_timestamp(fields["timestamp"])
+        else:
+            # Several frames share each logged second; the error bound only
+            # holds at the times the filter saw, so record them exactly.
+            t_value = round(time.time(), 3)
+            fields["timestamp"] = _precise_ts(t_value)
+        for held in self.compressor.offer(t_value, fields, fields):
+            self._append("data", held)
+        return fields
+
+    def write_comment(self, comment: str) -> Dict[str, Any]:
+        return self._append("comment", {"timestamp": _now_ts(), "comment": comment})
+
+    def write_event(self, event: str) -> Dict[str, Any]:
+        return self._append("event", {"timestamp": _now_ts(), "event": event})
+
+    def flush(self):
+        """Force buffered records to disk."""
+
+        if not self.closed:
+            self.journal.sync()
+
+    # --- Compatibility views ---
+    def data_view(self, metadata=None, owns_session: bool = False) -> "SessionDataView":
+        return SessionDataView(self, metadata=metadata, owns_session=owns_session)
+
+    def event_view(self, owns_session: bool = False) -> "SessionEventView":
+        return SessionEventView(self, owns_session=owns_session)
+
+    # --- Lifecycle ---
+    def export(self, csv_path: Optional[str] = None, json_path: Optional[str] = None):
+        """Write Logger-compatible CSV/JSON files from the session stream."""
+
+        self.flush()
+        return write_session_outputs(
+            iter_journal(self.filename_journal),
+            csv_path or self.filename_csv,
+            json_path or self.filename_json,
+            metadata=self.metadata,
+        )
+
+    def close(self):
+        if self.closed:
+            return
+
+        print("📝 Closing session writer...")
+        if self.compressor is not None:
+            for held in self.compressor.flush():
+                self._append("data", held)
+            print(
+                f"📦 Compression kept {self.compressor.rows_written}/{self.compressor.rows_offered} "
+                f"rows ({self.compressor.ratio:.1f}x)"
+            )
+        self._append("close", {"timestamp": _now_ts()})
+        self.journal.close()
+        self.closed = True
+
+        if self.export_on_close:
+            try:
+                write_session_outputs(
+                    iter_journal(self.filename_journal),
+                    self.filename_csv,
+                    self.filename_json,
+                    metadata=self.metadata,
+                )
+                print(f"✅ Session exported to {self.filename_csv} / {self.filename_json}")
+            except Exception as exc:
+                # The journal stays behind so the session can be recovered later.
+                self.keep_journal = True
+                print(f"❌ Failed to export session: {exc}")
+
+        if not self.keep_journal:
+            try:
+                os.remove(self.filename_journal)
+            except OSError as exc:
+                print(f"⚠️ Could not remove session stream {self.filename_journal}: {exc}")
+
+        if self.on_close is not None:
+            try:
+                self.on_close(self)
+            except Exception as exc:
+                print(f"⚠️ Session close hook failed: {exc}")
+
+        print("✅ Session writer closed.")
+
+
+class SessionDataView:
+    """Logger-compatible view that writes into a shared SessionWriter."""
+
+    def __init__(self, session: SessionWriter, metadata=None, owns_session: bool = False):
+        self.session = session
+        self.owns_session = owns_session
+        self.closed = False
+        self.filename_csv = session.filename_csv
+        self.filename_json = session.filename_json
+
+        if metadata:
+            session.update_metadata(metadata)
+        session.write_event("DATA_LOGGING_STARTED")
+        print(f"✅ Data logging into session {session.filename_journal}")
+
+    def log_data(self, data):
+        record = self.session.write_data(data)
+        print(f"📥 Logged data at {record['timestamp']}")
+
+    def log_comment(self, comment):
+        self.session.write_comment(comment)
+        print(f"💬 Logged comment: {comment}")
+
+    def log_event(self, event):
+        self.session.write_event(event)
+        print(f"⚡ Logged event: {event}")
+
+    def flush(self):
+        self.session.flush()
+
+    def flush_json(self):
+        self.session.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.session.closed:
+            return
+        self.session.write_event("DATA_LOGGING_STOPPED")
+        if self.owns_session:
+            self.session.close()
+        else:
+            self.session.flush()
+        print("✅ Data logging stopped.")
+
+
+class SessionEventView:
+    """EventLogger-compatible view that writes into a shared SessionWriter."""
+
+    def __init__(self, session: SessionWriter, owns_session: bool = False):
+        self.session = session
+        self.owns_session = owns_session
+        self.closed = False
+        self.filename_csv = session.filename_csv
+        self.filename_json = session.filename_json
+
+    def log_event(self, event):
+        """Log an event with timestamp."""
+        try:
+            record = self.session.write_event(event)
+            print(f"⚡ Logged event: {event} at {record['timestamp']}")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to log event: {e}")
+            return False
+
+    def flush_json(self):
+        self.session.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.owns_session:
+            self.session.close()
+        else:
+            self.session.flush()
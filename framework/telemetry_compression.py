@@ -0,0 +1,306 @@
+# Musehypothermi Python Telemetry Compression Module
+# File: telemetry_compression.py
+#
+# Optional lossy compression for telemetry logging. A swinging-door filter
+# per field keeps only the rows needed to reconstruct every signal by linear
+# interpolation within a per-field tolerance, so long steady holds collapse to
+# a handful of rows while the reconstruction error stays bounded and known.
+#
+# The bound holds at the times the filter saw. Logged timestamps have
+# one-second resolution while several frames arrive per second, so the
+# array helpers spread rows sharing a second across it (as SessionReader
+# users do) and SessionWriter stamps compressed rows to the millisecond.
+
+import argparse
+import json
+import math
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from framework.session_reader import DATA_FIELDS, SessionReader, spread_timestamps
+
+COMPRESSION_METHOD = "swinging_door"
+
+# Defaults sized well below sensor noise / actuator resolution.
+DEFAULT_TOLERANCES = {
+    "cooling_plate_temp": 0.05,
+    "rectal_temp": 0.02,
+    "pid_output": 0.5,
+    "breath_freq_bpm": 1.0,
+}
+
+
+class SwingingDoor:
+    """Swinging-door state for one signal.
+
+    The door is the range of slopes from the last archived point (the anchor)
+    that keeps every point seen since within ``tolerance``. A new point fits
+    when the line from the anchor to it lies inside that range, which
+    guarantees every skipped point is reconstructed within ``tolerance``.
+    """
+
+    def __init__(self, tolerance: float):
+        self.tolerance = max(0.0, float(tolerance))
+        self.anchor_t = 0.0
+        self.anchor_v = 0.0
+        self.lower = -math.inf
+        self.upper = math.inf
+
+    def reset(self, t: float, v: float):
+        self.anchor_t = t
+        self.anchor_v = v
+        self.lower = -math.inf
+        self.upper = math.inf
+
+    def probe(self, t: float, v: float) -> Optional[Tuple[float, float]]:
+        """Return the narrowed door if ``(t, v)`` fits, else ``None``."""
+
+        dt = t - self.anchor_t
+        if dt <= 0:
+            # Same (or coarser) timestamp as the anchor: it must match directly.
+            if abs(v - self.anchor_v) <= self.tolerance:
+                return self.lower, self.upper
+            return None
+
+        slope = (v - self.anchor_v) / dt
+        if slope < self.lower or slope > self.upper:
+            return None
+        return (
+            max(self.lower, (v - self.tolerance - self.anchor_v) / dt),
+            min(self.upper, (v + self.tolerance - self.anchor_v) / dt),
+        )
+
+    def narrow(self, door: Tuple[float, float]):
+        self.lower, self.upper = door
+
+
+class TelemetryCompressor:
+    """Multi-field swinging-door filter deciding which rows to write.
+
+    Rows are offered in time order together with an opaque *payload* (the row
+    to write). ``offer`` returns the payloads that must be written now; the
+    last accepted row is held back until a later row closes any field's door
+    or ``flush`` is called at close. Fields missing from *tolerances* are kept
+    exactly (zero tolerance); rows with a missing value are always written.
+    """
+
+    def __init__(
+        self,
+        tolerances: Optional[Mapping[str, float]] = None,
+        fields: Sequence[str] = DATA_FIELDS,
+        max_interval_seconds: Optional[float] = None,
+    ):
+        tolerances = dict(DEFAULT_TOLERANCES if tolerances is None else tolerances)
+        self.fields = tuple(fields)
+        self.tolerances = {field: float(tolerances.get(field, 0.0)) for field in self.fields}
+        self.max_interval_seconds = max_interval_seconds
+        self.doors = [SwingingDoor(self.tolerances[field]) for field in self.fields]
+
+        self._anchored = False
+        self._anchor_t = 0.0
+        self._held: Optional[Tuple[float, List[float], Any]] = None
+        self.rows_offered = 0
+        self.rows_written = 0
+
+    @property
+    def ratio(self) -> float:
+        """Offered rows per written row (1.0 when nothing was compressed)."""
+
+        return self.rows_offered / self.rows_written if self.rows_written else 1.0
+
+    def describe(self) -> Dict[str, Any]:
+        """Metadata describing the compression, stored alongside the log."""
+
+        return {
+            "compression": COMPRESSION_METHOD,
+            "compression_tolerances": json.dumps(self.tolerances),
+        }
+
+    def _values(self, values: Mapping[str, Any]) -> Optional[List[float]]:
+        result = []
+        for field in self.fields:
+            try:
+                value = float(values.get(field))
+            except (TypeError, ValueError):
+                return None
+            if not math.isfinite(value):
+                return None
+            result.append(value)
+        return result
+
+    def _anchor(self, t: float, values: List[float]):
+        for door, value in zip(self.doors, values):
+            door.reset(t, value)
+        self._anchored = True
+        self._anchor_t = t
+
+    def _probe(self, t: float, values: List[float]) -> Optional[List[Tuple[float, float]]]:
+        narrowed = []
+        for door, value in zip(self.doors, values):
+            door_range = door.probe(t, value)
+            if door_range is None:
+                return None
+            narrowed.append(door_range)
+        return narrowed
+
+    def _emit(self, payloads: List[Any]) -> List[Any]:
+        self.rows_written += len(payloads)
+        return payloads
+
+    def offer(self, t: float, values: Mapping[str, Any], payload: Any) -> List[Any]:
+        """Offer one row at time *t* (seconds); return payloads to write now."""
+
+        self.rows_offered += 1
+        numeric = self._values(values)
+        if numeric is None or not math.isfinite(t):
+            # Gaps are written verbatim and restart compression afterwards.
+            out = self.flush()
+            self._anchored = False
+            return out + self._emit([payload])
+
+        if not self._anchored:
+            self._anchor(t, numeric)
+            return self._emit([payload])
+
+        out: List[Any] = []
+        if (
+            self._held is not None
+            and self.max_interval_seconds is not None
+            and t - self._anchor_t >= self.max_interval_seconds
+        ):
+            out.extend(self._archive_held())
+
+        narrowed = self._probe(t, numeric)
+        if narrowed is None and self._held is not None:
+            out.extend(self._archive_held())
+            narrowed = self._probe(t, numeric)
+
+        if narrowed is None:
+            # Even a fresh door rejects it (same timestamp, different value).
+            self._anchor(t, numeric)
+            return out + self._emit([payload])
+
+        for door, door_range in zip(self.doors, narrowed):
+            door.narrow(door_range)
+        self._held = (t, numeric, payload)
+        return out
+
+    def _archive_held(self) -> List[Any]:
+        t, numeric, payload = self._held
+        self._held = None
+        self._anchor(t, numeric)
+        return self._emit([payload])
+
+    def flush(self) -> List[Any]:
+        """Return the held row, if any (call before closing the log)."""
+
+        if self._held is None:
+            return []
+        return self._archive_held()
+
+
+def compress_arrays(
+    times: np.ndarray,
+    columns: Mapping[str, np.ndarray],
+    tolerances: Optional[Mapping[str, float]] = None,
+    max_interval_seconds: Optional[float] = None,
+) -> np.ndarray:
+    """Return the indices of the rows the compressor would keep.
+
+    Rows sharing a one-second timestamp are spread across that second first,
+    the same times ``reconstruct_session`` interpolates on.
+    """
+
+    fields = tuple(columns)
+    compressor = TelemetryCompressor(tolerances, fields=fields, max_interval_seconds=max_interval_seconds)
+    stacked = np.column_stack([np.asarray(columns[field], dtype=np.float64) for field in fields])
+
+    kept: List[int] = []
+    times = spread_timestamps(np.asarray(times, dtype=np.float64))
+    for index, (t, row) in enumerate(zip(times, stacked)):
+        kept.extend(compressor.offer(float(t), dict(zip(fields, row.tolist())), index))
+    kept.extend(compressor.flush())
+    return np.asarray(kept, dtype=np.int64)
+
+
+def reconstruct(times: np.ndarray, values: np.ndarray, query_times: np.ndarray) -> np.ndarray:
+    """Linearly interpolate a compressed signal at *query_times*."""
+
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    query_times = np.asarray(query_times, dtype=np.float64)
+    if times.size == 0:
+        return np.full(query_times.shape, np.nan)
+    return np.interp(query_times, times, values, left=np.nan, right=np.nan)
+
+
+def reconstruct_session(
+    filepath: str,
+    query_times: Optional[np.ndarray] = None,
+    step: float = 1.0,
+    fields: Optional[Sequence[str]] = None,
+) -> Dict[str, np.ndarray]:
+    """Rebuild evenly sampled (or *query_times*) signals from a session log.
+
+    Works for compressed and uncompressed logs alike; the result has the same
+    layout as ``SessionReader.read``. Rows sharing a one-second timestamp are
+    spread across that second before interpolating.
+    """
+
+    data = SessionReader(filepath).read(fields=fields)
+    times = spread_timestamps(data.pop("time"))
+    if query_times is None:
+        if times.size:
+            query_times = np.arange(times[0], times[-1] + step * 0.5, step)
+        else:
+            query_times = np.empty(0, dtype=np.float64)
+
+    result = {"time": np.asarray(query_times, dtype=np.float64)}
+    for field, values in data.items():
+        result[field] = reconstruct(times, values, result["time"])
+    return result
+
+
+def _tolerance(item: str) -> Tuple[str, float]:
+    """argparse type for ``--tol FIELD=VALUE``."""
+
+    field, sep, value = item.partition("=")
+    try:
+        if sep and field in DATA_FIELDS:
+            return field, float(value)
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"invalid tolerance '{item}' (use field=value)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Estimate swinging-door compression for a recorded session"
+    )
+    parser.add_argument("session", help="Session CSV or journal file")
+    parser.add_argument(
+        "--tol", action="append", default=[], type=_tolerance, metavar="FIELD=VALUE",
+        help="Per-field tolerance (repeatable)",
+    )
+    parser.add_argument("--max-interval", type=float, default=None, help="Force a row every N seconds")
+    args = parser.parse_args(argv)
+
+    tolerances = dict(DEFAULT_TOLERANCES)
+    tolerances.update(args.tol)
+    data = SessionReader(args.session).read()
+    times = spread_timestamps(data.pop("time"))
+    kept = compress_arrays(times, data, tolerances, args.max_interval)
+
+    print(f"📦 {times.size} rows → {kept.size} rows ({times.size / max(kept.size, 1):.1f}x)")
+    for field, values in data.items():
+        finite = np.isfinite(values)
+        rebuilt = reconstruct(times[kept], values[kept], times)
+        error = np.abs(rebuilt - values)[finite]
+        max_error = float(np.nanmax(error)) if error.size else 0.0
+        print(f"   {field}: tolerance={tolerances[field]:g}, max error={max_error:.4g}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,9 +8,8 @@ if __package__ in (None, ""):
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from framework.serial_comm import SerialManager
-from framework.logger import Logger
 from framework.profile_loader import ProfileLoader
-from framework.event_logger import EventLogger
+from framework.session_writer import SessionWriter
 import time
 import argparse
 import sys
@@ -19,8 +18,9 @@ class TestSuite:
     def __init__(self, port="COM3", connect=True):
         print(f"🛠️ Initializing Test Suite on port {port}...")
         self.serial = SerialManager()
-        self.logger = Logger("test_run")
-        self.event_logger = EventLogger("test_events")
+        self.session = SessionWriter("test_run")
+        self.logger = self.session.data_view()
+        self.event_logger = self.session.event_view(owns_session=True)
         self.profile_loader = ProfileLoader()
         self.test_results = []
         self.connected = False
@@ -0,0 +1,454 @@
+# Musehypothermi Python Thermal Simulation Module
+# File: thermal_simulation.py
+#
+# Fast-forward dry runs of a profile on the host. The plant is the cooling
+# plate (Peltier with separate heating and cooling power, small loss to
+# ambient, as in the firmware's SIMULATION_MODE) plus a first-order-plus-
+# dead-time rectal response to the plate. The controller is a host-side
+# reference of AsymmetricPIDModule::update (PID_v1 per mode, deadband mode
+# switching, near-setpoint tapering, rate limiting, output smoothing and the
+# safety checks that trip the failsafe).
+#
+# Every parameter may be a scalar or an array; arrays become an ensemble of
+# members simulated together, so the time loop runs once per tick for all
+# members. Targets are evaluated up front with ProfileTimeline.plate_targets.
+#
+#   python -m framework.thermal_simulation Profiles/profile.json
+
+import argparse
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from framework.profile_timeline import ProfileTimeline
+
+# Mirrors kSampleTimeMs in main/pid_module_asymmetric.cpp. Per-tick firmware
+# constants (rate limit, smoothing, rate filter) are rescaled when the
+# simulation step differs from this interval.
+FIRMWARE_TICK_S = 0.1
+DEFAULT_DT_S = 1.0
+
+# Firmware constants (main/pid_module_asymmetric.cpp).
+OUTPUT_SMOOTHING_FACTOR = 0.6
+RATE_FILTER_ALPHA = 0.2
+RATE_LIMIT_SCALE = 20.0
+SAFE_PLATE_RANGE = (10.0, 45.0)
+
+FAILSAFE_REASONS = ("", "cooling_rate", "safety_margin", "temperature_range")
+
+
+class PlantParameters:
+    """Cooling plate and rectal response parameters.
+
+    Plate: ``C dT/dt = P(u) - loss * (T - ambient)`` where ``P`` is the
+    output percentage times ``heating_power_w`` or ``cooling_power_w``.
+    Rectal: first order towards ``body_temp + gain * (plate - body_temp)``
+    with time constant ``rectal_tau_s``, seeing the plate ``dead_time_s``
+    late. ``plate_dead_time_s`` delays the output reaching the plate (the
+    transport delay of an identified FOPDT plant). ``sensor_noise_c`` is the
+    standard deviation of the Gaussian noise on the plate reading the
+    controller acts on.
+    """
+
+    FIELDS = (
+        "plate_heat_capacity", "heating_power_w", "cooling_power_w", "plate_loss_w_per_c",
+        "ambient_temp", "body_temp", "rectal_gain", "rectal_tau_s", "dead_time_s",
+        "plate_dead_time_s", "sensor_noise_c",
+    )
+
+    def __init__(
+        self,
+        plate_heat_capacity: Any = 0.3 * 900.0,
+        heating_power_w: Any = 120.0,
+        cooling_power_w: Any = 120.0,
+        plate_loss_w_per_c: Any = 0.01,
+        ambient_temp: Any = 22.0,
+        body_temp: Any = 37.0,
+        rectal_gain: Any = 0.9,
+        rectal_tau_s: Any = 900.0,
+        dead_time_s: Any = 60.0,
+        plate_dead_time_s: Any = 0.0,
+        sensor_noise_c: Any = 0.0,
+    ):
+        self.plate_heat_capacity = plate_heat_capacity
+        self.heating_power_w = heating_power_w
+        self.cooling_power_w = cooling_power_w
+        self.plate_loss_w_per_c = plate_loss_w_per_c
+        self.ambient_temp = ambient_temp
+        self.body_temp = body_temp
+        self.rectal_gain = rectal_gain
+        self.rectal_tau_s = rectal_tau_s
+        self.dead_time_s = dead_time_s
+        self.plate_dead_time_s = plate_dead_time_s
+        self.sensor_noise_c = sensor_noise_c
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class PIDParameters:
+    """Asymmetric PID settings, defaulting to the firmware defaults.
+
+    Output limits are positive percentages, as reported in status frames.
+    """
+
+    FIELDS = (
+        "kp_heating", "ki_heating", "kd_heating", "kp_cooling", "ki_cooling", "kd_cooling",
+        "heating_limit", "cooling_limit", "deadband", "safety_margin", "cooling_rate_limit",
+    )
+
+    # Status frame keys for each field (CommAPI::sendStatus).
+    STATUS_KEYS = {
+        "kp_heating": "pid_heating_kp",
+        "ki_heating": "pid_heating_ki",
+        "kd_heating": "pid_heating_kd",
+        "kp_cooling": "pid_cooling_kp",
+        "ki_cooling": "pid_cooling_ki",
+        "kd_cooling": "pid_cooling_kd",
+        "heating_limit": "pid_heating_limit",
+        "cooling_limit": "pid_cooling_limit",
+        "deadband": "deadband",
+        "safety_margin": "safety_margin",
+        "cooling_rate_limit": "cooling_rate_limit",
+    }
+
+    def __init__(
+        self,
+        kp_heating: Any = 2.0,
+        ki_heating: Any = 0.5,
+        kd_heating: Any = 1.0,
+        kp_cooling: Any = 1.5,
+        ki_cooling: Any = 0.3,
+        kd_cooling: Any = 0.8,
+        heating_limit: Any = 50.0,
+        cooling_limit: Any = 50.0,
+        deadband: Any = 0.3,
+        safety_margin: Any = 2.0,
+        cooling_rate_limit: Any = 2.0,
+    ):
+        self.kp_heating = kp_heating
+        self.ki_heating = ki_heating
+        self.kd_heating = kd_heating
+        self.kp_cooling = kp_cooling
+        self.ki_cooling = ki_cooling
+        self.kd_cooling = kd_cooling
+        self.heating_limit = heating_limit
+        self.cooling_limit = cooling_limit
+        self.deadband = deadband
+        self.safety_margin = safety_margin
+        self.cooling_rate_limit = cooling_rate_limit
+
+    @classmethod
+    def from_status(cls, data: Dict[str, Any]) -> "PIDParameters":
+        """Build from a controller status frame; missing keys keep defaults."""
+
+        params = cls()
+        for name, key in cls.STATUS_KEYS.items():
+            try:
+                if data.get(key) is not None:
+                    setattr(params, name, abs(float(data[key])))
+            except (TypeError, ValueError):
+                continue
+        return params
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class SimulationResult:
+    """Simulated trajectories; per-member arrays are ``(members, samples)``."""
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        plate_target: np.ndarray,
+        plate: np.ndarray,
+        rectal: np.ndarray,
+        output: np.ndarray,
+        failsafe_time: np.ndarray,
+        failsafe_code: np.ndarray,
+        elapsed_s: float,
+    ):
+        self.times = times
+        self.plate_target = plate_target
+        self.plate = plate
+        self.rectal = rectal
+        self.output = output
+        self.failsafe_time = failsafe_time
+        self.failsafe_code = failsafe_code
+        self.elapsed_s = elapsed_s
+
+    @property
+    def members(self) -> int:
+        return self.plate.shape[0]
+
+    @property
+    def failsafe_reasons(self) -> List[str]:
+        return [FAILSAFE_REASONS[code] for code in self.failsafe_code.tolist()]
+
+    def plate_error(self) -> np.ndarray:
+        """Plate minus target for every member and sample."""
+
+        return self.plate - self.plate_target
+
+    def summary(self, member: int = 0) -> Dict[str, Any]:
+        """Headline numbers for one member."""
+
+        error = np.abs(self.plate_error()[member])
+        failsafe_at = float(self.failsafe_time[member])
+        return {
+            "duration_s": float(self.times[-1]) if self.times.size else 0.0,
+            "max_plate_error": float(np.max(error)) if error.size else 0.0,
+            "mean_plate_error": float(np.mean(error)) if error.size else 0.0,
+            "final_plate": float(self.plate[member, -1]),
+            "final_rectal": float(self.rectal[member, -1]),
+            "min_rectal": float(np.min(self.rectal[member])),
+            "failsafe_time_s": None if math.isnan(failsafe_at) else failsafe_at,
+            "failsafe_reason": FAILSAFE_REASONS[int(self.failsafe_code[member])] or None,
+            "elapsed_s": self.elapsed_s,
+        }
+
+
+def _members(values: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Broadcast scalar/array parameters to one flat array per field."""
+
+    names = list(values)
+    arrays = np.broadcast_arrays(*[np.atleast_1d(np.asarray(values[name], dtype=np.float64)) for name in names])
+    if arrays[0].ndim != 1:
+        raise ValueError("Ensemble parameters must be scalars or 1-D arrays")
+    return {name: np.array(array, dtype=np.float64) for name, array in zip(names, arrays)}
+
+
+def simulate_profile(
+    timeline: ProfileTimeline,
+    plant: Optional[PlantParameters] = None,
+    pid: Optional[PIDParameters] = None,
+    dt: float = DEFAULT_DT_S,
+    initial_plate: Any = None,
+    initial_rectal: Any = None,
+    seed: Optional[int] = None,
+) -> SimulationResult:
+    """Drive *timeline* through the reference PID and plant model.
+
+    The plate target holds at each breakpoint like ProfileManager does. The
+    plate starts at the first target and the rectal probe at ``body_temp``
+    unless *initial_plate* / *initial_rectal* are given. A member that trips
+    a safety check has its output forced to zero for the rest of the run.
+    *seed* makes the sensor noise reproducible.
+    """
+
+    if dt <= 0:
+        raise ValueError("dt must be positive")
+
+    started = time.perf_counter()
+    plant = plant or PlantParameters()
+    pid = pid or PIDParameters()
+
+    samples = int(math.floor(timeline.duration / dt)) + 1
+    times = timeline.times[0] + np.arange(samples, dtype=np.float64) * dt
+    targets = timeline.plate_targets(times)
+    targets = np.where(np.isnan(targets), timeline.targets[-1], targets)
+    target_list = targets.tolist()
+
+    params = _members({
+        **plant.as_dict(),
+        **pid.as_dict(),
+        "initial_plate": timeline.targets[0] if initial_plate is None else initial_plate,
+        "initial_rectal": plant.body_temp if initial_rectal is None else initial_rectal,
+    })
+    count = params["kp_heating"].size
+
+    # Per-tick firmware constants rescaled to dt.
+    ticks = dt / FIRMWARE_TICK_S
+    smoothing = OUTPUT_SMOOTHING_FACTOR ** ticks
+    rate_alpha = 1.0 - (1.0 - RATE_FILTER_ALPHA) ** ticks
+    max_delta = params["cooling_rate_limit"] * RATE_LIMIT_SCALE * ticks
+    min_rate = -params["cooling_rate_limit"]
+    deadband = params["deadband"]
+    neg_deadband = -deadband
+    margin = params["safety_margin"]
+    heat_limit = np.abs(params["heating_limit"])
+    cool_limit = -np.abs(params["cooling_limit"])
+    safe_low, safe_high = SAFE_PLATE_RANGE
+
+    # Mode-dependent settings (0 heating, 1 cooling): kp, ki*dt, kd/dt,
+    # output limits, taper floor and plate gain. Gathered again only when a
+    # member switches mode.
+    capacity = params["plate_heat_capacity"]
+    zeros = np.zeros(count)
+    mode_table = np.stack([
+        np.stack([
+            params["kp_heating"], params["ki_heating"] * dt, params["kd_heating"] / dt,
+            zeros, heat_limit, zeros + 0.2, params["heating_power_w"] / 100.0 * dt / capacity,
+        ], axis=1),
+        np.stack([
+            params["kp_cooling"], params["ki_cooling"] * dt, params["kd_cooling"] / dt,
+            cool_limit, zeros, zeros + 0.3, params["cooling_power_w"] / 100.0 * dt / capacity,
+        ], axis=1),
+    ], axis=1)
+
+    loss_gain = params["plate_loss_w_per_c"] * dt / capacity
+    ambient = params["ambient_temp"]
+    rectal_decay = np.exp(-dt / np.maximum(params["rectal_tau_s"], 1e-9))
+    rectal_in = (1.0 - rectal_decay) * params["rectal_gain"]
+    rectal_offset = (1.0 - rectal_decay) * params["body_temp"] * (1.0 - params["rectal_gain"])
+    delay = np.round(params["dead_time_s"] / dt).astype(np.int64)
+    uniform_delay = int(delay[0]) if np.all(delay == delay[0]) else None
+    plate_delay = np.round(params["plate_dead_time_s"] / dt).astype(np.int64)
+    uniform_plate_delay = int(plate_delay[0]) if np.all(plate_delay == plate_delay[0]) else None
+    drive_hist = np.zeros((count, samples)) if np.any(plate_delay > 0) else None
+    member_index = np.arange(count)
+
+    noise = None
+    if np.any(params["sensor_noise_c"] > 0.0):
+        rng = np.random.default_rng(seed)
+        noise = rng.standard_normal((count, samples)) * params["sensor_noise_c"][:, None]
+
+    plate_hist = np.empty((count, samples))
+    rectal_hist = np.empty((count, samples))
+    output_hist = np.empty((count, samples))
+
+    plate = params["initial_plate"].copy()
+    rectal = params["initial_rectal"].copy()
+    last_input = plate.copy()
+    last_temp = plate.copy()
+    rate = np.zeros(count)
+    integral = np.zeros(count)
+    last_output = np.zeros(count)
+    mode = np.zeros(count, dtype=np.int64)
+    cooling = mode == 1
+    kp, ki, kd, low, high, floor, plate_gain = mode_table[member_index, mode].T
+    tripped = np.zeros(count, dtype=bool)
+    any_tripped = False
+    failsafe_time = np.full(count, np.nan)
+    failsafe_code = np.zeros(count, dtype=np.int8)
+    smoothing_in = 1.0 - smoothing
+
+    setpoint = target_list[0]
+    last_setpoint = setpoint
+
+    for k in range(samples):
+        plate_hist[:, k] = plate
+        rectal_hist[:, k] = rectal
+        # The controller acts on the (noisy) reading; the plant keeps the true state.
+        reading = plate if noise is None else plate + noise[:, k]
+
+        target = target_list[k]
+        if target != setpoint:
+            last_setpoint, setpoint = setpoint, target
+
+        rate += rate_alpha * ((reading - last_temp) / dt - rate)
+        last_temp = reading
+
+        # updatePIDMode; a switch resets the output state like the firmware.
+        error = setpoint - reading
+        want_cool = error < neg_deadband
+        want_heat = error > deadband
+        if setpoint < last_setpoint:
+            want_cool |= ~cooling & (error < 0.0)
+            undershoot = cooling & (error >= 0.0)
+            want_heat |= undershoot
+            want_cool &= ~undershoot
+        switched = np.where(cooling, want_heat, want_cool)
+        if np.count_nonzero(switched):
+            mode = np.where(switched, 1 - mode, mode)
+            cooling = mode == 1
+            kp, ki, kd, low, high, floor, plate_gain = mode_table[member_index, mode].T
+            integral = np.where(switched, 0.0, integral)
+            last_output = np.where(switched, 0.0, last_output)
+            last_input = np.where(switched, reading, last_input)
+
+        # checkSafetyLimits and the cooling rate guard trip the failsafe.
+        unsafe = (rate < min_rate) | (cooling & (error >= margin)) | (reading < safe_low) | (reading > safe_high)
+        if np.count_nonzero(unsafe):
+            new_trips = unsafe & ~tripped
+            if np.count_nonzero(new_trips):
+                code = np.select(
+                    [rate < min_rate, cooling & (error >= margin)], [1, 2], default=3
+                )
+                tripped |= new_trips
+                any_tripped = True
+                failsafe_time[new_trips] = times[k]
+                failsafe_code[new_trips] = code[new_trips]
+
+        # PID_v1::Compute with the active mode's gains and limits.
+        integral = np.minimum(np.maximum(integral + ki * error, low), high)
+        raw = np.minimum(np.maximum(kp * error + integral - kd * (reading - last_input), low), high)
+        last_input = reading
+
+        # applySafetyConstraints: taper within 2 °C of the setpoint and no
+        # heating above it. Tapering only shrinks the output, so it stays
+        # inside the limits applied above.
+        raw = raw * np.maximum(np.minimum(np.abs(error) * 0.5, 1.0), floor)
+        raw = np.where(cooling | (error >= 0.0), raw, 0.0)
+
+        # applyRateLimiting and applyOutputSmoothing.
+        raw = np.minimum(np.maximum(raw, last_output - max_delta), last_output + max_delta)
+        output = smoothing * last_output + smoothing_in * raw
+        if any_tripped:
+            output = np.where(tripped, 0.0, output)
+        last_output = output
+        output_hist[:, k] = output
+
+        # Plant: plate heat balance (the output arrives after the plate dead
+        # time, zero before the run), then the delayed first-order rectal
+        # response (a blend of past states, so it needs no clamping).
+        drive = plate_gain * output
+        if drive_hist is not None:
+            drive_hist[:, k] = drive
+            if uniform_plate_delay is not None:
+                drive = drive_hist[:, k - uniform_plate_delay] if k >= uniform_plate_delay else zeros
+            else:
+                drive = np.where(
+                    k >= plate_delay, drive_hist[member_index, np.maximum(k - plate_delay, 0)], 0.0
+                )
+        plate = plate + drive - loss_gain * (plate - ambient)
+        if uniform_delay is not None:
+            delayed = plate_hist[:, max(k - uniform_delay, 0)]
+        else:
+            delayed = plate_hist[member_index, np.maximum(k - delay, 0)]
+        rectal = rectal_decay * rectal + rectal_in * delayed + rectal_offset
+
+    return SimulationResult(
+        times=times,
+        plate_target=targets,
+        plate=plate_hist,
+        rectal=rectal_hist,
+        output=output_hist,
+        failsafe_time=failsafe_time,
+        failsafe_code=failsafe_code,
+        elapsed_s=time.perf_counter() - started,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from framework.profile_loader import ProfileLoader
+
+    parser = argparse.ArgumentParser(description="Simulate a profile against the thermal plant model")
+    parser.add_argument("profile", help="Profile file (CSV or JSON)")
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT_S, help="Simulation step in seconds")
+    parser.add_argument("--body-temp", type=float, default=37.0, help="Initial/basal rectal temperature")
+    parser.add_argument("--tau", type=float, default=900.0, help="Rectal time constant in seconds")
+    parser.add_argument("--dead-time", type=float, default=60.0, help="Rectal dead time in seconds")
+    args = parser.parse_args(argv)
+
+    loader = ProfileLoader()
+    timeline = loader.compile_timeline(loader.load_profile(args.profile))
+    plant = PlantParameters(body_temp=args.body_temp, rectal_tau_s=args.tau, dead_time_s=args.dead_time)
+    summary = simulate_profile(timeline, plant=plant, dt=args.dt).summary()
+
+    print(f"⏱️ {summary['duration_s'] / 60.0:.1f} min simulated in {summary['elapsed_s'] * 1000.0:.0f} ms")
+    print(
+        f"🌡️ Plate error max {summary['max_plate_error']:.2f} °C, mean {summary['mean_plate_error']:.2f} °C; "
+        f"rectal final {summary['final_rectal']:.2f} °C, min {summary['min_rectal']:.2f} °C"
+    )
+    if summary["failsafe_reason"]:
+        print(f"🚨 Failsafe ({summary['failsafe_reason']}) at {summary['failsafe_time_s']:.0f} s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
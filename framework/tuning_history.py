@@ -0,0 +1,378 @@
+# Musehypothermi Python Tuning History Module
+# File: tuning_history.py
+#
+# Local SQLite store of every autotune result, every PID gain set applied to
+# the controller and the control-quality metrics that followed, keyed by rig
+# and time. Numeric fields live in their own columns behind a (rig, kind,
+# time) index, so the trend of one field across hundreds of runs is a single
+# indexed query and a slowly degrading plate or probe shows up as drift in
+# the identified plant or in the tracking error.
+#
+#   python -m framework.tuning_history import
+#   python -m framework.tuning_history summary --rig rig-2
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from framework.autotune_replay import drift_pct_per_30d
+from framework.session_catalog import SessionCatalog
+
+DEFAULT_HISTORY_PATH = os.path.join("logs", "tuning_history.sqlite")
+
+KINDS = ("autotune", "gains", "control_metrics")
+GAIN_FIELDS = ("kp", "ki", "kd")
+PLANT_FIELDS = ("process_gain", "dead_time", "time_constant")
+QUALITY_FIELDS = ("iae", "rms_error", "max_overshoot", "mean_settling_time", "saturated_s")
+TREND_FIELDS = GAIN_FIELDS + PLANT_FIELDS + QUALITY_FIELDS
+
+GAIN_COMMANDS = {"set_heating_pid": "heating", "set_cooling_pid": "cooling"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    rig TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    mode TEXT,
+    source TEXT,
+    session TEXT,
+    kp REAL,
+    ki REAL,
+    kd REAL,
+    process_gain REAL,
+    dead_time REAL,
+    time_constant REAL,
+    iae REAL,
+    rms_error REAL,
+    max_overshoot REAL,
+    mean_settling_time REAL,
+    saturated_s REAL,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_records_rig_kind_time ON records (rig, kind, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_records_session ON records (session);
+"""
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if np.isfinite(number) else None
+
+
+def autotune_rows(result: Dict[str, Any]) -> List[Tuple[str, Dict[str, Optional[float]]]]:
+    """Split an autotune result into (mode, fields) rows.
+
+    Accepts both the wizard's normalised payload (``heating_process_gain``,
+    ``cooling_kp`` ...) and the compact AUTOTUNE_RESULT event record.
+    """
+
+    rows = []
+    for mode, gain_prefix in (("heating", ""), ("cooling", "cooling_")):
+        fields = {name: _number(result.get(gain_prefix + name)) for name in GAIN_FIELDS}
+        if any(value is None for value in fields.values()):
+            continue
+        for name in PLANT_FIELDS:
+            value = result.get(f"{mode}_{name}")
+            if value is None and mode == "heating":
+                value = result.get(name)
+            fields[name] = _number(value)
+        rows.append((mode, fields))
+    return rows
+
+
+def quality_fields(metrics: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Trend fields of a ControlQualityMetrics.as_dict() record."""
+
+    fields = {name: _number(metrics.get(name)) for name in QUALITY_FIELDS if name != "saturated_s"}
+    heating = _number(metrics.get("saturated_heating_s"))
+    cooling = _number(metrics.get("saturated_cooling_s"))
+    fields["saturated_s"] = None if heating is None and cooling is None else (heating or 0.0) + (cooling or 0.0)
+    return fields
+
+
+class TuningHistory:
+    """SQLite-backed history of autotune results, applied gains and control quality."""
+
+    COLUMNS = ("rig", "recorded_at", "kind", "mode", "source", "session") + TREND_FIELDS + ("payload",)
+
+    def __init__(self, db_path: str = DEFAULT_HISTORY_PATH):
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    # --- Recording ---
+    def record(
+        self,
+        rig: str,
+        kind: str,
+        fields: Dict[str, Optional[float]],
+        mode: Optional[str] = None,
+        source: Optional[str] = None,
+        session: Optional[str] = None,
+        recorded_at: Optional[float] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        commit: bool = True,
+    ) -> int:
+        """Store one record and return its id."""
+
+        if kind not in KINDS:
+            raise ValueError(f"unknown record kind {kind!r}")
+        unknown = set(fields) - set(TREND_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+
+        values = dict(fields)
+        values.update(
+            {
+                "rig": rig or "unknown",
+                "recorded_at": time.time() if recorded_at is None else float(recorded_at),
+                "kind": kind,
+                "mode": mode,
+                "source": source,
+                "session": os.path.abspath(session) if session else None,
+                "payload": json.dumps(payload, default=str) if payload is not None else None,
+            }
+        )
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        cursor = self.conn.execute(
+            f"INSERT INTO records ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+            [values.get(column) for column in self.COLUMNS],
+        )
+        if commit:
+            self.conn.commit()
+        return int(cursor.lastrowid)
+
+    def record_autotune(
+        self,
+        rig: str,
+        result: Dict[str, Any],
+        source: Optional[str] = None,
+        session: Optional[str] = None,
+        recorded_at: Optional[float] = None,
+        commit: bool = True,
+    ) -> List[int]:
+        """Store the heating and (when present) cooling rows of an autotune result."""
+
+        ids = [
+            self.record(rig, "autotune", fields, mode=mode, source=source, session=session,
+                        recorded_at=recorded_at, payload=result, commit=False)
+            for mode, fields in autotune_rows(result)
+        ]
+        if commit:
+            self.conn.commit()
+        return ids
+
+    def record_gains(
+        self,
+        rig: str,
+        mode: str,
+        kp: float,
+        ki: float,
+        kd: float,
+        session: Optional[str] = None,
+        recorded_at: Optional[float] = None,
+    ) -> int:
+        """Store a gain set applied to the controller."""
+
+        return self.record(
+            rig, "gains", {"kp": kp, "ki": ki, "kd": kd}, mode=mode, source="applied",
+            session=session, recorded_at=recorded_at,
+        )
+
+    def record_control_metrics(
+        self,
+        rig: str,
+        metrics: Dict[str, Any],
+        session: Optional[str] = None,
+        recorded_at: Optional[float] = None,
+        commit: bool = True,
+    ) -> int:
+        """Store a ControlQualityMetrics record."""
+
+        return self.record(
+            rig, "control_metrics", quality_fields(metrics), source="session", session=session,
+            recorded_at=recorded_at, payload=metrics, commit=commit,
+        )
+
+    def import_catalog(self, catalog: SessionCatalog) -> Dict[str, int]:
+        """Backfill from the session catalogue.
+
+        Sessions that already have records (recorded live, or imported
+        before) are skipped, so the import can be repeated.
+        """
+
+        result = {"sessions": 0, "skipped": 0, "records": 0}
+        for row in catalog.query():
+            if not row["autotune_results"] and not row["control_metrics"]:
+                continue
+            session = row["path"]
+            if self.conn.execute("SELECT 1 FROM records WHERE session = ? LIMIT 1", (session,)).fetchone():
+                result["skipped"] += 1
+                continue
+            recorded_at = row["ended_at"] or row["started_at"] or row["indexed_at"]
+            rig = row["rig"] or "unknown"
+            for entry in row["autotune_results"]:
+                result["records"] += len(
+                    self.record_autotune(rig, entry, source="catalog", session=session,
+                                         recorded_at=recorded_at, commit=False)
+                )
+            for metrics in row["control_metrics"]:
+                self.record_control_metrics(rig, metrics, session=session, recorded_at=recorded_at, commit=False)
+                result["records"] += 1
+            result["sessions"] += 1
+        self.conn.commit()
+        return result
+
+    # --- Queries ---
+    def rigs(self) -> List[str]:
+        return [row["rig"] for row in self.conn.execute("SELECT DISTINCT rig FROM records ORDER BY rig")]
+
+    def trend(
+        self,
+        rig: str,
+        kind: str,
+        field: str,
+        mode: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (recorded_at, value) arrays of one field, oldest first."""
+
+        if field not in TREND_FIELDS:
+            raise ValueError(f"unknown trend field {field!r}")
+
+        clauses = ["rig = ?", "kind = ?", f"{field} IS NOT NULL"]
+        params: List[Any] = [rig, kind]
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+        if since is not None:
+            clauses.append("recorded_at >= ?")
+            params.append(float(since))
+        if until is not None:
+            clauses.append("recorded_at <= ?")
+            params.append(float(until))
+
+        rows = self.conn.execute(
+            f"SELECT recorded_at, {field} FROM records WHERE {' AND '.join(clauses)} ORDER BY recorded_at",
+            params,
+        ).fetchall()
+        if not rows:
+            return np.empty(0), np.empty(0)
+        data = np.array(rows, dtype=np.float64)
+        return data[:, 0], data[:, 1]
+
+    def summary(self, rig: str, since: Optional[float] = None) -> Dict[str, Any]:
+        """Count, latest, median and drift of every field per kind and mode."""
+
+        sql = f"SELECT kind, mode, recorded_at, {', '.join(TREND_FIELDS)} FROM records WHERE rig = ?"
+        params: List[Any] = [rig]
+        if since is not None:
+            sql += " AND recorded_at >= ?"
+            params.append(float(since))
+        rows = self.conn.execute(sql + " ORDER BY recorded_at", params).fetchall()
+
+        groups: Dict[Tuple[str, str], List[Sequence[Any]]] = {}
+        for row in rows:
+            groups.setdefault((row["kind"], row["mode"] or "-"), []).append(tuple(row)[2:])
+
+        table: Dict[str, Any] = {}
+        for (kind, mode), group in sorted(groups.items()):
+            data = np.array(group, dtype=np.float64)
+            times = data[:, 0]
+            entry: Dict[str, Any] = {"count": len(group), "first": float(times[0]), "last": float(times[-1])}
+            for index, field in enumerate(TREND_FIELDS, start=1):
+                column = data[:, index]
+                valid = np.isfinite(column)
+                if not valid.any():
+                    continue
+                values = column[valid]
+                entry[field] = {
+                    "latest": float(values[-1]),
+                    "median": float(np.median(values)),
+                    "drift_pct_per_30d": drift_pct_per_30d(times[valid], values),
+                }
+            table.setdefault(kind, {})[mode] = entry
+        return table
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Musehypothermi tuning history")
+    parser.add_argument("--db", default=DEFAULT_HISTORY_PATH, help="History database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    importer = sub.add_parser("import", help="Backfill from the session catalogue")
+    importer.add_argument("--catalog", default=None, help="Catalogue database path")
+
+    summary = sub.add_parser("summary", help="Per-rig trend summary")
+    summary.add_argument("--rig", default=None, help="Only this rig")
+
+    trend = sub.add_parser("trend", help="Print one field over time")
+    trend.add_argument("--rig", required=True)
+    trend.add_argument("--kind", choices=KINDS, default="autotune")
+    trend.add_argument("--field", choices=TREND_FIELDS, default="time_constant")
+    trend.add_argument("--mode", default=None, help="heating or cooling")
+
+    args = parser.parse_args(argv)
+    history = TuningHistory(args.db)
+    try:
+        if args.command == "import":
+            catalog = SessionCatalog(args.catalog) if args.catalog else SessionCatalog()
+            try:
+                result = history.import_catalog(catalog)
+            finally:
+                catalog.close()
+            print(
+                f"✅ Imported {result['records']} record(s) from {result['sessions']} session(s), "
+                f"skipped {result['skipped']}"
+            )
+            return 0
+
+        if args.command == "trend":
+            start = time.perf_counter()
+            times, values = history.trend(args.rig, args.kind, args.field, mode=args.mode)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            for t_value, value in zip(times, values):
+                print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(t_value))}  {value:.4g}")
+            print(f"📈 {values.size} point(s) in {elapsed_ms:.1f} ms")
+            return 0
+
+        rigs = [args.rig] if args.rig else history.rigs()
+        for rig in rigs:
+            print(f"🔧 {rig}")
+            for kind, modes in history.summary(rig).items():
+                for mode, entry in modes.items():
+                    print(f"   {kind}/{mode}: {entry['count']} record(s)")
+                    for field in TREND_FIELDS:
+                        if field not in entry:
+                            continue
+                        values = entry[field]
+                        drift = values["drift_pct_per_30d"]
+                        drift_text = f"{drift:+.1f}%/30d" if drift is not None else "-"
+                        print(
+                            f"      {field:<19} latest {values['latest']:.4g}  "
+                            f"median {values['median']:.4g}  drift {drift_text}"
+                        )
+        return 0
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
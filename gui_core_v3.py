@@ -10,7 +10,8 @@ import csv
 import os
 import traceback
 import math
-from typing import Dict, List, Optional, Any, Tuple
+import platform
+from typing import Dict, List, Optional, Any, Tuple, Union
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QLabel,
@@ -35,13 +36,38 @@ from matplotlib.backends.backend_qt5agg import (
 )
 from matplotlib.figure import Figure
 
+import numpy as np
 import pyqtgraph as pg
 
 # Local imports
+from framework.autotune_analysis import AutotuneDataAnalyzer
+from framework.control_metrics import CONTROL_METRICS_EVENT_PREFIX, ControlQualityMetrics
+from framework.early_warning import GRADE_RANK, EarlyWarningMonitor
+from framework.equilibrium_estimator import EquilibriumTracker
+from framework.gain_search import GainCandidate, plant_from_fopdt, search_gains
 from framework.serial_comm import SerialManager
-from framework.event_logger import EventLogger
+from framework.profile_cache import CompiledProfile, ProfileCache
 from framework.profile_loader import ProfileLoader
-from framework.logger import Logger
+from framework.profile_parser import ProfileParseError, format_issue
+from framework.profile_streamer import (
+    MAX_CONTROLLER_STEPS,
+    ProfileStreamer,
+    convert_profile_points_to_steps,
+)
+from framework.profile_sync import PATCH, SKIP, ProfileSync
+from framework.profile_timeline import ProfileTimeline
+from framework.relay_autotune import DEFAULT_HYSTERESIS_C, RelayFeedbackAnalyzer
+from framework.session_catalog import SessionCatalog
+from framework.session_writer import SessionDataView, SessionWriter
+from framework.state_filter import TelemetryFilter
+from framework.thermal_simulation import PIDParameters, SimulationResult, simulate_profile
+from framework.tuning_history import (
+    GAIN_COMMANDS,
+    GAIN_FIELDS,
+    PLANT_FIELDS,
+    QUALITY_FIELDS,
+    TuningHistory,
+)
 from profile_graph_widget import _first_present
 
 # ============================================================================
@@ -428,10 +454,9 @@ class AsymmetricPIDControls(QWidget):
                         "color: #dc3545; font-weight: bold;",
                     )
                     if state_changed:
-                        if self.event_logger is not None:
-                            self.event_logger.log_event("EVENT: EMERGENCY_STOP_TRIGGERED")
-                        if self.data_logger is not None:
-                            self.data_logger.log_event("EMERGENCY_STOP_TRIGGERED")
+                        event_logger = getattr(self.parent, "event_logger", None)
+                        if event_logger is not None:
+                            event_logger.log_event("EVENT: EMERGENCY_STOP_TRIGGERED")
                         self.log("🚨 Emergency stop active", "error")
                         self.log_emergency_event("EMERGENCY STOP TRIGGERED")
                 else:
@@ -441,10 +466,9 @@ class AsymmetricPIDControls(QWidget):
                         "color: #28a745; font-weight: bold;",
                     )
                     if state_changed:
-                        if self.event_logger is not None:
-                            self.event_logger.log_event("EVENT: EMERGENCY_STOP_CLEARED")
-                        if self.data_logger is not None:
-                            self.data_logger.log_event("EMERGENCY_STOP_CLEARED")
+                        event_logger = getattr(self.parent, "event_logger", None)
+                        if event_logger is not None:
+                            event_logger.log_event("EVENT: EMERGENCY_STOP_CLEARED")
                         self.log("✅ Emergency stop cleared", "info")
                         self.log_emergency_event("EMERGENCY STOP CLEARED")
 
@@ -613,163 +637,193 @@ class AsymmetricPIDControls(QWidget):
 # Autotune wizard implementation
 # ============================================================================
 
-class AutotuneDataAnalyzer:
-    """Collect samples and compute Ziegler-Nichols inspired PID values."""
-
-    MIN_SAMPLES = 40
-    STABLE_WINDOW = 25
-
-    def __init__(self) -> None:
-        self.reset()
-
-    def reset(self) -> None:
-        self.start_timestamp: Optional[float] = None
-        self.timestamps: List[float] = []
-        self.temperatures: List[float] = []
-        self.outputs: List[float] = []
-
-    def add_sample(self, timestamp: float, temperature: float, output: float) -> None:
-        if self.start_timestamp is None:
-            self.start_timestamp = timestamp
-
-        elapsed = max(0.0, timestamp - self.start_timestamp)
-        self.timestamps.append(elapsed)
-        self.temperatures.append(temperature)
-        self.outputs.append(output)
+class GainComparisonDialog(QDialog):
+    """Table of simulated PID candidates (Pareto sets plus reference gains)."""
 
-    def has_enough_samples(self) -> bool:
-        return len(self.timestamps) >= self.MIN_SAMPLES
-
-    def is_stable(self, tolerance: float = 0.05) -> bool:
-        if len(self.temperatures) < self.STABLE_WINDOW:
-            return False
+    COLUMNS = (
+        "Modus", "Kilde", "Kp", "Ki", "Kd", "IAE [°C·s]", "Overshoot [°C]", "Innsvingning [s]", "Metning [s]",
+    )
 
-        recent = self.temperatures[-self.STABLE_WINDOW:]
-        if not recent:
-            return False
+    def __init__(self, candidates: List[GainCandidate], summary: str, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setWindowTitle("Sammenlign PID-kandidater")
+        self.resize(820, 460)
+        self.candidates = candidates
 
-        return (max(recent) - min(recent)) <= tolerance
+        layout = QVBoxLayout(self)
+        info = QLabel(summary)
+        info.setWordWrap(True)
+        info.setStyleSheet("color: #495057;")
+        layout.addWidget(info)
+
+        self.table = QTableWidget(len(candidates), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(list(self.COLUMNS))
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        for row, candidate in enumerate(candidates):
+            unsettled = not candidate.settled or candidate.failsafe_reason
+            values = (
+                "Varme" if candidate.mode == "heating" else "Kjøling",
+                candidate.source if not unsettled else f"{candidate.source} (ikke innsvingt)",
+                f"{candidate.kp:.3f}",
+                f"{candidate.ki:.4f}",
+                f"{candidate.kd:.3f}",
+                f"{candidate.iae:.0f}",
+                f"{candidate.overshoot:.2f}",
+                f"{candidate.settling_time:.0f}" if not unsettled else "–",
+                f"{candidate.saturated_s:.0f}",
+            )
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if candidate.source != "grid":
+                    item.setBackground(QColor("#f1f3f5"))
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+        self.table.itemSelectionChanged.connect(self._handle_selection)
+        layout.addWidget(self.table)
 
-    def max_rate(self) -> float:
-        if len(self.timestamps) < 2:
-            return 0.0
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        self.use_button = buttons.button(QDialogButtonBox.Ok)
+        self.use_button.setText("Bruk valgt")
+        self.use_button.setEnabled(False)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
 
-        max_rate = 0.0
-        for idx in range(1, len(self.timestamps)):
-            dt = self.timestamps[idx] - self.timestamps[idx - 1]
-            if dt <= 0:
-                continue
-            rate = (self.temperatures[idx] - self.temperatures[idx - 1]) / dt
-            if rate > max_rate:
-                max_rate = rate
-        return max_rate
+    def _handle_selection(self) -> None:
+        self.use_button.setEnabled(bool(self.table.selectionModel().selectedRows()))
 
-    @staticmethod
-    def _moving_average(values: List[float], window: int = 10) -> float:
-        if not values:
-            return 0.0
-        if len(values) < window:
-            return sum(values) / len(values)
-        return sum(values[-window:]) / float(window)
-
-    def _estimate_dead_time(self, start_temp: float, final_temp: float) -> float:
-        if not self.timestamps:
-            return 0.0
-
-        delta = final_temp - start_temp
-        if abs(delta) < 1e-6:
-            return 0.0
-
-        threshold = start_temp + 0.05 * delta
-        for t, temp in zip(self.timestamps, self.temperatures):
-            if (delta > 0 and temp >= threshold) or (delta < 0 and temp <= threshold):
-                return max(0.0, t)
-        return 0.0
-
-    def _estimate_time_constant(self, start_temp: float, final_temp: float) -> float:
-        if not self.timestamps:
-            return 0.0
-
-        delta = final_temp - start_temp
-        if abs(delta) < 1e-6:
-            return 0.0
-
-        target = start_temp + 0.63 * delta
-        for t, temp in zip(self.timestamps, self.temperatures):
-            if (delta > 0 and temp >= target) or (delta < 0 and temp <= target):
-                return max(0.0, t)
-        return self.timestamps[-1]
-
-    def _estimate_settling_time(self, final_temp: float, tolerance: float = 0.1) -> float:
-        if not self.timestamps:
-            return 0.0
-
-        for idx in range(len(self.timestamps) - 1, -1, -1):
-            window = self.temperatures[idx:]
-            if not window:
-                continue
-            if max(abs(val - final_temp) for val in window) <= tolerance:
-                return self.timestamps[idx]
-        return self.timestamps[-1]
+    def selected_candidate(self) -> Optional[GainCandidate]:
+        rows = self.table.selectionModel().selectedRows()
+        return self.candidates[rows[0].row()] if rows else None
 
-    def compute_results(self) -> Optional[Dict[str, float]]:
-        if not self.has_enough_samples():
-            return None
 
-        initial_temp = self.temperatures[0]
-        final_temp = self._moving_average(self.temperatures, 10)
-        delta_temp = final_temp - initial_temp
-        if abs(delta_temp) < 0.05:
-            return None
+class TuningHistoryDialog(QDialog):
+    """Trends of autotune results, applied gains and control quality per rig."""
 
-        initial_output = self._moving_average(self.outputs, 12)
-        final_output = self._moving_average(self.outputs, 4)
-        output_span = max(self.outputs) - min(self.outputs)
-        if abs(output_span) < 1.0:
-            output_span = final_output - initial_output
+    SERIES = (
+        ("Autotune – heating", "autotune", "heating"),
+        ("Autotune – cooling", "autotune", "cooling"),
+        ("Applied gains – heating", "gains", "heating"),
+        ("Applied gains – cooling", "gains", "cooling"),
+        ("Control quality", "control_metrics", None),
+    )
+    KIND_FIELDS = {
+        "autotune": GAIN_FIELDS + PLANT_FIELDS,
+        "gains": GAIN_FIELDS,
+        "control_metrics": QUALITY_FIELDS,
+    }
 
-        if abs(output_span) < 1e-3:
-            return None
+    def __init__(self, history: TuningHistory, rig: Optional[str] = None, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setWindowTitle("Tuning History")
+        self.resize(900, 620)
+        self.history = history
+        self._summary: Dict[str, Any] = {}
 
-        step_fraction = output_span / 100.0
-        process_gain = delta_temp / step_fraction if step_fraction else 0.0
+        layout = QVBoxLayout(self)
+        selectors = QHBoxLayout()
+        self.rig_combo = QComboBox()
+        rigs = history.rigs()
+        if rig and rig not in rigs:
+            rigs.insert(0, rig)
+        self.rig_combo.addItems(rigs)
+        if rig:
+            self.rig_combo.setCurrentText(rig)
+        self.series_combo = QComboBox()
+        for label, _, _ in self.SERIES:
+            self.series_combo.addItem(label)
+        self.field_combo = QComboBox()
+        selectors.addWidget(QLabel("Rig:"))
+        selectors.addWidget(self.rig_combo)
+        selectors.addWidget(QLabel("Series:"))
+        selectors.addWidget(self.series_combo)
+        selectors.addWidget(QLabel("Field:"))
+        selectors.addWidget(self.field_combo)
+        selectors.addStretch()
+        layout.addLayout(selectors)
+
+        self.plot = pg.PlotWidget(axisItems={"bottom": pg.DateAxisItem()})
+        self.plot.showGrid(x=True, y=True, alpha=0.3)
+        self.plot.getPlotItem().getAxis("left").enableAutoSIPrefix(False)
+        self.trend_curve = self.plot.plot(
+            pen=pg.mkPen(color="#0d6efd", width=1), symbol="o", symbolSize=5, symbolBrush="#0d6efd"
+        )
+        self.fit_curve = self.plot.plot(pen=pg.mkPen(color="#dc3545", width=2, style=Qt.DashLine))
+        layout.addWidget(self.plot, 1)
 
-        dead_time = self._estimate_dead_time(initial_temp, final_temp)
-        t63 = self._estimate_time_constant(initial_temp, final_temp)
-        time_constant = max(0.1, t63 - dead_time)
+        self.trend_label = QLabel("")
+        self.trend_label.setStyleSheet("color: #495057;")
+        layout.addWidget(self.trend_label)
 
-        duration = self.timestamps[-1] if self.timestamps else 0.0
-        sample_count = len(self.timestamps)
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Field", "Latest", "Median", "Drift [%/30d]"])
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setMaximumHeight(200)
+        layout.addWidget(self.table)
 
-        kp = 0.0
-        ki = 0.0
-        kd = 0.0
-        if process_gain != 0 and dead_time > 0:
-            kp = 1.2 * time_constant / (process_gain * dead_time)
-            ki = kp / (2.0 * dead_time)
-            kd = kp * dead_time * 0.5
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
 
-        overshoot = max(self.temperatures) - final_temp
-        max_rate = self.max_rate()
-        settling_time = self._estimate_settling_time(final_temp)
+        self.rig_combo.currentTextChanged.connect(self._load_rig)
+        self.series_combo.currentIndexChanged.connect(self._load_series)
+        self.field_combo.currentTextChanged.connect(self._load_trend)
+        self._load_rig(self.rig_combo.currentText())
+
+    def _series(self) -> Tuple[str, Optional[str]]:
+        _, kind, mode = self.SERIES[max(0, self.series_combo.currentIndex())]
+        return kind, mode
+
+    def _load_rig(self, rig: str) -> None:
+        self._summary = self.history.summary(rig) if rig else {}
+        self._load_series()
+
+    def _load_series(self, *_args) -> None:
+        kind, mode = self._series()
+        entry = self._summary.get(kind, {}).get(mode or "-", {})
+        fields = [field for field in self.KIND_FIELDS[kind] if field in entry]
+
+        self.table.setRowCount(len(fields))
+        for row, field in enumerate(fields):
+            values = entry[field]
+            drift = values["drift_pct_per_30d"]
+            for column, text in enumerate(
+                (field, f"{values['latest']:.4g}", f"{values['median']:.4g}", f"{drift:+.1f}" if drift is not None else "–")
+            ):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self.table.resizeColumnsToContents()
+
+        current = self.field_combo.currentText()
+        with QSignalBlocker(self.field_combo):
+            self.field_combo.clear()
+            self.field_combo.addItems(fields)
+            if current in fields:
+                self.field_combo.setCurrentText(current)
+        self._load_trend(self.field_combo.currentText())
+
+    def _load_trend(self, field: str) -> None:
+        rig = self.rig_combo.currentText()
+        if not rig or not field:
+            self.trend_curve.setData([], [])
+            self.fit_curve.setData([], [])
+            self.trend_label.setText("No records for this selection.")
+            return
 
-        return {
-            "kp": kp,
-            "ki": ki,
-            "kd": kd,
-            "process_gain": process_gain,
-            "dead_time": dead_time,
-            "time_constant": time_constant,
-            "delta_temp": delta_temp,
-            "overshoot": overshoot,
-            "max_rate": max_rate,
-            "settling_time": settling_time,
-            "initial_temp": initial_temp,
-            "final_temp": final_temp,
-            "output_span": output_span,
-            "duration": duration,
-            "sample_count": sample_count,
-        }
+        kind, mode = self._series()
+        times, values = self.history.trend(rig, kind, field, mode=mode)
+        self.trend_curve.setData(times, values)
+        self.plot.setLabel("left", field)
+        if values.size >= 2 and np.ptp(times) > 0:
+            slope, intercept = np.polyfit(times, values, 1)
+            ends = np.array([times[0], times[-1]])
+            self.fit_curve.setData(ends, slope * ends + intercept)
+        else:
+            self.fit_curve.setData([], [])
+        self.trend_label.setText(f"{values.size} record(s) of {field}")
 
 
 class AutotuneWizardTab(QWidget):
@@ -789,6 +843,8 @@ class AutotuneWizardTab(QWidget):
     PERCENT_PER_DEGREE = 4.0
     MIN_STEP_PERCENT = 5.0
     MANUAL_STEP_SAFETY_FRACTION = 0.85
+    # The live plot shows at most this many points per line (strided).
+    MAX_PLOT_POINTS = 2000
 
     RESULT_FLOAT_FIELDS = (
         "kp",
@@ -832,6 +888,10 @@ class AutotuneWizardTab(QWidget):
         self._canvas: Optional[FigureCanvas] = None
         self._axes_temp = None
         self._axes_output = None
+        self._line_temp = None
+        self._line_output = None
+        self._plotted_count = 0
+        self._plot_bounds: Optional[List[float]] = None
         self._result_axes = None
         self._result_canvas: Optional[FigureCanvas] = None
         self._original_target: Optional[float] = None
@@ -848,6 +908,9 @@ class AutotuneWizardTab(QWidget):
         self._commanded_step_percent: Optional[float] = None
         self._reported_step_clamp = False
         self._commanded_direction: Optional[str] = None
+        self.relay_analyzer: Optional[RelayFeedbackAnalyzer] = None
+        self._relay_running = False
+        self._relay_swing = 0.0
 
         self._init_ui()
 
@@ -890,6 +953,12 @@ class AutotuneWizardTab(QWidget):
         config_group = QGroupBox("Oppsett for stegtest")
         config_layout = QFormLayout()
 
+        self.method_combo = QComboBox()
+        self.method_combo.addItem("Stegtest (firmware)", "step")
+        self.method_combo.addItem("Relé-tilbakekobling (raskere)", "relay")
+        self.method_combo.currentIndexChanged.connect(self._handle_method_changed)
+        config_layout.addRow("Metode:", self.method_combo)
+
         self.step_spin = QDoubleSpinBox()
         self.step_spin.setRange(0.5, 15.0)
         self.step_spin.setDecimals(1)
@@ -920,6 +989,18 @@ class AutotuneWizardTab(QWidget):
         self.percent_hint_label.setStyleSheet("color: #495057; font-size: 11px;")
         config_layout.addRow("Forklaring:", self.percent_hint_label)
 
+        self.relay_hysteresis_spin = QDoubleSpinBox()
+        self.relay_hysteresis_spin.setRange(0.05, 1.0)
+        self.relay_hysteresis_spin.setDecimals(2)
+        self.relay_hysteresis_spin.setSingleStep(0.05)
+        self.relay_hysteresis_spin.setSuffix(" °C")
+        self.relay_hysteresis_spin.setValue(DEFAULT_HYSTERESIS_C)
+        self.relay_hysteresis_spin.setToolTip(
+            "Reléet bytter når platen passerer målet ± hysterese. Stegstørrelsen er hvor langt målet flyttes."
+        )
+        self.relay_hysteresis_spin.setEnabled(False)
+        config_layout.addRow("Relé-hysterese:", self.relay_hysteresis_spin)
+
         config_group.setLayout(config_layout)
         vbox.addWidget(config_group)
 
@@ -1079,6 +1160,9 @@ class AutotuneWizardTab(QWidget):
         self._axes_output.set_xlabel("Tid [s]")
         self._axes_temp.grid(True, alpha=0.3)
         self._axes_output.grid(True, alpha=0.3)
+        # Persistent artists: updates only replace their data.
+        self._line_temp, = self._axes_temp.plot([], [], color="#ff6b35")
+        self._line_output, = self._axes_output.plot([], [], color="#1e90ff")
         layout.addWidget(self._canvas)
 
         buttons = QHBoxLayout()
@@ -1173,7 +1257,14 @@ class AutotuneWizardTab(QWidget):
         self.restart_button = QPushButton("Kjør på nytt")
         self.restart_button.clicked.connect(self.reset_wizard)
 
+        self.compare_button = QPushButton("Sammenlign kandidater")
+        self.compare_button.setToolTip(
+            "Simulerer mange PID-kombinasjoner på den identifiserte modellen før noe sendes til kontrolleren."
+        )
+        self.compare_button.clicked.connect(self.compare_candidates)
+
         buttons.addStretch()
+        buttons.addWidget(self.compare_button)
         buttons.addWidget(self.apply_button)
         buttons.addWidget(self.apply_cooling_button)
         buttons.addWidget(self.apply_both_button)
@@ -1196,6 +1287,11 @@ class AutotuneWizardTab(QWidget):
             QMessageBox.warning(self, "Ikke tilkoblet", "Koble til kontrolleren før du starter autotune.")
             return
 
+        if self.method_combo.currentData() == "relay":
+            self._start_relay_sequence()
+            return
+
+        self.relay_analyzer = None
         self.analyzer.reset()
         self.collecting = True
         self._last_plot_update = 0.0
@@ -1353,6 +1449,7 @@ class AutotuneWizardTab(QWidget):
         if self.collecting:
             self.parent.log("⛔ Autotune wizard avbrutt", "warning")
         self.collecting = False
+        self._relay_running = False
         if self._autotune_command_sent:
             if self.parent.send_asymmetric_command("abort_asymmetric_autotune", {}):
                 self.parent.log("⛔ Firmware-autotune avbrutt fra wizard", "warning")
@@ -1366,7 +1463,10 @@ class AutotuneWizardTab(QWidget):
         self.stack.setCurrentIndex(0)
 
     def complete_measurement(self) -> None:
-        results = self.analyzer.compute_results()
+        if self._relay_running and self.relay_analyzer is not None:
+            results = self.relay_analyzer.compute_results()
+        else:
+            results = self.analyzer.compute_results()
         if not results:
             QMessageBox.information(
                 self,
@@ -1376,11 +1476,13 @@ class AutotuneWizardTab(QWidget):
             return
 
         self.collecting = False
+        self._relay_running = False
         self._present_results(results)
 
     def reset_wizard(self) -> None:
         self.stack.setCurrentIndex(0)
         self.collecting = False
+        self._relay_running = False
         self._autotune_command_sent = False
         self._expected_delta = None
         self._commanded_step_percent = None
@@ -1485,11 +1587,116 @@ class AutotuneWizardTab(QWidget):
         self.parent.asymmetric_controls.kd_cooling_input.setText(f"{cool_kd:.3f}")
         self.parent.asymmetric_controls.set_cooling_pid()
 
+    def _identified_plant(self, mode: str) -> Optional[Tuple[float, float, float]]:
+        """Gain (°C per %), time constant and dead time for *mode*, if identified."""
+
+        payload = self._latest_results_payload
+        extras = payload.get("extras") or {}
+        gain = payload.get(f"{mode}_process_gain")
+        time_constant = payload.get(f"{mode}_time_constant")
+        dead_time = payload.get(f"{mode}_dead_time")
+        if gain is None or time_constant is None:
+            # The wizard's own analysis yields one step response for either mode.
+            gain = self._coerce_float(extras.get("process_gain"))
+            time_constant = self._coerce_float(extras.get("time_constant"))
+            dead_time = self._coerce_float(extras.get("dead_time"))
+        if not gain or not time_constant or time_constant <= 0:
+            return None
+        return abs(gain) / 100.0, time_constant, max(0.0, dead_time or 0.0)
+
+    def compare_candidates(self) -> None:
+        latest_data = getattr(self.parent, "last_status_data", {}) or {}
+        pid = PIDParameters.from_status(latest_data)
+        extras = self._latest_results_payload.get("extras") or {}
+        baseline = self._coerce_float(self._latest_results_payload.get("baseline_temp"))
+        if baseline is None:
+            baseline = self._coerce_float(extras.get("initial_temp"))
+        if baseline is None:
+            baseline = self._coerce_float(getattr(self.parent, "current_plate_temp", None))
+        if baseline is None:
+            QMessageBox.information(self, "Mangler data", "Ingen baseline-temperatur er tilgjengelig for simuleringen.")
+            return
+
+        cooling_autotune = self._latest_cooling_pid
+        references = {
+            "heating": {
+                "autotune": (self.kp_spin.value(), self.ki_spin.value(), self.kd_spin.value()),
+                "nåværende": (pid.kp_heating, pid.ki_heating, pid.kd_heating),
+            },
+            "cooling": {
+                "nåværende": (pid.kp_cooling, pid.ki_cooling, pid.kd_cooling),
+            },
+        }
+        if all(value is not None for value in cooling_autotune):
+            references["cooling"]["autotune"] = cooling_autotune
+
+        candidates: List[GainCandidate] = []
+        summary_lines: List[str] = []
+        for mode, limits, label in (
+            ("heating", self.HEATING_LIMITS, "Varme"),
+            ("cooling", self.COOLING_LIMITS, "Kjøling"),
+        ):
+            plant_values = self._identified_plant(mode)
+            if plant_values is None:
+                summary_lines.append(f"{label}: ingen identifisert modell.")
+                continue
+            gain, time_constant, dead_time = plant_values
+            try:
+                plant = plant_from_fopdt(gain, time_constant, dead_time, baseline)
+                result = search_gains(
+                    plant, mode=mode, step=self.step_spin.value(), pid=pid, limits=limits, extra=references[mode]
+                )
+            except ValueError as exc:
+                summary_lines.append(f"{label}: simulering feilet ({exc}).")
+                continue
+
+            candidates.extend(result.pareto)
+            candidates.extend(
+                candidate for candidate in result.candidates
+                if candidate.source != "grid" and candidate not in result.pareto
+            )
+            summary_lines.append(
+                f"{label}: {len(result.candidates)} kandidater simulert på K {gain * 100.0:.2f} °C/100 %, "
+                f"T {time_constant:.0f} s, L {dead_time:.0f} s – {len(result.pareto)} på Pareto-fronten "
+                f"({result.elapsed_s:.1f} s)."
+            )
+
+        if not candidates:
+            QMessageBox.information(self, "Ingen kandidater", "\n".join(summary_lines))
+            return
+
+        summary_lines.append("Rangert etter IAE; grå rader er autotune-forslaget og nåværende verdier.")
+        dialog = GainComparisonDialog(candidates, "\n".join(summary_lines), self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        chosen = dialog.selected_candidate()
+        if chosen is None:
+            return
+
+        if chosen.mode == "heating":
+            self.kp_spin.setValue(chosen.kp)
+            self.ki_spin.setValue(chosen.ki)
+            self.kd_spin.setValue(chosen.kd)
+            label = "varme"
+        else:
+            # Used by "Aktiver begge", like the firmware's cooling recommendation.
+            self._latest_cooling_pid = (chosen.kp, chosen.ki, chosen.kd)
+            label = "kjøle"
+        self.parent.log(
+            f"🔎 Valgt {label}-kandidat: Kp {chosen.kp:.3f}, Ki {chosen.ki:.4f}, Kd {chosen.kd:.3f} "
+            f"(IAE {chosen.iae:.0f} °C·s, overshoot {chosen.overshoot:.2f} °C)",
+            "info",
+        )
+
     def receive_data(self, data: Dict[str, Any]) -> None:
         direction = str(self.direction_combo.currentData() or "heating")
         limits = self._recommended_step_percent(self.step_spin.value(), direction)
         self._update_percent_hint(self.step_percent_spin.value(), limits)
 
+        if self._relay_running:
+            self._handle_relay_sample(data)
+            return
+
         if self._autotune_command_sent:
             status_raw = str(data.get("autotune_status", "")).strip()
             if status_raw:
@@ -1569,13 +1776,22 @@ class AutotuneWizardTab(QWidget):
             metrics = self.analyzer.compute_results()
             if metrics:
                 normalized = self._normalize_results(metrics)
-                self.metric_label.setText(
-                    "ΔT: {delta} °C  |  Hastighet: {rate} °C/s  |  Overshoot: {overshoot} °C".format(
-                        delta=self._format_number(normalized.get("delta_temp"), 2),
-                        rate=self._format_number(normalized.get("max_rate"), 3),
-                        overshoot=self._format_number(normalized.get("overshoot"), 2),
-                    )
+                metric_text = "ΔT: {delta} °C  |  Hastighet: {rate} °C/s  |  Overshoot: {overshoot} °C".format(
+                    delta=self._format_number(normalized.get("delta_temp"), 2),
+                    rate=self._format_number(normalized.get("max_rate"), 3),
+                    overshoot=self._format_number(normalized.get("overshoot"), 2),
                 )
+                if metrics.get("identification") == "fopdt_ls":
+                    metric_text += (
+                        "\nModell: L {dead} ± {dead_ci} s  |  T {tau} ± {tau_ci} s  |  R² {r2}".format(
+                            dead=self._format_number(metrics.get("dead_time"), 1),
+                            dead_ci=self._format_number(metrics.get("fit_dead_time_ci"), 1),
+                            tau=self._format_number(metrics.get("time_constant"), 1),
+                            tau_ci=self._format_number(metrics.get("fit_time_constant_ci"), 1),
+                            r2=self._format_number(metrics.get("fit_r_squared"), 3),
+                        )
+                    )
+                self.metric_label.setText(metric_text)
 
                 if not self._autotune_command_sent:
                     self.finish_button.setEnabled(True)
@@ -1607,37 +1823,154 @@ class AutotuneWizardTab(QWidget):
                     self.finish_button.setEnabled(False)
 
     def _update_collect_plot(self) -> None:
-        if not self._canvas:
+        if not self._canvas or self._line_temp is None:
             return
 
-        self._axes_temp.clear()
-        self._axes_output.clear()
-        self._axes_temp.set_ylabel("Temp [°C]")
-        self._axes_output.set_ylabel("PID [%]")
-        self._axes_output.set_xlabel("Tid [s]")
-        self._axes_temp.grid(True, alpha=0.3)
-        self._axes_output.grid(True, alpha=0.3)
+        analyzer = self._plot_analyzer()
+        count = len(analyzer.timestamps)
+        if count == 0:
+            return
+
+        # Running min/max over the samples added since the last update keep
+        # the axis limits exact without rescanning the history.
+        start = min(self._plotted_count, count)
+        new_temps = analyzer.temperatures[start:]
+        new_outputs = analyzer.outputs[start:]
+        if new_temps:
+            bounds = [min(new_temps), max(new_temps), min(new_outputs), max(new_outputs)]
+            if self._plot_bounds is not None:
+                bounds = [
+                    min(bounds[0], self._plot_bounds[0]), max(bounds[1], self._plot_bounds[1]),
+                    min(bounds[2], self._plot_bounds[2]), max(bounds[3], self._plot_bounds[3]),
+                ]
+            self._plot_bounds = bounds
+        self._plotted_count = count
+
+        # Stride long runs so the drawn path stays bounded; keep the newest sample.
+        stride = -(-count // self.MAX_PLOT_POINTS)
+        times = analyzer.timestamps[::stride]
+        temps = analyzer.temperatures[::stride]
+        outputs = analyzer.outputs[::stride]
+        if (count - 1) % stride:
+            times.append(analyzer.timestamps[-1])
+            temps.append(analyzer.temperatures[-1])
+            outputs.append(analyzer.outputs[-1])
+        self._line_temp.set_data(times, temps)
+        self._line_output.set_data(times, outputs)
+
+        temp_min, temp_max, output_min, output_max = self._plot_bounds
+        temp_margin = max((temp_max - temp_min) * 0.1, 0.2)
+        output_margin = max((output_max - output_min) * 0.1, 5.0)
+        self._axes_temp.set_xlim(0.0, max(times[-1], 1.0))
+        self._axes_temp.set_ylim(temp_min - temp_margin, temp_max + temp_margin)
+        self._axes_output.set_ylim(output_min - output_margin, output_max + output_margin)
+        self._canvas.draw_idle()
+
+    def _plot_analyzer(self) -> Union[AutotuneDataAnalyzer, RelayFeedbackAnalyzer]:
+        """Analyzer of the latest run (relay or step) whose samples are plotted."""
+
+        return self.relay_analyzer if self.relay_analyzer is not None else self.analyzer
+
+    def _start_relay_sequence(self) -> None:
+        plate_temp = self.parent.current_plate_temp
+        if plate_temp is None or math.isnan(plate_temp):
+            QMessageBox.warning(self, "Ingen data", "Ingen temperaturdata er tilgjengelig ennå. Vent på statusoppdatering før du starter.")
+            return
+        if not getattr(self.parent, "pid_running", False):
+            QMessageBox.warning(
+                self,
+                "PID er av",
+                "Relé-autotune styrer målet og krever at PID-regulatoren kjører. Start PID før du fortsetter.",
+            )
+            return
+
+        target_temp = self.parent.current_target_temp
+        if target_temp is None or math.isnan(target_temp):
+            target_temp = plate_temp
+
+        try:
+            self.relay_analyzer = RelayFeedbackAnalyzer(
+                target_temp, hysteresis=self.relay_hysteresis_spin.value()
+            )
+        except ValueError as exc:
+            QMessageBox.warning(self, "Ugyldig oppsett", str(exc))
+            return
+
+        self._original_target = target_temp
+        self._relay_swing = self.step_spin.value()
+        self._relay_running = True
+        self.collecting = True
+        self._last_plot_update = 0.0
+        self._clear_plots()
+        self.collect_status.setText("Relé-autotune kjører – venter på stabile svingninger...")
+        self.collect_status.setStyleSheet("color: #17a2b8; font-weight: bold;")
+        self.metric_label.setText("Sykluser: 0  |  Pu: –  |  Ku: –")
+        self.finish_button.setEnabled(False)
+        self.stack.setCurrentIndex(1)
+        self.parent.log(
+            f"🎯 Relé-autotune startet rundt {target_temp:.1f} °C "
+            f"(mål ±{self._relay_swing:.1f} °C, hysterese {self.relay_analyzer.hysteresis:.2f} °C)",
+            "info",
+        )
 
-        self._axes_temp.plot(self.analyzer.timestamps, self.analyzer.temperatures, color="#ff6b35")
-        self._axes_output.plot(self.analyzer.timestamps, self.analyzer.outputs, color="#1e90ff")
-        self._canvas.draw()
+    def _handle_relay_sample(self, data: Dict[str, Any]) -> None:
+        analyzer = self.relay_analyzer
+        if analyzer is None or "cooling_plate_temp" not in data or "pid_output" not in data:
+            return
+        try:
+            temp = float(data["cooling_plate_temp"])
+            output = float(data["pid_output"])
+        except (TypeError, ValueError):
+            return
+
+        if analyzer.add_sample(time.time(), temp, output):
+            offset = self._relay_swing if analyzer.relay_high else -self._relay_swing
+            self.parent.send_target_temperature(analyzer.center + offset, source="relé-autotune", silent=True)
+
+        now = time.time()
+        if now - self._last_plot_update > 0.5:
+            self._last_plot_update = now
+            self._update_collect_plot()
+
+        results = analyzer.compute_results()
+        if results is None:
+            self.metric_label.setText(
+                f"Sykluser: {analyzer.completed_cycles}  |  venter på minst to hele perioder"
+            )
+            return
+
+        self.metric_label.setText(
+            "Sykluser: {cycles}  |  Pu: {period} s  |  Ku: {gain} (100 %)/°C  |  Amplitude: {amplitude} °C".format(
+                cycles=results["cycles"],
+                period=self._format_number(results["ultimate_period"], 1),
+                gain=self._format_number(results["ultimate_gain"], 2),
+                amplitude=self._format_number(results["oscillation_amplitude"], 2),
+            )
+        )
+        self.finish_button.setEnabled(True)
+        if results["stable"]:
+            self.collect_status.setText("Stabile svingninger - analyserer...")
+            self.collect_status.setStyleSheet("color: #28a745; font-weight: bold;")
+            self.collecting = False
+            self._relay_running = False
+            self._present_results(results)
 
     def _clear_plots(self) -> None:
-        if self._axes_temp is not None:
-            self._axes_temp.clear()
-            self._axes_temp.set_ylabel("Temp [°C]")
-            self._axes_temp.grid(True, alpha=0.3)
-        if self._axes_output is not None:
-            self._axes_output.clear()
-            self._axes_output.set_ylabel("PID [%]")
-            self._axes_output.set_xlabel("Tid [s]")
-            self._axes_output.grid(True, alpha=0.3)
+        self._plotted_count = 0
+        self._plot_bounds = None
+        if self._line_temp is not None:
+            self._line_temp.set_data([], [])
+        if self._line_output is not None:
+            self._line_output.set_data([], [])
         if self._canvas is not None:
-            self._canvas.draw()
+            self._canvas.draw_idle()
 
     def _present_results(self, results: Dict[str, Any]) -> None:
         normalized = self._normalize_results(results)
         self._latest_results_payload = dict(normalized)
+        self.parent.record_tuning_history(
+            "autotune", normalized, source=str(results.get("identification") or "firmware")
+        )
         if isinstance(normalized.get("extras"), dict):
             self._latest_results_payload["extras"] = dict(normalized["extras"])
 
@@ -1780,10 +2113,11 @@ class AutotuneWizardTab(QWidget):
             self._result_axes.set_xlabel("Tid [s]")
             self._result_axes.set_ylabel("Temp [°C]")
             self._result_axes.grid(True, alpha=0.3)
-            if self.analyzer.timestamps and self.analyzer.temperatures:
+            analyzer = self._plot_analyzer()
+            if analyzer.timestamps and analyzer.temperatures:
                 self._result_axes.plot(
-                    self.analyzer.timestamps,
-                    self.analyzer.temperatures,
+                    analyzer.timestamps,
+                    analyzer.temperatures,
                     color="#ff6b35",
                     label="Plate temp",
                 )
@@ -1907,6 +2241,12 @@ class AutotuneWizardTab(QWidget):
         limits = self._recommended_step_percent(self.step_spin.value(), str(direction))
         self._update_percent_hint(value, limits)
 
+    def _handle_method_changed(self, index: int) -> None:
+        relay = self.method_combo.itemData(index) == "relay"
+        self.direction_combo.setEnabled(not relay)
+        self.step_percent_spin.setEnabled(not relay)
+        self.relay_hysteresis_spin.setEnabled(relay)
+
     def _handle_direction_changed(self, index: int) -> None:
         direction = self.direction_combo.itemData(index) or "heating"
         limits = self._recommended_step_percent(self.step_spin.value(), str(direction))
@@ -2044,6 +2384,10 @@ class MatplotlibGraphWidget(QWidget):
                                                label='Cooling Plate', alpha=0.8)
             self.line_rectal, = self.ax_temp.plot([], [], 'g-s', linewidth=3, markersize=4,
                                                 label='Rectal Probe', alpha=0.8)
+            self.line_plate_filtered, = self.ax_temp.plot([], [], color='#7f0000', linewidth=1.5,
+                                                        label='Plate (filtered)', alpha=0.9)
+            self.line_rectal_filtered, = self.ax_temp.plot([], [], color='#004d00', linewidth=1.5,
+                                                         label='Rectal (filtered)', alpha=0.9)
             self.line_target, = self.ax_temp.plot([], [], 'b--', linewidth=2,
                                                 label='Target', alpha=0.7)
             self.line_rectal_setpoint, = self.ax_temp.plot([], [], 'k-.', linewidth=2,
@@ -2125,6 +2469,10 @@ class MatplotlibGraphWidget(QWidget):
                 self.line_plate.set_data(time_data, graph_data["plate_temp"])
             if "rectal_temp" in graph_data:
                 self.line_rectal.set_data(time_data, graph_data["rectal_temp"])
+            if "plate_temp_filtered" in graph_data:
+                self.line_plate_filtered.set_data(time_data, graph_data["plate_temp_filtered"])
+            if "rectal_temp_filtered" in graph_data:
+                self.line_rectal_filtered.set_data(time_data, graph_data["rectal_temp_filtered"])
             if "target_temp" in graph_data:
                 self.line_target.set_data(time_data, graph_data["target_temp"])
             if "rectal_target_temp" in graph_data:
@@ -2220,6 +2568,8 @@ class MatplotlibGraphWidget(QWidget):
         try:
             self.line_plate.set_data([], [])
             self.line_rectal.set_data([], [])
+            self.line_plate_filtered.set_data([], [])
+            self.line_rectal_filtered.set_data([], [])
             self.line_target.set_data([], [])
             self.line_rectal_setpoint.set_data([], [])
             self.line_adjusted_target.set_data([], [])
@@ -2243,6 +2593,8 @@ class MatplotlibGraphWidget(QWidget):
             times = list(range(50))
             plate_temps = [37 - 15 * (1 - math.exp(-t/20)) + math.sin(t/5) * 0.8 for t in times]
             rectal_temps = [37 - 8 * (1 - math.exp(-t/30)) + math.sin(t/8) * 0.5 for t in times]
+            plate_filtered = [37 - 15 * (1 - math.exp(-t/20)) for t in times]
+            rectal_filtered = [37 - 8 * (1 - math.exp(-t/30)) for t in times]
             target_temps = [25 + 5 * math.sin(t/15) for t in times]
             rectal_targets = [
                 32.0 if t < 20 else 30.0 if t < 35 else 36.0 for t in times
@@ -2255,6 +2607,8 @@ class MatplotlibGraphWidget(QWidget):
                 "time": times,
                 "plate_temp": plate_temps,
                 "rectal_temp": rectal_temps,
+                "plate_temp_filtered": plate_filtered,
+                "rectal_temp_filtered": rectal_filtered,
                 "target_temp": target_temps,
                 "rectal_target_temp": rectal_targets,
                 "adjusted_target_temp": adjusted_targets,
@@ -2268,6 +2622,8 @@ class MatplotlibGraphWidget(QWidget):
                 "time": [],
                 "plate_temp": [],
                 "rectal_temp": [],
+                "plate_temp_filtered": [],
+                "rectal_temp_filtered": [],
                 "target_temp": [],
                 "rectal_target_temp": [],
                 "adjusted_target_temp": [],
@@ -2333,6 +2689,9 @@ class MatplotlibGraphWidget(QWidget):
 
 class MainWindow(QMainWindow):
     """Main application window"""
+
+    # Profile load errors listed in the log and the warning dialog.
+    MAX_SHOWN_ISSUES = 10
     
     def __init__(self):
         super().__init__()
@@ -2364,6 +2723,8 @@ class MainWindow(QMainWindow):
             "time": [],
             "plate_temp": [],
             "rectal_temp": [],
+            "plate_temp_filtered": [],
+            "rectal_temp_filtered": [],
             "pid_output": [],
             "breath_rate": [],
             "target_temp": [],
@@ -2372,7 +2733,8 @@ class MainWindow(QMainWindow):
         }
 
         self.connection_established = False
-        self.data_logger: Optional[Logger] = None
+        self.session_writer: Optional[SessionWriter] = None
+        self.data_logger: Optional[SessionDataView] = None
         self.data_logger_flush_timer: Optional[QTimer] = None
         self.start_time = None
         self.max_graph_points = 200
@@ -2384,6 +2746,10 @@ class MainWindow(QMainWindow):
         self.last_equilibrium_valid: bool = False
         self.equilibrium_estimating: bool = False
         self.equilibrium_comp_enabled: bool = False
+        # Host-side equilibrium prediction from live telemetry.
+        self.equilibrium_tracker = EquilibriumTracker()
+        self.equilibrium_refreshed_at: float = 0.0
+        self.equilibrium_converged = {"plate": False, "rectal": False}
         self.failsafe_active: bool = False
         self.last_failsafe_reason: str = ""
         self.panic_active: bool = False
@@ -2397,6 +2763,14 @@ class MainWindow(QMainWindow):
         self.profile_active = False
         self.profile_paused = False
         self.rectal_setpoint_schedule: List[Tuple[float, float, float]] = []
+        self.profile_timeline: Optional[ProfileTimeline] = None
+        self.profile_streamer: Optional[ProfileStreamer] = None
+        # Points as loaded, kept while a simplified version is active.
+        self.profile_original_points: Optional[List[Dict[str, Any]]] = None
+        self.profile_source_name: str = ""
+        self.profile_compiled: Optional[CompiledProfile] = None
+        # Dry-run prediction for the profile currently in the preview.
+        self.profile_simulation: Optional[SimulationResult] = None
         self.profile_run_start_time: Optional[float] = None
         self.profile_pause_time: Optional[float] = None
         self.profile_elapsed_paused: float = 0.0
@@ -2404,6 +2778,9 @@ class MainWindow(QMainWindow):
         self.current_target_temp: Optional[float] = None
         self.pid_mode: Optional[str] = None
         self.pid_running: bool = False
+        # Tracking quality for the running session, stored when it closes.
+        self.control_metrics = ControlQualityMetrics()
+        self.control_metrics_refreshed_at: float = 0.0
         self.last_status_data: Dict[str, Any] = {}
         self.serial_monitor_tx_lines: List[str] = []
         self.serial_monitor_rx_lines: List[str] = []
@@ -2423,6 +2800,7 @@ class MainWindow(QMainWindow):
         self.last_rate_limit_message: str = ""
         self.last_rate_limit_message_at: float = 0.0
         self.operator_name: str = os.getenv("USER", "GUI")
+        self.rig_name: str = os.getenv("MUSEHYPOTHERMI_RIG", platform.node() or "rig")
 
         print("✅ Data structures initialized")
 
@@ -2469,6 +2847,8 @@ class MainWindow(QMainWindow):
             cmd = {"CMD": {"action": command, "params": params}}
             self.serial_manager.send(json.dumps(cmd))
             self.event_logger.log_event(f"ASYMMETRIC_CMD: {command} → {params}")
+            if command in GAIN_COMMANDS:
+                self.record_tuning_history("gains", params, mode=GAIN_COMMANDS[command])
             return True
         except Exception as e:
             self.log(f"❌ Asymmetric command error: {e}", "error")
@@ -2705,6 +3085,23 @@ class MainWindow(QMainWindow):
         status_layout.addWidget(self.temperatureRateValue, 1, 1)
         status_layout.addWidget(QLabel("Emergency:"), 2, 0)
         status_layout.addWidget(self.emergencyStateValue, 2, 1)
+
+        self.hostPlateEquilibriumValue = QLabel("--")
+        self.hostPlateEquilibriumValue.setStyleSheet("font-weight: bold; color: #6c757d;")
+        self.hostPlateEquilibriumValue.setToolTip("Host prediction while the output is passive (95 % band)")
+        self.hostRectalEquilibriumValue = QLabel("--")
+        self.hostRectalEquilibriumValue.setStyleSheet("font-weight: bold; color: #6c757d;")
+        self.hostRectalEquilibriumValue.setToolTip("Host prediction since the last setpoint change (95 % band)")
+        status_layout.addWidget(QLabel("Plate Equilibrium:"), 3, 0)
+        status_layout.addWidget(self.hostPlateEquilibriumValue, 3, 1)
+        status_layout.addWidget(QLabel("Rectal Equilibrium:"), 4, 0)
+        status_layout.addWidget(self.hostRectalEquilibriumValue, 4, 1)
+
+        self.earlyWarningValue = QLabel("✅ None")
+        self.earlyWarningValue.setStyleSheet("font-weight: bold; color: #28a745;")
+        self.earlyWarningValue.setToolTip("Forecast time until a safety threshold is crossed")
+        status_layout.addWidget(QLabel("Early Warning:"), 5, 0)
+        status_layout.addWidget(self.earlyWarningValue, 5, 1)
         status_layout.setColumnStretch(1, 1)
         status_layout.setHorizontalSpacing(12)
 
@@ -2823,6 +3220,12 @@ class MainWindow(QMainWindow):
         data_layout.addWidget(self.pidOutputDisplay, 5, 1)
         data_layout.addWidget(QLabel("🫁 Breath Rate:"), 6, 0)
         data_layout.addWidget(self.breathRateDisplay, 6, 1)
+
+        self.filteredTempDisplay = QLabel("–")
+        self.filteredTempDisplay.setStyleSheet("font-family: 'Courier New'; font-size: 11px; color: #495057;")
+        self.filteredTempDisplay.setToolTip("Alpha-beta filtered temperature and rate")
+        data_layout.addWidget(QLabel("📉 Filtered:"), 7, 0)
+        data_layout.addWidget(self.filteredTempDisplay, 7, 1)
         
         data_group.setLayout(data_layout)
         layout.addWidget(data_group)
@@ -2851,6 +3254,40 @@ class MainWindow(QMainWindow):
         params_group.setLayout(params_layout)
         layout.addWidget(params_group)
 
+        # Control quality
+        quality_group = QGroupBox("📏 Control Quality")
+        quality_layout = QFormLayout()
+
+        self.qualityTrackingLabel = QLabel("-")
+        self.qualityStepLabel = QLabel("-")
+        self.qualityStepsLabel = QLabel("-")
+        self.qualitySaturationLabel = QLabel("-")
+        self.qualityModeSwitchLabel = QLabel("-")
+        for label in (
+            self.qualityTrackingLabel,
+            self.qualityStepLabel,
+            self.qualityStepsLabel,
+            self.qualitySaturationLabel,
+            self.qualityModeSwitchLabel,
+        ):
+            label.setStyleSheet("font-family: 'Courier New'; font-size: 11px;")
+            label.setWordWrap(True)
+            label.setMinimumWidth(260)
+
+        self.resetQualityButton = QPushButton("Reset")
+        self.resetQualityButton.setToolTip("Store the current metrics in the session and start over")
+        self.resetQualityButton.clicked.connect(self.reset_control_metrics)
+
+        quality_layout.addRow("Tracking:", self.qualityTrackingLabel)
+        quality_layout.addRow("Last Step:", self.qualityStepLabel)
+        quality_layout.addRow("Setpoint Steps:", self.qualityStepsLabel)
+        quality_layout.addRow("Saturation:", self.qualitySaturationLabel)
+        quality_layout.addRow("Mode Switches:", self.qualityModeSwitchLabel)
+        quality_layout.addRow("", self.resetQualityButton)
+
+        quality_group.setLayout(quality_layout)
+        layout.addWidget(quality_group)
+
         # System utilities now resides beneath parameters
         advanced_group = QGroupBox("System Utilities")
         advanced_layout = QGridLayout()
@@ -2884,6 +3321,10 @@ class MainWindow(QMainWindow):
         self.clearFailsafeButton.clicked.connect(self.clear_failsafe)
         self.clearFailsafeButton.setStyleSheet("background-color: #fd7e14; color: white; font-weight: bold;")
 
+        self.tuningHistoryButton = QPushButton("Tuning History")
+        self.tuningHistoryButton.setMinimumWidth(120)
+        self.tuningHistoryButton.clicked.connect(self.show_tuning_history)
+
         self.disableBreathCheckBox = QCheckBox("Disable breath-stop check")
         self.disableBreathCheckBox.setToolTip("Ignore 'no_breathing_detected' failsafes (for testing only)")
         self.disableBreathCheckBox.stateChanged.connect(self.toggle_breath_check)
@@ -2894,7 +3335,8 @@ class MainWindow(QMainWindow):
         advanced_layout.addWidget(self.saveEEPROMButton, 1, 1)
         advanced_layout.addWidget(self.requestStatusButton, 2, 0)
         advanced_layout.addWidget(self.clearFailsafeButton, 2, 1)
-        advanced_layout.addWidget(self.disableBreathCheckBox, 3, 0, 1, 2)
+        advanced_layout.addWidget(self.tuningHistoryButton, 3, 0)
+        advanced_layout.addWidget(self.disableBreathCheckBox, 4, 0, 1, 2)
 
         advanced_group.setLayout(advanced_layout)
         layout.addWidget(advanced_group)
@@ -2975,11 +3417,51 @@ class MainWindow(QMainWindow):
         load_layout.addWidget(self.profileFileLabel)
         load_layout.addStretch()
 
+        # Error-bounded simplification of dense profiles
+        load_layout.addWidget(QLabel("Max steps:"))
+        self.simplifyMaxStepsSpin = QSpinBox()
+        self.simplifyMaxStepsSpin.setRange(2, 500)
+        self.simplifyMaxStepsSpin.setValue(MAX_CONTROLLER_STEPS)
+        load_layout.addWidget(self.simplifyMaxStepsSpin)
+
+        load_layout.addWidget(QLabel("Max deviation:"))
+        self.simplifyToleranceSpin = QDoubleSpinBox()
+        self.simplifyToleranceSpin.setRange(0.01, 5.0)
+        self.simplifyToleranceSpin.setDecimals(2)
+        self.simplifyToleranceSpin.setSingleStep(0.05)
+        self.simplifyToleranceSpin.setValue(0.1)
+        self.simplifyToleranceSpin.setSuffix(" °C")
+        load_layout.addWidget(self.simplifyToleranceSpin)
+
+        self.simplifyProfileButton = QPushButton("✂️ Simplify")
+        self.simplifyProfileButton.clicked.connect(self.simplify_profile)
+        self.simplifyProfileButton.setEnabled(False)
+        load_layout.addWidget(self.simplifyProfileButton)
+
+        self.profileSimplifyLabel = QLabel("")
+        self.profileSimplifyLabel.setStyleSheet("color: #6c757d;")
+        load_layout.addWidget(self.profileSimplifyLabel)
+
         load_group.setLayout(load_layout)
         profile_layout.addWidget(load_group)
 
         preview_group = QGroupBox("🔎 Profile Preview")
         preview_layout = QVBoxLayout()
+
+        simulate_layout = QHBoxLayout()
+        self.simulateProfileButton = QPushButton("🧪 Simulate")
+        self.simulateProfileButton.setToolTip(
+            "Dry-run the profile against the thermal plant model using the controller's PID settings"
+        )
+        self.simulateProfileButton.clicked.connect(self.simulate_profile)
+        self.simulateProfileButton.setEnabled(False)
+        simulate_layout.addWidget(self.simulateProfileButton)
+        self.profileSimulationLabel = QLabel("")
+        self.profileSimulationLabel.setStyleSheet("color: #6c757d;")
+        simulate_layout.addWidget(self.profileSimulationLabel)
+        simulate_layout.addStretch()
+        preview_layout.addLayout(simulate_layout)
+
         self.profilePreviewPlot = pg.PlotWidget()
         self.profilePreviewPlot.addLegend()
         self.profilePreviewPlot.showGrid(x=True, y=True, alpha=0.3)
@@ -3493,14 +3975,28 @@ class MainWindow(QMainWindow):
                 lambda line: self.on_serial_line("TX", line)
             )
             self.serial_manager.failsafe_triggered.connect(self.on_pc_failsafe_triggered)
+            # Filtered temperatures and rates are added in the reader thread.
+            self.telemetry_filter = TelemetryFilter()
+            self.serial_manager.add_payload_processor(self.telemetry_filter)
+            # Threshold forecasts use the filtered state, so register after it.
+            self.early_warning_monitor = EarlyWarningMonitor()
+            self.serial_manager.add_payload_processor(self.early_warning_monitor)
             print("✅ SerialManager initialized")
 
-            # Event logger
-            self.event_logger = EventLogger("gui_v3_events")
-            print("✅ EventLogger initialized")
+            # Session writer: one ordered stream for data, events and comments.
+            # The event view owns the session and closes it on shutdown.
+            self.session_writer = SessionWriter(
+                "gui_session",
+                metadata={"operator": self.operator_name, "rig": self.rig_name},
+                on_close=self._catalog_session,
+            )
+            self.event_logger = self.session_writer.event_view(owns_session=True)
+            print("✅ Session writer initialized")
             
             # Profile loader
             self.profile_loader = ProfileLoader(event_logger=self.event_logger)
+            self.profile_cache = ProfileCache(max_entries=16)
+            self.profile_sync = ProfileSync()
             print("✅ ProfileLoader initialized")
 
             # Status timer
@@ -3530,6 +4026,60 @@ class MainWindow(QMainWindow):
 
     # ====== CORE FUNCTIONALITY ======
 
+    def _catalog_session(self, session: SessionWriter):
+        """Index a closed session in the local session catalogue."""
+
+        catalog = None
+        try:
+            catalog = SessionCatalog()
+            target = session.filename_csv
+            if not os.path.exists(target):
+                target = session.filename_journal
+            catalog.index_session(target)
+        except Exception as exc:
+            print(f"⚠️ Could not catalogue session: {exc}")
+        finally:
+            if catalog is not None:
+                catalog.close()
+
+    def record_tuning_history(
+        self, kind: str, values: Dict[str, Any], mode: Optional[str] = None, source: Optional[str] = None
+    ):
+        """Add an autotune result, applied gain set or control-quality record to the tuning history."""
+
+        history = None
+        try:
+            history = TuningHistory()
+            session = getattr(getattr(self, "session_writer", None), "filename_csv", None)
+            if kind == "autotune":
+                history.record_autotune(self.rig_name, values, source=source, session=session)
+            elif kind == "gains":
+                history.record_gains(
+                    self.rig_name, mode, float(values["kp"]), float(values["ki"]), float(values["kd"]),
+                    session=session,
+                )
+            else:
+                history.record_control_metrics(self.rig_name, values, session=session)
+        except Exception as exc:
+            print(f"⚠️ Could not record tuning history: {exc}")
+        finally:
+            if history is not None:
+                history.close()
+
+    def show_tuning_history(self):
+        """Open the cross-session tuning history view."""
+
+        history = None
+        try:
+            history = TuningHistory()
+            dialog = TuningHistoryDialog(history, rig=self.rig_name, parent=self)
+            dialog.exec()
+        except Exception as exc:
+            self.log(f"❌ Could not open tuning history: {exc}", "error")
+        finally:
+            if history is not None:
+                history.close()
+
     def _start_data_logger(self):
         """Start a new data logger for experiment runs."""
         if not self.connection_established:
@@ -3546,7 +4096,7 @@ class MainWindow(QMainWindow):
                 "port": getattr(self.serial_manager, "port", "unknown"),
                 "session_start": time.strftime("%Y-%m-%d %H:%M:%S"),
             }
-            self.data_logger = Logger("gui_experiment", metadata=metadata)
+            self.data_logger = self.session_writer.data_view(metadata=metadata)
             self.log("📝 Data logger started", "info")
         except Exception as exc:
             self.data_logger = None
@@ -3557,6 +4107,7 @@ class MainWindow(QMainWindow):
         if self.data_logger is None:
             return
 
+        self._log_control_metrics()
         try:
             self.data_logger.close()
             self.log("🛑 Data logger stopped", "info")
@@ -3565,6 +4116,205 @@ class MainWindow(QMainWindow):
         finally:
             self.data_logger = None
 
+    def update_control_metrics(self, data: Dict[str, Any]):
+        """Feed one status frame to the control-quality metrics."""
+        if "cooling_plate_temp" not in data or "plate_target_active" not in data:
+            return
+
+        def optional_float(key: str) -> Optional[float]:
+            value = data.get(key)
+            if value is None:
+                return None
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+
+        try:
+            plate = float(data["cooling_plate_temp"])
+            target = float(data["plate_target_active"])
+        except (TypeError, ValueError):
+            return
+
+        cooling_mode = data.get("cooling_mode")
+        now = time.monotonic()
+        self.control_metrics.update(
+            now,
+            plate,
+            target,
+            output=optional_float("pid_output"),
+            cooling_mode=None if cooling_mode is None else bool(cooling_mode),
+            heating_limit=optional_float("pid_heating_limit"),
+            cooling_limit=optional_float("pid_cooling_limit"),
+        )
+
+        if now - self.control_metrics_refreshed_at >= 1.0:
+            self.control_metrics_refreshed_at = now
+            self.refresh_control_metrics_display()
+
+    def update_equilibrium_estimate(self, data: Dict[str, Any]):
+        """Feed one status frame to the host-side equilibrium estimator."""
+
+        def optional_float(key: str) -> Optional[float]:
+            value = data.get(key)
+            if value is None:
+                return None
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+
+        now = time.monotonic()
+        self.equilibrium_tracker.update(
+            now,
+            plate=optional_float("cooling_plate_temp"),
+            rectal=optional_float("anal_probe_temp"),
+            output=optional_float("pid_output"),
+            target=optional_float("plate_target_active"),
+            estimating=bool(data.get("equilibrium_estimating", self.equilibrium_estimating)),
+        )
+        if now - self.equilibrium_refreshed_at < 1.0:
+            return
+        self.equilibrium_refreshed_at = now
+
+        for name, label in (
+            ("plate", getattr(self, "hostPlateEquilibriumValue", None)),
+            ("rectal", getattr(self, "hostRectalEquilibriumValue", None)),
+        ):
+            estimate = getattr(self.equilibrium_tracker, name).estimate
+            converged = estimate is not None and estimate.converged
+            if label is not None:
+                if estimate is None:
+                    label.setText("--")
+                    label.setStyleSheet("font-weight: bold; color: #6c757d;")
+                else:
+                    label.setText(
+                        f"{estimate.temperature:.2f} ± {estimate.uncertainty:.2f} °C "
+                        f"(τ {estimate.time_constant:.0f} s)"
+                    )
+                    color = "#1e7e34" if converged else "#b07d11"
+                    label.setStyleSheet(f"font-weight: bold; color: {color};")
+            if converged and not self.equilibrium_converged[name]:
+                message = (
+                    f"HOST_EQUILIBRIUM {name}={estimate.temperature:.2f}±{estimate.uncertainty:.2f}°C "
+                    f"tau={estimate.time_constant:.0f}s"
+                )
+                self.log(f"♒︎ Host equilibrium ({name}): {estimate.temperature:.2f}°C", "info")
+                self.event_logger.log_event(f"EVENT: {message}")
+            # Logged once per approach; the estimator resets between approaches.
+            self.equilibrium_converged[name] = estimate is not None and (
+                converged or self.equilibrium_converged[name]
+            )
+
+    def update_early_warning(self, data: Dict[str, Any]):
+        """Show and log the forecasts added by the early-warning processor."""
+
+        result = data.get("early_warning")
+        if not isinstance(result, dict):
+            return
+
+        warnings = {item["name"]: item for item in result.get("warnings", [])}
+        for change in result.get("changes", []):
+            name = change["name"]
+            warning = warnings.get(name)
+            if warning is None:
+                self.log(f"✅ Early warning cleared: {name}", "info")
+                self.event_logger.log_event(f"EVENT: EARLY_WARNING_CLEARED {name}")
+                continue
+            # Only escalations are shown in the log; every change is an event.
+            if GRADE_RANK[change["to"]] > GRADE_RANK[change["from"]]:
+                level = {"critical": "error", "warning": "warning"}.get(warning["grade"], "info")
+                self.log(
+                    f"⏳ {warning['grade'].capitalize()}: {name} in {warning['time_to_threshold_s']:.0f} s "
+                    f"({warning['value']:.2f} → {warning['threshold']:.2f} °C)",
+                    level,
+                )
+            self.event_logger.log_event(
+                f"EVENT: EARLY_WARNING {name}={warning['grade']} "
+                f"t={warning['time_to_threshold_s']:.0f}s threshold={warning['threshold']:.2f}"
+            )
+
+        label = getattr(self, "earlyWarningValue", None)
+        if label is None:
+            return
+        if not warnings:
+            label.setText("✅ None")
+            label.setStyleSheet("font-weight: bold; color: #28a745;")
+            return
+        first = result["warnings"][0]
+        color = {"critical": "#dc3545", "warning": "#fd7e14"}.get(first["grade"], "#b07d11")
+        label.setText(
+            f"⏳ {first['grade'].capitalize()}: {first['name']} in {first['time_to_threshold_s']:.0f} s"
+            + (f" (+{len(warnings) - 1})" if len(warnings) > 1 else "")
+        )
+        label.setStyleSheet(f"font-weight: bold; color: {color};")
+
+    def refresh_control_metrics_display(self):
+        """Show the current control-quality metrics."""
+        if not hasattr(self, "qualityTrackingLabel"):
+            return
+
+        metrics = self.control_metrics.as_dict()
+        if not metrics["samples"]:
+            for label in (
+                self.qualityTrackingLabel,
+                self.qualityStepLabel,
+                self.qualityStepsLabel,
+                self.qualitySaturationLabel,
+                self.qualityModeSwitchLabel,
+            ):
+                label.setText("-")
+            return
+
+        def seconds(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value:.0f}s"
+
+        rms = metrics["rms_error"]
+        self.qualityTrackingLabel.setText(
+            f"IAE {metrics['iae']:.1f} °C·s | ISE {metrics['ise']:.1f} °C²·s | "
+            f"RMS {'-' if rms is None else f'{rms:.2f} °C'}"
+        )
+        step = metrics["current_step"]
+        if step is None:
+            self.qualityStepLabel.setText("-")
+        else:
+            self.qualityStepLabel.setText(
+                f"{step['from_target']:.1f} → {step['to_target']:.1f} °C | "
+                f"overshoot {step['overshoot']:.2f} °C | settled {seconds(step['settling_time'])}"
+            )
+        self.qualityStepsLabel.setText(
+            f"{metrics['setpoint_changes']} ({metrics['settled_steps']} settled) | "
+            f"max overshoot {metrics['max_overshoot']:.2f} °C | "
+            f"mean settling {seconds(metrics['mean_settling_time'])}"
+        )
+        self.qualitySaturationLabel.setText(
+            f"Heating {metrics['saturated_heating_s']:.0f}s | "
+            f"Cooling {metrics['saturated_cooling_s']:.0f}s of {metrics['duration_s']:.0f}s"
+        )
+        self.qualityModeSwitchLabel.setText(
+            f"{metrics['mode_switches']} (H→C {metrics['heating_to_cooling']}, "
+            f"C→H {metrics['cooling_to_heating']})"
+        )
+
+    def _log_control_metrics(self):
+        """Store the accumulated metrics in the session and start over."""
+        if not self.control_metrics.samples:
+            return
+
+        metrics = self.control_metrics.as_dict()
+        try:
+            self.event_logger.log_event(CONTROL_METRICS_EVENT_PREFIX + json.dumps(metrics))
+        except Exception as exc:
+            self.log(f"⚠️ Could not store control metrics: {exc}", "warning")
+        self.record_tuning_history("control_metrics", metrics)
+        self.control_metrics.reset()
+        self.refresh_control_metrics_display()
+
+    def reset_control_metrics(self):
+        """Store the current control-quality metrics and restart them."""
+        self._log_control_metrics()
+        self.log("📏 Control quality metrics reset", "info")
+
     def _flush_data_logger(self):
         """Flush pending logger data without blocking data callbacks."""
         if self.data_logger is None:
@@ -3620,9 +4370,10 @@ class MainWindow(QMainWindow):
                     self.log("⚠️ Load and send a profile before starting.", "warning")
                     return False
                 try:
-                    self.serial_manager.sendSET("profile_data", self.profile_steps)
-                    self.profile_upload_pending = True
-                    self._update_profile_button_states()
+                    # Skipped when the controller already holds this exact profile.
+                    if self._upload_profile_steps(allow_patch=False):
+                        self.profile_upload_pending = True
+                        self._update_profile_button_states()
                 except Exception as exc:
                     self.log(f"❌ Failed to send profile: {exc}", "error")
                     return False
@@ -3717,6 +4468,9 @@ class MainWindow(QMainWindow):
                     self._start_data_logger()
                 if self.data_logger is not None:
                     self.data_logger.log_data(data)
+                self.update_control_metrics(data)
+                self.update_equilibrium_estimate(data)
+                self.update_early_warning(data)
 
             # Update live displays
             self.update_live_displays(data)
@@ -3771,8 +4525,6 @@ class MainWindow(QMainWindow):
                 self.emergencyStateValue.setStyleSheet("font-weight: bold; color: #dc3545;")
             if log_event and not previous_state:
                 self.event_logger.log_event(f"EVENT: FAILSAFE_TRIGGERED ({reason_text})")
-                if self.data_logger is not None:
-                    self.data_logger.log_event(f"FAILSAFE_TRIGGERED ({reason_text})")
                 self.log(f"🚨 FAILSAFE ACTIVE: {reason_text}", "error")
                 self.log_emergency_event(f"FAILSAFE TRIGGERED → {reason_text}")
         else:
@@ -3785,8 +4537,6 @@ class MainWindow(QMainWindow):
             self.panic_active = False
             if log_event and previous_state:
                 self.event_logger.log_event("EVENT: FAILSAFE_CLEARED")
-                if self.data_logger is not None:
-                    self.data_logger.log_event("FAILSAFE_CLEARED")
                 self.log("✅ Failsafe cleared", "info")
                 self.log_emergency_event("FAILSAFE CLEARED")
 
@@ -3904,6 +4654,18 @@ class MainWindow(QMainWindow):
                 temp = float(data["anal_probe_temp"])
                 self.rectalTempDisplay.setText(f"{temp:.1f}°C")
 
+            filtered_parts = []
+            for label, field, rate_key in (
+                ("Plate", "cooling_plate_temp_filtered", "cooling_plate_rate"),
+                ("Rectal", "anal_probe_temp_filtered", "anal_probe_rate"),
+            ):
+                if field in data and rate_key in data:
+                    filtered_parts.append(
+                        f"{label} {float(data[field]):.2f}°C ({float(data[rate_key]):+.3f} °C/s)"
+                    )
+            if filtered_parts:
+                self.filteredTempDisplay.setText(" | ".join(filtered_parts))
+
             rectal_setpoint = self._extract_rectal_setpoint(data)
             if rectal_setpoint is not None:
                 self.rectalSetpointDisplay.setText(f"{rectal_setpoint:.1f}°C")
@@ -4122,6 +4884,9 @@ class MainWindow(QMainWindow):
                         self.profileStatusLabel.setStyleSheet("color: #6c757d; font-weight: bold;")
                 self._update_profile_button_states()
 
+            if "profile_step_index" in data:
+                self._stream_profile_window(data)
+
         except (ValueError, KeyError) as e:
             print(f"Status indicator error: {e}")
 
@@ -4143,10 +4908,21 @@ class MainWindow(QMainWindow):
             self.graph_data["time"].append(elapsed)
             self.graph_data["plate_temp"].append(float(data["cooling_plate_temp"]))
             self.graph_data["rectal_temp"].append(float(data["anal_probe_temp"]))
+            # Added by the state filter; NaN until it has a first estimate.
+            self.graph_data["plate_temp_filtered"].append(
+                float(data.get("cooling_plate_temp_filtered", float("nan")))
+            )
+            self.graph_data["rectal_temp_filtered"].append(
+                float(data.get("anal_probe_temp_filtered", float("nan")))
+            )
             self.graph_data["pid_output"].append(float(data.get("pid_output", 0)))
             self.graph_data["breath_rate"].append(float(data.get("breath_freq_bpm", 0)))
 
-            base_target = float(data.get("plate_target_active", 37))
+            if "plate_target_active" in data:
+                base_target = float(data["plate_target_active"])
+            else:
+                scheduled_target = self._get_current_plate_target()
+                base_target = scheduled_target if scheduled_target is not None else 37.0
             self.graph_data["target_temp"].append(base_target)
 
             rectal_setpoint = self._extract_rectal_setpoint(data)
@@ -4204,6 +4980,19 @@ class MainWindow(QMainWindow):
                 self.log(f"📥 RESPONSE: {response_msg}", "info")
 
                 response_lower = response_msg.lower()
+                if self.profile_streamer is not None:
+                    self.profile_streamer.on_response(response_msg)
+
+                patch_fallback = self.profile_sync.on_response(response_msg)
+                if patch_fallback:
+                    # Refused patch (or firmware without profile_patch): resend everything.
+                    try:
+                        self.serial_manager.sendSET("profile_data", self.profile_steps)
+                        self.profile_sync.on_sent(self.profile_steps)
+                        self.log("↩️ Profile patch refused, sending the full profile", "warning")
+                    except Exception as exc:
+                        patch_fallback = False
+                        self.log(f"❌ Failed to resend profile: {exc}", "error")
 
                 if "profile" in response_lower:
                     if "started" in response_lower:
@@ -4218,11 +5007,13 @@ class MainWindow(QMainWindow):
                     elif "resumed" in response_lower:
                         self._mark_profile_resumed()
 
-                if self.profile_upload_pending and response_lower.startswith("profile"):
+                if patch_fallback:
+                    pass
+                elif self.profile_upload_pending and response_lower.startswith("profile"):
                     self.profile_upload_pending = False
                     if any(
                         keyword in response_lower
-                        for keyword in ("loaded", "accepted", "ready", "stored")
+                        for keyword in ("loaded", "accepted", "ready", "stored", "patched")
                     ):
                         self.profile_ready = True
                         self.profile_active = False
@@ -4363,6 +5154,13 @@ class MainWindow(QMainWindow):
                 f"🎯 Autotune: Kp={kp:.3f}, Ki={ki:.3f}, Kd={kd:.3f}",
                 "success",
             )
+            if getattr(self, "event_logger", None) is not None:
+                result_record = {"kp": kp, "ki": ki, "kd": kd}
+                if cooling_available:
+                    result_record.update(
+                        {"cooling_kp": cool_kp, "cooling_ki": cool_ki, "cooling_kd": cool_kd}
+                    )
+                self.event_logger.log_event("AUTOTUNE_RESULT " + json.dumps(result_record))
             if cooling_available:
                 self.log(
                     f"❄️ Autotune (cooling): Kp={cool_kp:.3f}, Ki={cool_ki:.3f}, Kd={cool_kd:.3f}",
@@ -4495,8 +5293,6 @@ class MainWindow(QMainWindow):
 
                 self.serial_manager.sendCMD("panic", "")
                 self.event_logger.log_event("EVENT: PANIC_TRIGGERED")
-                if self.data_logger is not None:
-                    self.data_logger.log_event("PANIC_TRIGGERED")
                 self.panic_active = True
                 self._apply_failsafe_state(True, "gui_panic_triggered", log_event=True)
                 self.log_emergency_event("PANIC TRIGGERED (GUI)")
@@ -4516,8 +5312,6 @@ class MainWindow(QMainWindow):
 
             self.serial_manager.sendCMD("failsafe", "clear")
             self.event_logger.log_event("CMD: failsafe_clear")
-            if self.data_logger is not None:
-                self.data_logger.log_event("FAILSAFE_CLEAR_REQUESTED")
             self._apply_failsafe_state(False, "manual_clear", log_event=True)
             self.serial_manager.failsafe_triggered_flag = False
             self.log_emergency_event("Failsafe clear requested from GUI")
@@ -4622,6 +5416,8 @@ class MainWindow(QMainWindow):
                 "time": [],
                 "plate_temp": [],
                 "rectal_temp": [],
+                "plate_temp_filtered": [],
+                "rectal_temp_filtered": [],
                 "pid_output": [],
                 "breath_rate": [],
                 "target_temp": [],
@@ -4685,33 +5481,6 @@ class MainWindow(QMainWindow):
 
         return max(0.0, elapsed)
 
-    def _build_rectal_setpoint_schedule(
-        self, steps: List[Dict[str, Any]]
-    ) -> List[Tuple[float, float, float]]:
-        """Produce timeline of rectal override targets from controller steps."""
-
-        schedule: List[Tuple[float, float, float]] = []
-        cumulative = 0.0
-
-        for step in steps:
-            try:
-                duration = float(step["total_step_time_ms"]) / 1000.0
-            except (KeyError, TypeError, ValueError):
-                duration = 0.0
-
-            raw_target = step.get("rectal_override_target", -1000.0)
-            try:
-                rectal_target = float(raw_target)
-            except (TypeError, ValueError):
-                rectal_target = -1000.0
-
-            if rectal_target > -999.0 and duration > 0:
-                schedule.append((cumulative, cumulative + duration, rectal_target))
-
-            cumulative += max(duration, 0.0)
-
-        return schedule
-
     def _build_profile_preview_series(
         self, profile_points: List[Dict[str, Any]]
     ) -> Tuple[List[float], List[float], List[float], List[float], List[float]]:
@@ -4772,6 +5541,20 @@ class MainWindow(QMainWindow):
 
         return times, targets, plate_targets, rectal_times, rectal_values
 
+    def _cached_preview_series(
+        self,
+    ) -> Tuple[List[float], List[float], List[float], List[float], List[float]]:
+        """Preview series of the loaded (unsimplified) profile, cached per file content."""
+
+        compiled = self.profile_compiled
+        if compiled is None:
+            return self._build_profile_preview_series(
+                self.profile_original_points or self.profile_data
+            )
+        if compiled.preview is None:
+            compiled.preview = self._build_profile_preview_series(compiled.points)
+        return compiled.preview
+
     def _build_preview_from_steps(
         self, steps: List[Dict[str, Any]]
     ) -> Tuple[List[float], List[float], List[float]]:
@@ -4814,6 +5597,18 @@ class MainWindow(QMainWindow):
                     name="Rectal setpoint",
                     pen=pg.mkPen(color="#343a40", width=2, style=Qt.DotLine),
                 ),
+                "original": plot.plot(
+                    name="Original (before simplify)",
+                    pen=pg.mkPen(color="#adb5bd", width=1),
+                ),
+                "predicted_plate": plot.plot(
+                    name="Predicted plate",
+                    pen=pg.mkPen(color="#fd7e14", width=2),
+                ),
+                "predicted_rectal": plot.plot(
+                    name="Predicted rectal",
+                    pen=pg.mkPen(color="#dc3545", width=2),
+                ),
             }
             legend.updateSize()
 
@@ -4823,7 +5618,9 @@ class MainWindow(QMainWindow):
         rectal_times: List[float]
         rectal_values: List[float]
 
-        if self.profile_data:
+        if self.profile_data and self.profile_original_points is None:
+            times, targets, plate_targets, rectal_times, rectal_values = self._cached_preview_series()
+        elif self.profile_data:
             times, targets, plate_targets, rectal_times, rectal_values = self._build_profile_preview_series(
                 self.profile_data
             )
@@ -4849,11 +5646,28 @@ class MainWindow(QMainWindow):
         self._profile_preview_items["plate"].setData(times, plate_targets)
         self._profile_preview_items["rectal"].setData(rectal_times, rectal_values)
 
+        original_times: List[float] = []
+        original_targets: List[float] = []
+        if self.profile_original_points is not None:
+            original_times, original_targets, _, _, _ = self._cached_preview_series()
+        self._profile_preview_items["original"].setData(original_times, original_targets)
+
+        predicted_values: List[float] = []
+        simulation = self.profile_simulation
+        if simulation is not None:
+            self._profile_preview_items["predicted_plate"].setData(simulation.times, simulation.plate[0])
+            self._profile_preview_items["predicted_rectal"].setData(simulation.times, simulation.rectal[0])
+            predicted_values = [float(simulation.plate[0].min()), float(simulation.plate[0].max()),
+                                float(simulation.rectal[0].min()), float(simulation.rectal[0].max())]
+        else:
+            self._profile_preview_items["predicted_plate"].setData([], [])
+            self._profile_preview_items["predicted_rectal"].setData([], [])
+
         # Fit the entire profile once so the view stays stable instead of auto-playing.
         x_samples = [value for value in list(times) + list(rectal_times) if math.isfinite(value)]
         y_samples = [
             value
-            for value in list(targets) + list(plate_targets) + list(rectal_values)
+            for value in list(targets) + list(plate_targets) + list(rectal_values) + predicted_values
             if math.isfinite(value)
         ]
         if not x_samples or not y_samples:
@@ -4874,18 +5688,26 @@ class MainWindow(QMainWindow):
     def _get_current_rectal_setpoint(self) -> Optional[float]:
         """Return the active rectal setpoint if a profile is running."""
 
-        if not self.rectal_setpoint_schedule:
+        if self.profile_timeline is None:
             return None
 
         elapsed = self._get_profile_elapsed_time()
         if elapsed is None:
             return None
 
-        for start, end, value in self.rectal_setpoint_schedule:
-            if start <= elapsed <= end:
-                return value
+        return self.profile_timeline.rectal_target_at(elapsed)
 
-        return None
+    def _get_current_plate_target(self) -> Optional[float]:
+        """Return the scheduled plate target if a profile is running."""
+
+        if self.profile_timeline is None:
+            return None
+
+        elapsed = self._get_profile_elapsed_time()
+        if elapsed is None:
+            return None
+
+        return self.profile_timeline.plate_target_at(elapsed)
 
     def _extract_rectal_setpoint(self, data: Dict[str, Any]) -> Optional[float]:
         """Prefer firmware-reported rectal setpoints, then fall back to profile schedule."""
@@ -4949,117 +5771,66 @@ class MainWindow(QMainWindow):
             self.graph_widget.update_graphs(self.graph_data)
 
     def _convert_profile_points_to_steps(self, profile_points: List[Dict[str, Any]]):
-        """Normalize loader output into controller-ready profile timeline."""
-
-        if not profile_points:
-            raise ValueError("Loaded profile is empty")
-
-        def _extract_rectal_target(entry: Dict[str, Any]) -> Optional[float]:
-            target = _first_present(
-                entry,
-                (
-                    "rectal_override_target",
-                    "rectal_setpoint",
-                    "rectalSetpoint",
-                    "rectalTarget",
-                    "rectal_target",
-                ),
-            )
-            if target is None:
-                return None
-            try:
-                return float(target)
-            except (TypeError, ValueError):
-                return None
-
-        def _validate_and_append(steps: List[Dict[str, Any]], t_value: float, target: float, index: int):
-            if t_value < 0:
-                raise ValueError(f"Time cannot be negative at position {index}")
-
-            if steps and t_value <= steps[-1]["t"]:
-                raise ValueError(
-                    f"Time must be ascending. Entry {index} has t={t_value} which is not greater than previous t={steps[-1]['t']}"
-                )
-
-            step_entry: Dict[str, Any] = {"t": t_value, "temp": target}
-            rectal_value = _extract_rectal_target(profile_points[index - 1])
-            if rectal_value is not None:
-                step_entry["rectal_override_target"] = rectal_value
-
-            steps.append(step_entry)
-
-        # Case 1: Already in controller timeline format
-        first_entry = profile_points[0]
-        if "t" in first_entry and ("temp" in first_entry or "plate_target" in first_entry):
-            steps: List[Dict[str, Any]] = []
-            for idx, entry in enumerate(profile_points, start=1):
-                try:
-                    t_value = float(entry["t"])
-                    target = float(entry.get("temp", entry.get("plate_target")))
-                except (TypeError, ValueError, KeyError) as exc:
-                    raise ValueError(f"Invalid timeline entry at position {idx}: {exc}") from exc
-
-                _validate_and_append(steps, t_value, target, idx)
-
-            if len(steps) > 10:
-                raise ValueError("Profile may contain at most 10 steps")
+        """Normalize loader output into controller-ready profile timeline.
 
-            return steps
-
-        step_keys = {"plate_start_temp", "plate_end_temp", "total_step_time_ms"}
-        if step_keys.issubset(first_entry.keys()):
-            steps: List[Dict[str, Any]] = []
-            cumulative_sec = 0.0
-
-            for index, entry in enumerate(profile_points, start=1):
-                try:
-                    start_temp = float(entry["plate_start_temp"])
-                    end_temp = float(entry["plate_end_temp"])
-                    total_time_ms = int(float(entry["total_step_time_ms"]))
-                except (KeyError, TypeError, ValueError) as exc:
-                    raise ValueError(
-                        f"Invalid step entry at position {index}: {exc}"
-                    ) from exc
-
-                if total_time_ms <= 0:
-                    raise ValueError(
-                        f"total_step_time_ms must be positive at step {index}"
-                    )
+        Profiles longer than the controller window are streamed, so no step
+        limit applies here.
+        """
 
-                if not steps:
-                    _validate_and_append(steps, 0.0, start_temp, index)
+        return convert_profile_points_to_steps(profile_points, max_steps=None)
 
-                cumulative_sec += total_time_ms / 1000.0
-                _validate_and_append(steps, cumulative_sec, end_temp, index)
+    def _upload_profile_steps(self, allow_patch: bool = True) -> bool:
+        """Send the profile, or its first window when it must be streamed.
 
-            if len(steps) > 10:
-                raise ValueError("Profile may contain at most 10 steps")
+        Only the changed steps are sent when the controller holds an earlier
+        version, and nothing when it already holds this profile. Returns
+        ``False`` when no upload was needed.
+        """
 
-            return steps
+        if len(self.profile_steps) > MAX_CONTROLLER_STEPS:
+            # Windows replace the controller's copy, so it is no longer tracked.
+            self.profile_sync.invalidate()
+            streamer = ProfileStreamer(self.profile_steps)
+            self.serial_manager.sendSET("profile_window", streamer.initial_window())
+            self.profile_streamer = streamer
+            return True
 
-        try:
-            ordered_points = sorted(
-                profile_points,
-                key=lambda entry: float(entry["time_min"])
+        self.profile_streamer = None
+        plan, payload = self.profile_sync.plan(self.profile_steps, allow_patch=allow_patch)
+        if plan == SKIP:
+            self.profile_sync.on_skipped()
+            return False
+        if plan == PATCH:
+            self.serial_manager.sendSET("profile_patch", payload)
+            self.profile_sync.on_sent(self.profile_steps, patch=True)
+            self.event_logger.log_event(
+                f"Profile patch requested: {len(payload['steps'])} of {payload['length']} steps "
+                f"from step {payload['index']}"
             )
-        except (KeyError, TypeError, ValueError) as exc:
-            raise ValueError("Profile entries must include valid 'time_min' values") from exc
+        else:
+            self.serial_manager.sendSET("profile_data", payload)
+            self.profile_sync.on_sent(self.profile_steps)
+        return True
 
-        steps: List[Dict[str, Any]] = []
+    def _stream_profile_window(self, data: Dict[str, Any]) -> None:
+        """Feed the next profile window ahead of the running step."""
 
-        for index, entry in enumerate(ordered_points, start=1):
-            try:
-                target_temp = float(entry.get("plate_target", entry["temp_c"]))
-                t_value = float(entry["time_min"]) * 60.0
-            except (KeyError, TypeError, ValueError) as exc:
-                raise ValueError(f"Invalid profile entry at position {index}") from exc
+        if self.profile_streamer is None:
+            return
 
-            _validate_and_append(steps, t_value, target_temp, index)
+        window = self.profile_streamer.on_status(data)
+        if window is None:
+            return
 
-        if len(steps) > 10:
-            raise ValueError("Profile may contain at most 10 steps")
+        try:
+            self.serial_manager.sendSET("profile_window", window)
+        except Exception as exc:
+            self.log(f"⚠️ Failed to stream profile window: {exc}", "warning")
+            return
 
-        return steps
+        self.event_logger.log_event(
+            f"PROFILE_WINDOW offset={window['offset']} steps={len(window['steps'])} final={window['final']}"
+        )
 
     def _update_profile_button_states(self):
         """Enable or disable profile controls based on current state."""
@@ -5092,102 +5863,234 @@ class MainWindow(QMainWindow):
             if not file_name:
                 return
 
-            success = False
-            if file_name.endswith('.json'):
-                success = self.profile_loader.load_profile_json(file_name)
-            elif file_name.endswith('.csv'):
-                success = self.profile_loader.load_profile_csv(file_name)
-
-            if not success:
+            filename = os.path.basename(file_name)
+            try:
+                # Re-opening an unchanged profile skips parsing and conversion.
+                compiled = self.profile_cache.load(file_name)
+            except ProfileParseError as exc:
+                print(f"❌ Failed to load profile '{file_name}': {exc}")
+                self.event_logger.log_event(
+                    f"PROFILE_LOAD_FAILED file={file_name} errors={len(exc.errors)} first={exc}"
+                )
+                issues = [format_issue(error) for error in exc.errors]
+                shown = issues[: self.MAX_SHOWN_ISSUES]
+                for issue in shown:
+                    self.log(f"❌ {issue}", "error")
+                hidden = len(issues) - len(shown)
+                more = f"\n… and {hidden} more" if hidden else ""
+                QMessageBox.warning(
+                    self,
+                    "Load Error",
+                    f"{len(issues)} problem(s) in {filename}:\n\n" + "\n".join(shown) + more,
+                )
+                return
+            except Exception as exc:
+                print(f"❌ Failed to load profile '{file_name}': {exc}")
+                self.event_logger.log_event(f"PROFILE_LOAD_FAILED file={file_name} error={exc}")
                 self.log("❌ Profile load failed", "error")
                 QMessageBox.warning(self, "Load Error", "Failed to load the selected profile file.")
                 return
 
+            self.profile_compiled = compiled
+            self.profile_loader.profile = list(compiled.points)
             self.profile_data = self.profile_loader.get_profile()
-            filename = os.path.basename(file_name)
+            self.event_logger.log_event(
+                f"PROFILE_LOADED file={filename} steps={len(self.profile_data)}"
+            )
             self.profileFileLabel.setText(f"✅ {filename}")
             self.profileFileLabel.setStyleSheet("color: #28a745; font-weight: bold;")
 
-            try:
-                self.profile_steps = self._convert_profile_points_to_steps(self.profile_data)
-                self.rectal_setpoint_schedule = self._build_rectal_setpoint_schedule(
-                    self.profile_steps
-                )
-                self._refresh_rectal_setpoint_series()
-                self._update_profile_preview()
-            except ValueError as exc:
-                self.profile_steps = []
-                self.rectal_setpoint_schedule = []
-                self._refresh_rectal_setpoint_series()
-                self._update_profile_preview()
-                self.profile_ready = False
-                self.profile_upload_pending = False
-                self.profile_active = False
-                self.profile_paused = False
-                self._reset_profile_timing()
-                self._update_profile_button_states()
-                error_message = f"Profile conversion error: {exc}"
-                self.log(f"❌ {error_message}", "error")
-                QMessageBox.warning(self, "Profile Error", error_message)
-                return
+            self.profile_source_name = file_name
+            self.profile_original_points = None
+            self.profileSimplifyLabel.setText(f"{len(self.profile_data)} points")
+            self.profileSimplifyLabel.setStyleSheet("color: #6c757d;")
+            self.simplifyProfileButton.setEnabled(bool(self.profile_data))
 
-            if not self.profile_steps:
-                self.rectal_setpoint_schedule = []
-                self._refresh_rectal_setpoint_series()
-                self._update_profile_preview()
-                self.profile_ready = False
-                self.profile_upload_pending = False
-                self.profile_active = False
-                self.profile_paused = False
-                self._update_profile_button_states()
-                self.log("❌ Profile did not produce any steps", "error")
-                QMessageBox.warning(
-                    self,
-                    "Profile Error",
-                    "The loaded profile did not produce any controller steps."
-                )
-                return
+            self._apply_profile_points(file_name, compiled=compiled)
+
+        except Exception as e:
+            self.log(f"❌ Profile error: {e}", "error")
 
+    def _apply_profile_points(
+        self,
+        file_name: str,
+        log_loaded: bool = True,
+        compiled: Optional[CompiledProfile] = None,
+    ) -> None:
+        """Convert ``self.profile_data`` to controller steps and upload them.
+
+        *compiled* supplies cached steps and timeline for unmodified profiles.
+        """
+
+        filename = os.path.basename(file_name)
+        self.profile_simulation = None
+        self.profileSimulationLabel.setText("")
+        self.simulateProfileButton.setEnabled(False)
+        try:
+            self.profile_streamer = None
+            if compiled is not None:
+                if compiled.conversion_error:
+                    raise ValueError(compiled.conversion_error)
+                self.profile_steps = list(compiled.steps)
+                self.profile_timeline = compiled.timeline
+            else:
+                self.profile_steps = self._convert_profile_points_to_steps(self.profile_data)
+                self.profile_timeline = self.profile_loader.compile_timeline(self.profile_data)
+            self.rectal_setpoint_schedule = self.profile_timeline.rectal_schedule()
+            self._refresh_rectal_setpoint_series()
+            self._update_profile_preview()
+        except ValueError as exc:
+            self.profile_steps = []
+            self.profile_timeline = None
+            self.rectal_setpoint_schedule = []
+            self._refresh_rectal_setpoint_series()
+            self._update_profile_preview()
             self.profile_ready = False
             self.profile_upload_pending = False
             self.profile_active = False
             self.profile_paused = False
             self._reset_profile_timing()
             self._update_profile_button_states()
+            error_message = f"Profile conversion error: {exc}"
+            self.log(f"❌ {error_message}", "error")
+            QMessageBox.warning(self, "Profile Error", error_message)
+            return
+
+        if not self.profile_steps:
+            self.profile_timeline = None
+            self.rectal_setpoint_schedule = []
+            self._refresh_rectal_setpoint_series()
+            self._update_profile_preview()
+            self.profile_ready = False
+            self.profile_upload_pending = False
+            self.profile_active = False
+            self.profile_paused = False
+            self._update_profile_button_states()
+            self.log("❌ Profile did not produce any steps", "error")
+            QMessageBox.warning(
+                self,
+                "Profile Error",
+                "The loaded profile did not produce any controller steps."
+            )
+            return
 
+        self.simulateProfileButton.setEnabled(True)
+        self.profile_ready = False
+        self.profile_upload_pending = False
+        self.profile_active = False
+        self.profile_paused = False
+        self._reset_profile_timing()
+        self._update_profile_button_states()
+
+        if log_loaded:
             self.log(f"✅ Profile loaded: {filename}", "success")
             self.event_logger.log_event(f"Profile loaded: {file_name}")
 
-            if self.connection_established:
-                try:
-                    self.serial_manager.sendSET("profile_data", self.profile_steps)
-                except Exception as exc:
-                    self.log(f"❌ Failed to upload profile: {exc}", "error")
-                    QMessageBox.warning(
-                        self,
-                        "Upload Error",
-                        f"Failed to upload the profile to the controller.\n{exc}"
-                    )
-                    return
+        if self.connection_established:
+            try:
+                sent = self._upload_profile_steps()
+            except Exception as exc:
+                self.log(f"❌ Failed to upload profile: {exc}", "error")
+                QMessageBox.warning(
+                    self,
+                    "Upload Error",
+                    f"Failed to upload the profile to the controller.\n{exc}"
+                )
+                return
 
-                self.profile_upload_pending = True
+            if not sent:
+                self.profile_ready = True
                 self._update_profile_button_states()
-                self.log(
-                    f"📤 Uploading {len(self.profile_steps)} profile steps to controller...",
-                    "info",
-                )
-                self.event_logger.log_event(
-                    f"Profile upload requested: {len(self.profile_steps)} steps"
-                )
-            else:
-                self.log(
-                    "⚠️ Connect to the controller to upload the loaded profile.",
-                    "warning",
-                )
+                self.log("✅ Controller already holds this profile, upload skipped", "success")
+                return
 
+            self.profile_upload_pending = True
+            self._update_profile_button_states()
+            self.log(
+                f"📤 Uploading {len(self.profile_steps)} profile steps to controller...",
+                "info",
+            )
+            self.event_logger.log_event(
+                f"Profile upload requested: {len(self.profile_steps)} steps"
+            )
+        else:
+            self.log(
+                "⚠️ Connect to the controller to upload the loaded profile.",
+                "warning",
+            )
+
+    def simplify_profile(self):
+        """Simplify the loaded profile within the chosen step limit and deviation."""
+
+        try:
+            if self.profile_original_points is None:
+                if not self.profile_data:
+                    self.log("⚠️ Load a profile before simplifying.", "warning")
+                    return
+                self.profile_original_points = list(self.profile_data)
+
+            max_steps = self.simplifyMaxStepsSpin.value()
+            tolerance = self.simplifyToleranceSpin.value()
+
+            # Always simplify from the original points, never a previous result.
+            self.profile_loader.profile = list(self.profile_original_points)
+            achieved = self.profile_loader.simplify(max_steps, tolerance)
+            self.profile_data = self.profile_loader.get_profile()
+
+            summary = (
+                f"{len(self.profile_original_points)} → {len(self.profile_data)} points, "
+                f"max error {achieved:.3f} °C"
+            )
+            within = achieved <= tolerance + 1e-9
+            self.profileSimplifyLabel.setText(("✅ " if within else "⚠️ ") + summary)
+            self.profileSimplifyLabel.setStyleSheet(
+                "color: #28a745; font-weight: bold;" if within else "color: #b07d11; font-weight: bold;"
+            )
+            self.log(
+                f"✂️ Profile simplified: {summary}"
+                + ("" if within else f" (exceeds {tolerance:.2f} °C; increase max steps)"),
+                "success" if within else "warning",
+            )
+
+            self._apply_profile_points(self.profile_source_name, log_loaded=False)
+
+        except ValueError as exc:
+            self.log(f"❌ Simplify error: {exc}", "error")
+            QMessageBox.warning(self, "Simplify Error", str(exc))
         except Exception as e:
             self.log(f"❌ Profile error: {e}", "error")
 
+    def simulate_profile(self):
+        """Dry-run the loaded profile on the plant model and plot the prediction."""
+
+        if self.profile_timeline is None:
+            self.log("⚠️ Load a profile before simulating.", "warning")
+            return
+
+        try:
+            # Use the controller's current tuning when a status frame is available.
+            pid = PIDParameters.from_status(self.last_status_data)
+            result = simulate_profile(self.profile_timeline, pid=pid)
+        except Exception as exc:
+            self.log(f"❌ Simulation error: {exc}", "error")
+            return
+
+        self.profile_simulation = result
+        self._update_profile_preview()
+
+        summary = result.summary()
+        text = (
+            f"Plate error mean {summary['mean_plate_error']:.2f} °C, "
+            f"rectal min {summary['min_rectal']:.1f} °C ({summary['elapsed_s'] * 1000.0:.0f} ms)"
+        )
+        if summary["failsafe_reason"]:
+            text = f"🚨 Failsafe ({summary['failsafe_reason']}) at {summary['failsafe_time_s'] / 60.0:.1f} min; " + text
+            self.profileSimulationLabel.setStyleSheet("color: #dc3545; font-weight: bold;")
+        else:
+            self.profileSimulationLabel.setStyleSheet("color: #28a745; font-weight: bold;")
+        self.profileSimulationLabel.setText(text)
+        self.log(f"🧪 Profile simulation: {text}", "warning" if summary["failsafe_reason"] else "info")
+
     # ====== CONNECTION METHODS ======
 
     def refresh_ports(self):
@@ -5262,9 +6165,11 @@ class MainWindow(QMainWindow):
                     # Start sync
                     self.sync_timer.start(1000)
 
+                    # The controller may have restarted; never trust an earlier upload.
+                    self.profile_sync.invalidate()
                     if self.profile_steps:
                         try:
-                            self.serial_manager.sendSET("profile_data", self.profile_steps)
+                            self._upload_profile_steps()
                         except Exception as exc:
                             self.log(f"⚠️ Failed to upload stored profile on connect: {exc}", "warning")
                             self._update_profile_button_states()
@@ -397,6 +397,12 @@ void CommAPI::handleCommand(const String &jsonString) {
                 parseProfile(value.as<JsonArray>());
             }
 
+        } else if (variable == "profile_window") {
+            parseProfileWindow(set["value"].as<JsonObject>());
+
+        } else if (variable == "profile_patch") {
+            parseProfilePatch(set["value"].as<JsonObject>());
+
         } else if (variable == "equilibrium_compensation") {
             bool enable = set["value"];
             pid.setUseEquilibriumCompensation(enable);
@@ -598,20 +604,20 @@ void CommAPI::sendCalibrationTable(uint8_t sensorId, const char *sensorName) {
     serial->println();
 }
 
-void CommAPI::parseProfile(JsonArray arr) {
+size_t CommAPI::parseProfileSteps(JsonArray arr, ProfileManager::ProfileStep *steps) {
+    // Returns the number of parsed steps, or 0 after sending an error response.
     const size_t profileLen = arr.size();
 
     if (profileLen == 0) {
         sendResponse("Profile empty");
-        return;
+        return 0;
     }
 
     if (profileLen > ProfileManager::MAX_STEPS) {
         sendResponse("Profile too long");
-        return;
+        return 0;
     }
 
-    ProfileManager::ProfileStep steps[ProfileManager::MAX_STEPS];
     size_t loadedSteps = 0;
     uint32_t lastTime = 0;
 
@@ -619,14 +625,14 @@ void CommAPI::parseProfile(JsonArray arr) {
         JsonVariant stepVariant = arr[i];
         if (!stepVariant.is<JsonObject>()) {
             sendResponse("Profile step malformed");
-            return;
+            return 0;
         }
 
         JsonObject step = stepVariant.as<JsonObject>();
 
         if (!step.containsKey("t") || (!step.containsKey("temp") && !step.containsKey("plate_target"))) {
             sendResponse("Profile step missing fields");
-            return;
+            return 0;
         }
 
         float targetTemp = step.containsKey("temp") ? step["temp"].as<float>() : step["plate_target"].as<float>();
@@ -634,7 +640,7 @@ void CommAPI::parseProfile(JsonArray arr) {
 
         if (timeMs < lastTime) {
             sendResponse("Profile time not ascending");
-            return;
+            return 0;
         }
 
         steps[loadedSteps].time_ms = timeMs;
@@ -645,6 +651,14 @@ void CommAPI::parseProfile(JsonArray arr) {
 
     if (loadedSteps == 0) {
         sendResponse("No valid profile steps");
+    }
+    return loadedSteps;
+}
+
+void CommAPI::parseProfile(JsonArray arr) {
+    ProfileManager::ProfileStep steps[ProfileManager::MAX_STEPS];
+    size_t loadedSteps = parseProfileSteps(arr, steps);
+    if (loadedSteps == 0) {
         return;
     }
 
@@ -656,6 +670,58 @@ void CommAPI::parseProfile(JsonArray arr) {
     sendResponse("Profile loaded");
 }
 
+void CommAPI::parseProfileWindow(JsonObject window) {
+    // {"offset": <absolute index of first step>, "final": <bool>, "steps": [...]}
+    if (window.isNull() || !window.containsKey("offset") || !window["steps"].is<JsonArray>()) {
+        sendResponse("Invalid profile window payload");
+        return;
+    }
+
+    ProfileManager::ProfileStep steps[ProfileManager::MAX_STEPS];
+    size_t loadedSteps = parseProfileSteps(window["steps"].as<JsonArray>(), steps);
+    if (loadedSteps == 0) {
+        return;
+    }
+
+    uint16_t offset = window["offset"].as<uint16_t>();
+    bool final = window["final"] | false;
+    if (!profileManager.loadWindow(steps, static_cast<uint8_t>(loadedSteps), offset, final)) {
+        sendResponse("Profile window rejected");
+        return;
+    }
+
+    sendResponse("Profile window loaded");
+}
+
+void CommAPI::parseProfilePatch(JsonObject patch) {
+    // {"index": <first replaced step>, "length": <new profile length>, "steps": [...]}
+    if (patch.isNull() || !patch.containsKey("index") || !patch.containsKey("length") ||
+        !patch["steps"].is<JsonArray>()) {
+        sendResponse("Invalid profile patch payload");
+        return;
+    }
+
+    ProfileManager::ProfileStep steps[ProfileManager::MAX_STEPS];
+    size_t patchedSteps = 0;
+    JsonArray arr = patch["steps"].as<JsonArray>();
+    if (arr.size() > 0) {
+        // An empty step list only truncates the stored profile.
+        patchedSteps = parseProfileSteps(arr, steps);
+        if (patchedSteps == 0) {
+            return;
+        }
+    }
+
+    uint8_t index = patch["index"].as<uint8_t>();
+    uint8_t length = patch["length"].as<uint8_t>();
+    if (!profileManager.patchSteps(steps, static_cast<uint8_t>(patchedSteps), index, length)) {
+        sendResponse("Profile patch rejected");
+        return;
+    }
+
+    sendResponse("Profile patched");
+}
+
 void CommAPI::sendResponse(const String &message) {
     StaticJsonDocument<256> doc;
     doc["response"] = message;
@@ -715,7 +781,7 @@ void CommAPI::sendFailsafeStatus() {
 }
 
 void CommAPI::sendStatus() {
-    StaticJsonDocument<768> doc;
+    StaticJsonDocument<1024> doc;
     doc["failsafe_active"] = isFailsafeActive();
     doc["failsafe_reason"] = getFailsafeReason();
     doc["breath_check_enabled"] = isBreathCheckEnabled();
@@ -732,6 +798,9 @@ void CommAPI::sendStatus() {
     doc["profile_paused"] = profileManager.isPaused();
     doc["profile_step_index"] = profileManager.getCurrentStep();
     doc["profile_remaining_time"] = profileManager.getRemainingTime();
+    doc["profile_window_offset"] = profileManager.getWindowOffset();
+    doc["profile_window_length"] = profileManager.getWindowLength();
+    doc["profile_window_final"] = profileManager.isWindowFinal();
     doc["autotune_active"] = pid.isAutotuneActive();
     doc["autotune_status"] = pid.getAutotuneStatus();
     doc["cooling_mode"] = pid.isCooling();
@@ -5,6 +5,7 @@
 #include <ArduinoJson.h>
 
 #include "eeprom_manager.h"
+#include "profile_manager.h"
 
 class CommAPI {
 public:
@@ -29,6 +30,9 @@ private:
     void handleCommand(const String &jsonString);
     void handleCalibrationCommand(JsonObject cmd);
     void parseProfile(JsonArray arr);
+    void parseProfileWindow(JsonObject window);
+    void parseProfilePatch(JsonObject patch);
+    size_t parseProfileSteps(JsonArray arr, ProfileManager::ProfileStep *steps);
     void sendCalibrationTable(uint8_t sensorId, const char *sensorName);
     bool parseSensor(const String &sensorValue, EEPROMManager::SensorType &sensorType,
                      const char *&sensorName);
@@ -13,7 +13,8 @@ extern CommAPI comm;
 
 ProfileManager::ProfileManager()
   : profileLength(0), active(false), paused(false),
-    currentStep(0), profileStartTimeMs(0), pauseStartTimeMs(0), totalPausedMs(0) {}
+    currentStep(0), windowOffset(0), windowFinal(true), underrunReported(false),
+    profileStartTimeMs(0), pauseStartTimeMs(0), totalPausedMs(0) {}
 
 void ProfileManager::begin() {
   active = false;
@@ -22,20 +23,69 @@ void ProfileManager::begin() {
 
 bool ProfileManager::loadProfile(const ProfileStep* steps, uint8_t length) {
   if (length == 0 || length > MAX_STEPS) {
-    profileLength = 0;
+    if (!active) profileLength = 0;
     return false;
   }
+  return loadWindow(steps, length, 0, true);
+}
 
-  profileLength = length;
+bool ProfileManager::loadWindow(const ProfileStep* steps, uint8_t length, uint16_t offset, bool final) {
+  if (length == 0 || length > MAX_STEPS) return false;
+
+  if (active) {
+    // Keep running seamlessly: the new window must contain the current step.
+    uint16_t absoluteStep = windowOffset + currentStep;
+    if (absoluteStep < offset || absoluteStep >= offset + length) return false;
+    currentStep = absoluteStep - offset;
+  } else {
+    // A profile always starts from its first step.
+    if (offset != 0) return false;
+    currentStep = 0;
+  }
 
+  profileLength = length;
   for (uint8_t i = 0; i < profileLength; i++) {
     profile[i] = steps[i];
   }
+  windowOffset = offset;
+  windowFinal = final;
+  underrunReported = false;
+  return true;
+}
+
+bool ProfileManager::patchSteps(const ProfileStep* steps, uint8_t count, uint8_t index, uint8_t length) {
+  if (active || paused) return false;
+  if (profileLength == 0 || windowOffset != 0 || !windowFinal) return false;
+  if (length == 0 || length > MAX_STEPS) return false;
+  if (index > profileLength || index + count > length) return false;
+  if (length > profileLength && index + count < length) return false;
+
+  ProfileStep patched[MAX_STEPS];
+  for (uint8_t i = 0; i < profileLength; i++) {
+    patched[i] = profile[i];
+  }
+  for (uint8_t i = 0; i < count; i++) {
+    patched[index + i] = steps[i];
+  }
+  for (uint8_t i = 1; i < length; i++) {
+    if (patched[i].time_ms < patched[i - 1].time_ms) return false;
+  }
+
+  for (uint8_t i = 0; i < length; i++) {
+    profile[i] = patched[i];
+  }
+  profileLength = length;
+  currentStep = 0;
+  underrunReported = false;
   return true;
 }
 
 bool ProfileManager::start() {
   if (profileLength == 0) return false;
+  if (windowOffset != 0) {
+    comm.sendEvent("⚠️ Profile start blocked: upload the first profile window");
+    return false;
+  }
   if (isFailsafeActive() || isPanicActive()) {
     comm.sendEvent("⚠️ Profile start blocked: safety active");
     return false;
@@ -94,7 +144,10 @@ void ProfileManager::abortDueToSafety(const char* reason) {
 
 bool ProfileManager::isActive() { return active; }
 bool ProfileManager::isPaused() { return paused; }
-uint8_t ProfileManager::getCurrentStep() { return currentStep; }
+uint16_t ProfileManager::getCurrentStep() { return windowOffset + currentStep; }
+uint16_t ProfileManager::getWindowOffset() { return windowOffset; }
+uint8_t ProfileManager::getWindowLength() { return profileLength; }
+bool ProfileManager::isWindowFinal() { return windowFinal; }
 
 uint32_t ProfileManager::getRemainingTime() {
   if (!active) return 0;
@@ -123,13 +176,20 @@ void ProfileManager::update() {
 
   uint32_t elapsed = millis() - profileStartTimeMs - totalPausedMs;
 
-  if (currentStep + 1 < profileLength && elapsed >= profile[currentStep + 1].time_ms) {
+  // Dense profiles can pass several breakpoints between updates.
+  while (currentStep + 1 < profileLength && elapsed >= profile[currentStep + 1].time_ms) {
     advanceStep(currentStep + 1);
   }
 
   // Stop profile once the final step time has passed
   if (elapsed > profile[profileLength - 1].time_ms) {
-    stop();
+    if (windowFinal) {
+      stop();
+    } else if (!underrunReported) {
+      // The host has not streamed the next window in time; hold the last target.
+      underrunReported = true;
+      comm.sendEvent("⚠️ Profile window underrun: holding last target");
+    }
   }
 }
 
@@ -18,6 +18,14 @@ class ProfileManager {
     void update();
 
     bool loadProfile(const ProfileStep* steps, uint8_t length);
+    // Replace the stored window with steps [offset, offset + length) of a
+    // longer host-side profile. While running, the window must contain the
+    // current step; `final` marks the window holding the last step.
+    bool loadWindow(const ProfileStep* steps, uint8_t length, uint16_t offset, bool final);
+    // Overwrite steps [index, index + count) of a stored, idle single-window
+    // profile and resize it to `length`. New tail positions must be covered
+    // by the patch; the result must stay ascending in time.
+    bool patchSteps(const ProfileStep* steps, uint8_t count, uint8_t index, uint8_t length);
 
     bool start();
     void pause();
@@ -28,8 +36,11 @@ class ProfileManager {
     bool isActive();
     bool isPaused();
 
-    uint8_t getCurrentStep();
-    uint32_t getRemainingTime();
+    uint16_t getCurrentStep();      // Absolute step index within the full profile
+    uint32_t getRemainingTime();    // Time until the last step of the stored window
+    uint16_t getWindowOffset();
+    uint8_t getWindowLength();
+    bool isWindowFinal();
 
   private:
     ProfileStep profile[MAX_STEPS];
@@ -38,7 +49,10 @@ class ProfileManager {
     bool active;
     bool paused;
 
-    uint8_t currentStep;
+    uint8_t currentStep;            // Index within the stored window
+    uint16_t windowOffset;
+    bool windowFinal;
+    bool underrunReported;
     uint32_t profileStartTimeMs;
     uint32_t pauseStartTimeMs;
     uint32_t totalPausedMs;
@@ -21,6 +21,7 @@ class FakeSerialManager(QObject):
         super().__init__()
         self.connected = True
         self.sent_messages: List[str] = []
+        self.payload_processors = []
 
     def list_ports(self):
         return ["FAKE_PORT"]
@@ -35,6 +36,13 @@ class FakeSerialManager(QObject):
     def disconnect(self):
         self.connected = False
 
+    def add_payload_processor(self, processor):
+        self.payload_processors.append(processor)
+
+    def remove_payload_processor(self, processor):
+        if processor in self.payload_processors:
+            self.payload_processors.remove(processor)
+
     def send(self, message: str):
         self.sent_messages.append(message)
         try:
@@ -49,7 +57,12 @@ class FakeSerialManager(QObject):
         self.send(json.dumps({"SET": {"variable": variable, "value": value}}))
 
     def emit_incoming(self, payload: Dict[str, Any]):
-        self.data_received.emit(dict(payload))
+        payload = dict(payload)
+        for processor in self.payload_processors:
+            processed = processor(payload)
+            if processed is not None:
+                payload = processed
+        self.data_received.emit(payload)
 
     def emit_rx_text(self, text: str):
         self.raw_line_received.emit(text)
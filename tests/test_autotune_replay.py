@@ -0,0 +1,88 @@
+import csv
+import json
+import math
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from framework.autotune_replay import find_sessions, replay_session, replay_sessions
+from framework.session_reader import SessionReader
+
+START = datetime(2024, 1, 1, 10, 0, 0)
+
+
+def stamp(seconds):
+    return (START + timedelta(seconds=seconds)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def write_legacy_pair(directory):
+    """A data log and an event log as written by the GUI before SessionWriter."""
+
+    data_path = os.path.join(directory, "gui_experiment_20240101_100000.csv")
+    with open(data_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["# port: COM3"])
+        writer.writerow(["# session_start: 2024-01-01 10:00:00"])
+        writer.writerow(["timestamp", "cooling_plate_temp", "rectal_temp", "pid_output", "breath_freq_bpm", "comment"])
+        for second in range(1200):
+            output = -60.0 if second >= 120 else 0.0
+            elapsed = second - 130
+            temp = 30.0 + (0.1 * -60.0 * (1.0 - math.exp(-elapsed / 90.0)) if elapsed > 0 else 0.0)
+            writer.writerow([stamp(second), round(temp, 3), 36.5, output, 80, ""])
+            if second == 600:
+                writer.writerow([stamp(second), "", "", "", "", "FAILSAFE_TRIGGERED (probe)"])
+
+    events_path = os.path.join(directory, "gui_v3_events_20240101_095800.csv")
+    with open(events_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["timestamp", "event"])
+        writer.writerow([stamp(-120), "GUI started"])
+        writer.writerow([stamp(60), "Profile loaded: cooling.json"])
+        writer.writerow([stamp(120), "ASYMMETRIC_CMD: start_asymmetric_autotune → {'direction': 'cool', 'step_percent': 60}"])
+        writer.writerow([stamp(600), "EVENT: FAILSAFE_TRIGGERED (probe)"])
+        writer.writerow([stamp(900), "AUTOTUNE_RESULT " + json.dumps({"kp": 2.0, "ki": 0.1, "kd": 0.5})])
+        writer.writerow([stamp(1500), "GUI closed"])
+
+    # The next day's event log must not be paired with this data log.
+    other_path = os.path.join(directory, "gui_v3_events_20240102_090000.csv")
+    with open(other_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["timestamp", "event"])
+        writer.writerow([stamp(86400), "ASYMMETRIC_CMD: start_asymmetric_autotune → {}"])
+    return data_path, events_path
+
+
+def test_legacy_pair_is_replayed():
+    with tempfile.TemporaryDirectory() as directory:
+        data_path, events_path = write_legacy_pair(directory)
+        runs = replay_session(data_path)
+        assert replay_session(events_path) == []
+
+        report = replay_sessions(find_sessions([directory]), workers=1)
+
+    assert len(runs) == 1
+    run = runs[0]
+    assert run["status"] == "completed"
+    assert run["direction"] == "cool" and run["step_percent"] == 60
+    assert run["methods"]["firmware"]["kp"] == 2.0
+    assert run["methods"]["threshold"] is not None
+    assert report["summary"]["runs"] == 1
+
+
+def test_merged_events_skip_mirrored_and_out_of_span():
+    with tempfile.TemporaryDirectory() as directory:
+        data_path, events_path = write_legacy_pair(directory)
+        reader = SessionReader(data_path)
+        paired = reader.paired_event_logs()
+        events = [event for _, event in reader.merge_paired_events(reader.events())]
+
+    assert paired == [events_path]
+    assert events.count("FAILSAFE_TRIGGERED (probe)") == 1
+    assert "Profile loaded: cooling.json" in events
+    assert "GUI started" not in events and "GUI closed" not in events
+
+
+if __name__ == "__main__":
+    test_legacy_pair_is_replayed()
+    test_merged_events_skip_mirrored_and_out_of_span()
+    print("autotune replay tests passed")
@@ -0,0 +1,67 @@
+from framework.early_warning import EarlyWarningMonitor, grade_for, time_to_threshold
+
+
+def frame(plate, plate_rate, rectal=36.0, rectal_rate=0.0, **extra):
+    payload = {
+        "cooling_plate_temp_filtered": plate,
+        "cooling_plate_rate": plate_rate,
+        "anal_probe_temp_filtered": rectal,
+        "anal_probe_rate": rectal_rate,
+    }
+    payload.update(extra)
+    return payload
+
+
+def test_time_to_threshold():
+    assert time_to_threshold(12.0, -0.1, 10.0, -1) == 20.0
+    assert time_to_threshold(12.0, 0.1, 10.0, -1) is None
+    assert time_to_threshold(9.0, 0.0, 10.0, -1) == 0.0
+    # Beyond the limit but moving back is not an imminent crossing.
+    assert time_to_threshold(9.0, 0.1, 10.0, -1) is None
+
+
+def test_grade_hysteresis():
+    assert grade_for(20.0) == "critical"
+    assert grade_for(100.0) == "warning"
+    assert grade_for(200.0) == "advisory"
+    assert grade_for(400.0) == ""
+    assert grade_for(33.0, "critical") == "critical"
+    assert grade_for(40.0, "critical") == "warning"
+
+
+def test_monitor_grades_approaching_plate_limit():
+    monitor = EarlyWarningMonitor(plate_range=(10.0, 45.0))
+    grades = []
+    for plate in (40.0, 25.0, 20.0, 12.0):
+        result = monitor.evaluate(frame(plate, -0.05))
+        grades.append(result["level"])
+    # 600 s, 300 s, 200 s and 40 s from the 10 °C limit.
+    assert grades == ["", "advisory", "advisory", "warning"]
+    assert result["warnings"][0]["name"] == "plate_low"
+
+    result = monitor.evaluate(frame(12.0, 0.05))
+    assert result["level"] == ""
+    assert result["changes"] == [{"name": "plate_low", "from": "warning", "to": ""}]
+
+
+def test_monitor_no_undershoot_alarm_while_rewarming():
+    monitor = EarlyWarningMonitor(rectal_range=(20.0, 40.0), rectal_undershoot=1.5)
+    # Setpoint 37 °C gives an undershoot limit of 35.5 °C; the probe is below
+    # it but rising, so only the absolute limit applies.
+    rewarming = frame(30.0, 0.0, rectal=33.0, rectal_rate=0.01, rectal_override_target=37.0)
+    levels = {name: level for name, _, level, _ in monitor.thresholds(rewarming)}
+    assert levels["rectal_low"] == 20.0
+    assert monitor.evaluate(rewarming)["level"] == ""
+
+    # Above the undershoot limit and falling towards it: graded against it.
+    falling = monitor.evaluate(frame(30.0, 0.0, rectal=35.8, rectal_rate=-0.005, rectal_override_target=37.0))
+    assert falling["level"] == "warning"
+    assert falling["warnings"][0]["threshold"] == 35.5
+
+
+if __name__ == "__main__":
+    test_time_to_threshold()
+    test_grade_hysteresis()
+    test_monitor_grades_approaching_plate_limit()
+    test_monitor_no_undershoot_alarm_while_rewarming()
+    print("early warning tests passed")
@@ -0,0 +1,47 @@
+import math
+
+import numpy as np
+
+from framework.fopdt import fit_fopdt
+
+
+def simulate_fopdt(gain, tau, theta, outputs, dt, baseline=30.0):
+    """Exact zero-order-hold response of a FOPDT plant to *outputs* (%)."""
+
+    delay = int(round(theta / dt))
+    decay = math.exp(-dt / tau)
+    state = 0.0
+    temps = []
+    for index in range(len(outputs)):
+        u = outputs[index - delay] - outputs[0] if index >= delay else 0.0
+        temps.append(baseline + gain * state)
+        state = decay * state + (1.0 - decay) * u
+    return np.array(temps)
+
+
+def test_fit_fopdt_recovers_step_response():
+    dt = 1.0
+    times = np.arange(0.0, 900.0, dt)
+    outputs = np.where(times >= 30.0, 60.0, 10.0)
+    temps = simulate_fopdt(-0.08, 120.0, 15.0, outputs, dt)
+    temps += np.random.default_rng(1).normal(0.0, 0.01, times.size)
+
+    fit = fit_fopdt(times, temps, outputs)
+
+    assert fit is not None
+    assert abs(fit.gain + 0.08) < 0.004, fit
+    assert abs(fit.tau - 120.0) < 10.0, fit
+    assert abs(fit.theta - 15.0) < 3.0, fit
+    assert fit.r_squared > 0.99, fit
+    assert np.max(np.abs(fit.predict(times, outputs) - temps)) < 0.1
+
+
+def test_fit_fopdt_needs_an_output_step():
+    times = np.arange(0.0, 100.0)
+    assert fit_fopdt(times, np.full(times.size, 30.0), np.full(times.size, 40.0)) is None
+
+
+if __name__ == "__main__":
+    test_fit_fopdt_recovers_step_response()
+    test_fit_fopdt_needs_an_output_step()
+    print("FOPDT tests passed")
@@ -0,0 +1,85 @@
+import csv
+import json
+import os
+import tempfile
+
+from framework.journal import (
+    JournalWriter,
+    decode_line,
+    encode_record,
+    find_unclean_journals,
+    iter_journal,
+    journal_is_clean,
+    recover_journal,
+)
+
+
+def write_journal(path, rows, close=True):
+    journal = JournalWriter(path, fsync_policy="none")
+    journal.append({"type": "header", "metadata": {"animal": "M1"}})
+    for index in range(rows):
+        journal.append(
+            {
+                "type": "data",
+                "timestamp": f"2024-01-01 10:00:{index:02d}",
+                "cooling_plate_temp": 30.0 + index,
+                "rectal_temp": 36.0,
+                "pid_output": 10.0,
+                "breath_freq_bpm": 80,
+            }
+        )
+    journal.append({"type": "event", "timestamp": "2024-01-01 10:01:00", "event": "Profile loaded: p.json"})
+    if close:
+        journal.append({"type": "close"})
+    journal.close()
+
+
+def test_checksum_rejects_damaged_lines():
+    line = encode_record({"type": "comment", "comment": "ok"})
+    assert decode_line(line) == {"type": "comment", "comment": "ok"}
+    assert decode_line(line.replace("ok", "no")) is None
+    assert decode_line(line[:-6]) is None
+
+
+def test_recover_truncated_journal():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.journal")
+        write_journal(path, 5, close=False)
+        with open(path, "a", encoding="utf-8") as file:
+            # A record torn by a crash mid-write.
+            file.write(encode_record({"type": "data", "timestamp": "2024-01-01 10:02:00"})[:20])
+
+        assert not journal_is_clean(path)
+        assert find_unclean_journals(directory) == [path]
+
+        summary = recover_journal(path, output_dir=os.path.join(directory, "out"))
+        assert summary["corrupt_lines"] == 1
+        assert not summary["clean_shutdown"]
+        assert (summary["data"], summary["event"]) == (5, 1)
+
+        with open(summary["csv"], newline="", encoding="utf-8") as file:
+            rows = list(csv.reader(file))
+        assert rows[0] == ["# animal: M1"]
+        assert [row[1] for row in rows[2:7]] == ["30.0", "31.0", "32.0", "33.0", "34.0"]
+        assert rows[7][5] == "EVENT: Profile loaded: p.json"
+        with open(summary["json"], encoding="utf-8") as file:
+            document = json.load(file)
+        assert document["metadata"] == {"animal": "M1"}
+        assert len(document["data"]) == 5
+
+        # Reopening terminates the torn line, so appended records stay readable.
+        journal = JournalWriter(path, fsync_policy="none")
+        journal.append({"type": "close"})
+        journal.close()
+        stats = {}
+        records = list(iter_journal(path, stats))
+        assert records[-1] == {"type": "close"}
+        assert stats == {"records": 8, "corrupt": 1}
+        assert journal_is_clean(path)
+        assert find_unclean_journals(directory) == []
+
+
+if __name__ == "__main__":
+    test_checksum_rejects_damaged_lines()
+    test_recover_truncated_journal()
+    print("journal tests passed")
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+
+from framework import profile_parser
+from framework.profile_parser import format_issue, parse_csv, parse_json
+
+
+def write(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+    return path
+
+
+def parse_streamed(path):
+    """parse_json with the in-memory path disabled."""
+
+    limit = profile_parser.IN_MEMORY_LIMIT
+    profile_parser.IN_MEMORY_LIMIT = -1
+    try:
+        return parse_json(path)
+    finally:
+        profile_parser.IN_MEMORY_LIMIT = limit
+
+
+def test_json_load_and_stream_agree():
+    points = [{"time_min": index * 0.5, "temp_c": 37.0 - 0.001 * index} for index in range(5000)]
+    points[10]["ramp_min"] = 0.25
+    points[20]["rectal_override_target"] = 35.0
+    steps = [
+        {"plate_start_temp": 37.0, "plate_end_temp": 30.0, "ramp_time_ms": 30000, "total_step_time_ms": 60000},
+        {"plate_start_temp": 30.0, "plate_end_temp": 30.0, "total_step_time_ms": 60000, "rectal_override_target": 32.0},
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        for name, document in (("points.json", points), ("steps.json", steps)):
+            path = write(directory, name, json.dumps(document, indent=1))
+            loaded, streamed = parse_json(path), parse_streamed(path)
+            assert loaded.ok and streamed.ok
+            assert loaded.kind == streamed.kind
+            assert loaded.to_points() == streamed.to_points()
+
+
+def test_errors_keep_line_numbers():
+    document = [
+        {"time_min": 0, "temp_c": 37},
+        {"time_min": 1, "temp_c": 99},
+        {"time_min": 2, "temp_c": "x"},
+        {"time_min": 3, "temp_c": 30},
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        path = write(directory, "bad.json", json.dumps(document, indent=1))
+        parsed = parse_json(path)
+        csv_path = write(directory, "bad.csv", "# Time(min), Temperature(C), Ramp(min)\n0,37\n1,99\n2,x\n3,30\n")
+        parsed_csv = parse_csv(csv_path)
+
+    assert [format_issue(error) for error in parsed.errors] == [
+        "Line 6: Temperature (99.0°C) out of range (-10°C to 50°C)",
+        "Line 10: could not convert string to float: 'x'",
+    ]
+    assert len(parsed) == 2
+    assert [error["line"] for error in parsed_csv.errors] == [3, 4]
+    assert len(parsed_csv) == 2
+
+
+if __name__ == "__main__":
+    test_json_load_and_stream_agree()
+    test_errors_keep_line_numbers()
+    print("profile parser tests passed")
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from framework.profile_loader import ProfileLoader, simplify_profile
+from framework.profile_parser import parse_json
+from framework.profile_timeline import ProfileTimeline
+
+
+def same_rectal_targets(first, second):
+    """True when both timelines request the same rectal override at all times."""
+
+    edges = [edge for start, end, _ in first.rectal_schedule() + second.rectal_schedule() for edge in (start, end)]
+    t = np.concatenate([np.linspace(0.0, first.duration, 20000), edges])
+    return np.array_equal(first.rectal_targets(t), second.rectal_targets(t), equal_nan=True)
+
+
+def dense_profile():
+    """Cooling ramp, hold and rewarm sampled every 6 s, with one rectal override."""
+
+    points = []
+    for index in range(1201):
+        time_min = index * 0.1
+        if time_min < 30:
+            temp = 37.0 - 0.3 * time_min
+        elif time_min < 90:
+            temp = 28.0
+        else:
+            temp = 28.0 + 0.25 * (time_min - 90)
+        point = {"time_min": round(time_min, 6), "temp_c": round(temp, 6)}
+        if 40.0 < time_min <= 60.0:
+            point["rectal_override_target"] = 30.0
+        points.append(point)
+    return points
+
+
+def test_simplify_profile_round_trip():
+    points = dense_profile()
+    original = ProfileTimeline.from_points(points)
+    # The controller holds each target, so compare held values everywhere.
+    t = np.linspace(0.0, original.duration, 20000)
+
+    for max_steps in (200, 40):
+        simplified, achieved = simplify_profile(points, max_steps=max_steps, max_deviation=0.1)
+        assert len(simplified) <= max_steps
+        if max_steps == 200:
+            assert achieved <= 0.1
+
+        reduced = ProfileTimeline.from_points(simplified)
+        error = np.abs(original.plate_targets(t) - reduced.plate_targets(t))
+        assert abs(np.nanmax(error) - achieved) < 1e-9
+        assert same_rectal_targets(original, reduced)
+
+    # The simplified profile exports and reloads as a plain point profile.
+    loader = ProfileLoader()
+    loader.load_points(points)
+    loader.simplify(max_steps=20)
+    simplified = loader.profile
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "simplified.csv")
+        assert loader.export_profile_csv(path)
+        reloaded = ProfileLoader().load_profile(path)
+    assert [(point["time_min"], point["temp_c"]) for point in reloaded] == [
+        (point["time_min"], point["temp_c"]) for point in simplified
+    ]
+
+
+def test_simplify_profile_survives_json_reload():
+    simplified, _ = simplify_profile(dense_profile(), max_steps=40)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "simplified.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(simplified, file)
+        parsed = parse_json(path)
+        loaded = ProfileLoader().load_profile(path)
+
+    assert parsed.ok
+    assert ProfileTimeline.from_points(loaded).rectal_schedule() == (
+        ProfileTimeline.from_points(simplified).rectal_schedule()
+    )
+    assert same_rectal_targets(ProfileTimeline.from_points(dense_profile()), ProfileTimeline.from_points(loaded))
+    assert [point["temp_c"] for point in loaded] == [point["temp_c"] for point in simplified]
+
+
+def test_simplify_profile_accepts_rectal_key_spellings():
+    points = dense_profile()
+    for point in points:
+        if "rectal_override_target" in point:
+            point["rectal_setpoint"] = point.pop("rectal_override_target")
+    simplified, _ = simplify_profile(points, max_steps=40)
+    assert same_rectal_targets(ProfileTimeline.from_points(points), ProfileTimeline.from_points(simplified))
+
+
+if __name__ == "__main__":
+    test_simplify_profile_round_trip()
+    test_simplify_profile_survives_json_reload()
+    test_simplify_profile_accepts_rectal_key_spellings()
+    print("profile simplification tests passed")
@@ -0,0 +1,38 @@
+from framework.profile_streamer import MAX_CONTROLLER_STEPS
+from framework.profile_sync import FULL, PATCH, SKIP, ProfileSync
+
+
+def steps(temps):
+    return [{"t": 60.0 * index, "temp": temp} for index, temp in enumerate(temps)]
+
+
+def test_profile_sync_plans():
+    sync = ProfileSync()
+    profile = steps([37.0, 35.0, 33.0, 33.0, 37.0])
+
+    assert sync.plan(profile)[0] == FULL
+    sync.on_sent(profile)
+    assert not sync.on_response("Profile loaded")
+    assert sync.plan(profile) == (SKIP, None)
+
+    edited = steps([37.0, 35.0, 32.5, 33.0, 37.0])
+    plan, payload = sync.plan(edited)
+    assert plan == PATCH
+    assert payload == {"index": 2, "length": 5, "steps": [{"t": 120.0, "temp": 32.5}]}
+    assert sync.plan(edited, allow_patch=False)[0] == FULL
+
+    # A refused patch asks for a full upload and forgets the acknowledged profile.
+    sync.on_sent(edited, patch=True)
+    assert sync.on_response("Profile patch rejected")
+    assert sync.plan(edited)[0] == FULL
+
+    long_profile = steps([30.0] * (MAX_CONTROLLER_STEPS + 1))
+    sync.on_sent(long_profile)
+    sync.on_response("Profile loaded")
+    assert sync.plan(long_profile)[0] == FULL
+
+
+
+if __name__ == "__main__":
+    test_profile_sync_plans()
+    print("profile sync tests passed")
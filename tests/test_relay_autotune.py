@@ -0,0 +1,37 @@
+import math
+
+from framework.relay_autotune import RelayFeedbackAnalyzer
+
+
+def test_relay_analyzer_identifies_ultimate_cycle():
+    # Integrating plant with dead time: the relay cycle is known in closed form.
+    slope = 0.02  # °C/s per 100 % output
+    theta = 10.0
+    dt = 0.1
+    center, hysteresis, relay_pct = 30.0, 0.05, 50.0
+    analyzer = RelayFeedbackAnalyzer(center, hysteresis=hysteresis, cycles=3, tolerance=0.05)
+
+    delayed = [0.0] * int(round(theta / dt))
+    temperature = center
+    output = 0.0
+    for step in range(int(600 / dt)):
+        analyzer.add_sample(step * dt, temperature, output)
+        output = relay_pct if analyzer.relay_high else -relay_pct
+        delayed.append(output)
+        temperature += slope * delayed.pop(0) / 100.0 * dt
+
+    assert analyzer.is_stable()
+    results = analyzer.compute_results()
+    rate = slope * relay_pct / 100.0
+    # Each half cycle crosses the hysteresis band and runs on for one dead time.
+    expected_period = 4.0 * theta + 4.0 * hysteresis / rate
+    expected_amplitude = rate * theta + hysteresis
+    assert abs(results["ultimate_period"] - expected_period) < 0.05 * expected_period, results
+    expected_gain = 4.0 * (relay_pct / 100.0) / (math.pi * expected_amplitude)
+    assert abs(results["ultimate_gain"] - expected_gain) < 0.05 * expected_gain, results
+    assert results["kp"] == 0.6 * results["ultimate_gain"]
+
+
+if __name__ == "__main__":
+    test_relay_analyzer_identifies_ultimate_cycle()
+    print("relay autotune tests passed")
@@ -0,0 +1,54 @@
+import csv
+import json
+import os
+import tempfile
+
+from framework.session_catalog import SessionCatalog
+
+
+def write_legacy_pair(directory):
+    """A data log and the EventLogger CSV the GUI wrote next to it."""
+
+    with open(os.path.join(directory, "gui_experiment_20240101_100000.csv"), "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["# port: COM3"])
+        writer.writerow(["timestamp", "cooling_plate_temp", "rectal_temp", "pid_output", "breath_freq_bpm", "comment"])
+        for second in range(60):
+            writer.writerow([f"2024-01-01 10:00:{second:02d}", 30.0, 36.5, 10.0, 80, ""])
+            if second == 30:
+                writer.writerow(["2024-01-01 10:00:30", "", "", "", "", "FAILSAFE_TRIGGERED (probe)"])
+
+    with open(os.path.join(directory, "gui_v3_events_20240101_095900.csv"), "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["timestamp", "event"])
+        writer.writerow(["2024-01-01 09:59:00", "GUI started"])
+        writer.writerow(["2024-01-01 10:00:05", "Profile loaded: C:/profiles/cooling.json"])
+        writer.writerow(["2024-01-01 10:00:30", "EVENT: FAILSAFE_TRIGGERED (probe)"])
+        writer.writerow(["2024-01-01 10:00:50", "AUTOTUNE_RESULT " + json.dumps({"kp": 2.0})])
+        writer.writerow(["2024-01-01 10:05:00", "GUI closed"])
+
+
+def test_legacy_pair_is_summarised_together():
+    with tempfile.TemporaryDirectory() as directory:
+        write_legacy_pair(directory)
+        catalog = SessionCatalog(os.path.join(directory, "catalog.sqlite"))
+        try:
+            result = catalog.backfill(directory)
+            rows = catalog.query()
+        finally:
+            catalog.close()
+
+    assert result["indexed"] == 1
+    assert len(rows) == 1
+    row = rows[0]
+    assert os.path.basename(row["path"]) == "gui_experiment_20240101_100000.csv"
+    assert row["profile"] == "cooling.json"
+    assert row["failsafe_count"] == 1
+    assert row["autotune_results"] == [{"kp": 2.0}]
+    assert row["event_count"] == 3
+    assert row["sample_count"] == 60
+
+
+if __name__ == "__main__":
+    test_legacy_pair_is_summarised_together()
+    print("session catalog tests passed")
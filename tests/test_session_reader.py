@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+import numpy as np
+
+from framework.journal import FILTERED_FIELDS
+from framework.session_reader import DATA_FIELDS, RECORD_FIELDS, SessionReader
+from framework.session_writer import SessionWriter
+
+
+def write_session(directory, rows):
+    session = SessionWriter("test", metadata={"animal": "M1"}, directory=directory, keep_journal=True)
+    for index in range(rows):
+        session.write_data(
+            {
+                "timestamp": f"2024-01-01 10:{index // 60:02d}:{index % 60:02d}",
+                "cooling_plate_temp": 30.0 + 0.01 * index,
+                "anal_probe_temp": 36.0,
+                "pid_output": None if index == 3 else 50.0,
+                "breath_freq_bpm": 80,
+                "cooling_plate_temp_filtered": 30.0 + 0.01 * index,
+                "cooling_plate_rate": 0.01,
+                "anal_probe_temp_filtered": 36.0,
+                "anal_probe_rate": 0.0,
+            }
+        )
+        if index == 10:
+            session.write_comment("halfway")
+    session.close()
+    return session
+
+
+def test_csv_and_journal_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        session = write_session(directory, 250)
+        csv_reader = SessionReader(session.filename_csv)
+        journal_reader = SessionReader(session.filename_journal)
+        from_csv = csv_reader.read(RECORD_FIELDS, chunk_size=64)
+        from_journal = journal_reader.read(RECORD_FIELDS)
+        comments = csv_reader.comments()
+        metadata = csv_reader.metadata
+        window = journal_reader.read(start="2024-01-01 10:01:00", end="2024-01-01 10:01:59")
+
+    assert set(from_csv) == {"time"} | set(RECORD_FIELDS)
+    for key, values in from_csv.items():
+        assert np.array_equal(values, from_journal[key], equal_nan=True), key
+    assert from_csv["time"].size == 250
+    assert np.isnan(from_csv["pid_output"][3])
+    assert np.allclose(from_csv["cooling_plate_temp_filtered"], 30.0 + 0.01 * np.arange(250))
+    assert np.all(from_csv["cooling_plate_rate"] == 0.01)
+    assert [comment for _, comment in comments] == ["halfway"]
+    assert metadata["animal"] == "M1"
+    assert window["time"].size == 60
+
+
+def test_logger_layout_without_filtered_columns():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "legacy.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("timestamp,cooling_plate_temp,rectal_temp,pid_output,breath_freq_bpm,comment\n")
+            file.write("2024-01-01 10:00:00,30.0,36.0,50.0,80,\n")
+            file.write("2024-01-01 10:00:01,,,,,EVENT: Profile loaded: p.json\n")
+        reader = SessionReader(path)
+        columns = reader.read(DATA_FIELDS + FILTERED_FIELDS)
+        events = reader.events()
+
+    assert columns["cooling_plate_temp"].tolist() == [30.0]
+    assert all(np.isnan(columns[field][0]) for field in FILTERED_FIELDS)
+    assert [event for _, event in events] == ["Profile loaded: p.json"]
+
+
+if __name__ == "__main__":
+    test_csv_and_journal_round_trip()
+    test_logger_layout_without_filtered_columns()
+    print("session reader tests passed")
@@ -0,0 +1,68 @@
+import csv
+import json
+import os
+import tempfile
+
+from framework.journal import CSV_HEADER
+from framework.session_writer import SessionWriter
+
+FRAME = {
+    "timestamp": "2024-01-01 10:00:00",
+    "cooling_plate_temp": 30.5,
+    "anal_probe_temp": 36.2,
+    "pid_output": -40.0,
+    "breath_freq_bpm": 75,
+}
+
+
+def test_session_exports_on_close():
+    closed = []
+    with tempfile.TemporaryDirectory() as directory:
+        session = SessionWriter("test", metadata={"animal": "M1"}, directory=directory, on_close=closed.append)
+        data = session.data_view(metadata={"port": "COM3"})
+        events = session.event_view(owns_session=True)
+        data.log_data(FRAME)
+        data.log_comment("induction")
+        events.log_event("Profile loaded: p.json")
+        data.close()
+        assert not session.closed
+        events.close()
+
+        assert session.closed and closed == [session]
+        assert not os.path.exists(session.filename_journal)
+        with open(session.filename_csv, newline="", encoding="utf-8") as file:
+            rows = [row for row in csv.reader(file) if not row[0].startswith("#")]
+        with open(session.filename_json, encoding="utf-8") as file:
+            document = json.load(file)
+
+    # One ordered stream: data, comment and events interleaved as written.
+    assert [row[5] for row in rows[1:]] == [
+        "EVENT: DATA_LOGGING_STARTED",
+        "",
+        "induction",
+        "EVENT: Profile loaded: p.json",
+        "EVENT: DATA_LOGGING_STOPPED",
+    ]
+    assert rows[2][1:5] == ["30.5", "36.2", "-40.0", "75"]
+    assert all(len(row) == len(CSV_HEADER) for row in rows)
+    assert document["metadata"] == {"animal": "M1", "port": "COM3"}
+    assert document["data"][0]["rectal_temp"] == 36.2
+    assert [event["event"] for event in document["events"]][1] == "Profile loaded: p.json"
+
+
+def test_failed_export_keeps_journal():
+    with tempfile.TemporaryDirectory() as directory:
+        session = SessionWriter("test", directory=directory)
+        session.write_data(FRAME)
+        session.filename_csv = os.path.join(directory, "missing", "session.csv")
+        session.close()
+
+        assert session.keep_journal
+        assert os.path.exists(session.filename_journal)
+        assert not os.path.exists(session.filename_csv)
+
+
+if __name__ == "__main__":
+    test_session_exports_on_close()
+    test_failed_export_keeps_journal()
+    print("session writer tests passed")
@@ -0,0 +1,40 @@
+import math
+
+import numpy as np
+
+from framework.state_filter import MAX_GAP_S, PLATE_ACCELERATION_NOISE, AlphaBetaFilter, filter_series
+
+
+def test_filter_series_matches_streaming_filter():
+    rng = np.random.default_rng(7)
+    times = np.cumsum(rng.uniform(0.5, 1.5, 2000))
+    times[700:] += MAX_GAP_S + 5.0  # A gap restarts both filters.
+    times[300] = times[299]  # Repeated and backwards timestamps are ignored.
+    times[301] = times[298]
+    values = 30.0 + 5.0 * np.sin(times / 60.0) + rng.normal(0.0, 0.02, times.size)
+    values[[10, 500, 1500]] = np.nan
+
+    filtered, rate = filter_series(times, values, PLATE_ACCELERATION_NOISE)
+
+    stream = AlphaBetaFilter(PLATE_ACCELERATION_NOISE)
+    for index, (t_value, value) in enumerate(zip(times, values)):
+        expected_value, expected_rate = stream.update(float(t_value), float(value))
+        if math.isnan(value):
+            assert math.isnan(filtered[index]) and math.isnan(rate[index])
+            continue
+        assert abs(filtered[index] - expected_value) < 1e-9, index
+        assert abs(rate[index] - expected_rate) < 1e-9, index
+
+
+def test_filter_tracks_a_ramp():
+    times = np.arange(0.0, 600.0, 1.0)
+    values = 35.0 - 0.01 * times
+    filtered, rate = filter_series(times, values, PLATE_ACCELERATION_NOISE)
+    assert np.allclose(filtered[-100:], values[-100:], atol=1e-3)
+    assert np.allclose(rate[-100:], -0.01, atol=1e-4)
+
+
+if __name__ == "__main__":
+    test_filter_series_matches_streaming_filter()
+    test_filter_tracks_a_ramp()
+    print("state filter tests passed")
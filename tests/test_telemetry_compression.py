@@ -0,0 +1,80 @@
+import os
+import tempfile
+
+import numpy as np
+
+from framework import session_writer
+from framework.session_reader import DATA_FIELDS, spread_timestamps
+from framework.session_writer import SessionWriter
+from framework.telemetry_compression import (
+    DEFAULT_TOLERANCES,
+    compress_arrays,
+    main,
+    reconstruct,
+    reconstruct_session,
+)
+
+
+def signals(times):
+    rng = np.random.default_rng(3)
+    return {
+        "cooling_plate_temp": 30.0 + 3.0 * np.sin(times / 90.0) + rng.normal(0.0, 0.01, times.size),
+        "rectal_temp": 36.0 - times / 2000.0,
+        "pid_output": np.where((times // 120) % 2 == 0, 40.0, -40.0),
+        "breath_freq_bpm": np.full(times.size, 80.0),
+    }
+
+
+def test_bound_holds_for_one_second_timestamps():
+    # Two frames per second, logged with one-second timestamps.
+    times = np.floor(np.arange(4000) * 0.5) + 1.7e9
+    columns = signals(spread_timestamps(times))
+    kept = compress_arrays(times, columns)
+
+    assert kept.size < times.size / 4
+    spread = spread_timestamps(times)
+    for field, values in columns.items():
+        error = np.abs(reconstruct(spread[kept], values[kept], spread) - values)
+        assert error.max() <= DEFAULT_TOLERANCES[field] + 1e-9, field
+
+
+def test_live_compression_records_exact_times():
+    clock = iter(1.7e9 + 0.37 * np.arange(3000))
+    real_time = session_writer.time.time
+    session_writer.time.time = lambda: float(next(clock))
+    try:
+        times = 1.7e9 + 0.37 * np.arange(3000)
+        columns = signals(times)
+        with tempfile.TemporaryDirectory() as directory:
+            session = SessionWriter("test", directory=directory, compression=True, keep_journal=True)
+            for index in range(times.size):
+                row = {field: float(columns[field][index]) for field in DATA_FIELDS}
+                row["anal_probe_temp"] = row.pop("rectal_temp")
+                session.write_data(row)
+            session.close()
+            written = session.counts["data"]
+            rebuilt = reconstruct_session(session.filename_csv, query_times=times)
+            assert os.path.exists(session.filename_journal)
+    finally:
+        session_writer.time.time = real_time
+
+    assert written < times.size / 4
+    for field in DATA_FIELDS:
+        error = np.abs(rebuilt[field] - columns[field])
+        assert error.max() <= DEFAULT_TOLERANCES[field] + 1e-6, field
+
+
+def test_cli_rejects_bad_tolerance():
+    try:
+        main(["missing.csv", "--tol", "cooling_plate_temp=abc"])
+    except SystemExit as exc:
+        assert exc.code == 2
+    else:
+        raise AssertionError("expected a usage error")
+
+
+if __name__ == "__main__":
+    test_bound_holds_for_one_second_timestamps()
+    test_live_compression_records_exact_times()
+    test_cli_rejects_bad_tolerance()
+    print("telemetry compression tests passed")